@@ -0,0 +1,51 @@
+"""按请求内容寻址的 LLM 回复缓存：完全相同的请求不重复调用模型。"""
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional
+
+import redis.asyncio as redis
+
+from app.utils.compressed_store import CompressedRedisStore
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """以模型、完整消息列表（系统消息 + 渲染后的提示 + 重试轮次）、采样温度和 max_tokens 的哈希为 key。
+
+    任何一项变化都会得到不同的 key，因此无需主动失效；条目由底层存储按 TTL 和总容量淘汰。
+    只应写入调用方已校验通过的回复，校验失败的回复用 delete 移除，避免重放。
+    缓存读写失败时只记录日志，不影响模型调用。
+    """
+
+    def __init__(self, store: CompressedRedisStore):
+        self.store = store
+
+    @staticmethod
+    def key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+            ensure_ascii=False, sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            entry = await self.store.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        return entry['content'] if entry else None
+
+    async def put(self, key: str, content: str) -> None:
+        try:
+            await self.store.put(key, {'content': content})
+        except redis.RedisError as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.store.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"LLM cache delete failed: {e}")
@@ -1,18 +1,25 @@
 """YouTube视频内容分析器，用于生成视频摘要和关键词。"""
 import sys
-import re
-import os
 import json
-from typing import Dict, List, Tuple, Optional, Any
+import asyncio
+import logging
+from typing import Dict, List, Optional, Any
 
-from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager, config_list_from_json
 from app.agents.prompts import (
-    SUMMARIZER_SYSTEM_MESSAGE,
     SUMMARY_PROMPT_TEMPLATE,
     INPUT_LIMITS,
-    VALIDATOR_SYSTEM_MESSAGE
+    CHUNK_SUMMARIZER_SYSTEM_MESSAGE,
+    CHUNK_SUMMARY_PROMPT_TEMPLATE,
+    MERGE_PROMPT_TEMPLATE,
+    TRANSLATOR_SYSTEM_MESSAGE,
+    TRANSLATION_PROMPT_TEMPLATE
 )
+from app.utils.caption_parser import iter_cues, clean_caption_text
+from app.agents.transcript_encoder import encode_transcript, build_paragraphs, Tokenizer
+from app.agents.summary_engine import extract_json, get_summary_engine, emit_event, EventCallback
+from app.config import settings
 
+logger = logging.getLogger(__name__)
 
 
 class CaptionParsingError(Exception):
@@ -27,132 +34,14 @@ class ValidationError(Exception):
     """输出验证相关的异常。"""
     pass
 
-class AgentManager:
-    """管理Agent实例的单例类。"""
-    _instance = None
-    _summarizer = None
-    _validator = None
-    _user_proxy = None
-    _group_chat = None
-    _group_chat_manager = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(AgentManager, cls).__new__(cls)
-        return cls._instance
-
-    @classmethod
-    def get_summarizer(cls) -> AssistantAgent:
-        """获取或创建摘要生成器Agent。
-
-        Returns:
-            AssistantAgent: 配置好的摘要生成器Agent实例
-        """
-        if cls._summarizer is None:
-            config_list = [
-                {
-                    "model": os.getenv("OPENAI_MODEL"),
-                    "api_key": os.getenv("OPENAI_API_KEY")
-                }
-            ]
-            
-            cls._summarizer = AssistantAgent(
-                name="VideoSummarizer",
-                system_message=SUMMARIZER_SYSTEM_MESSAGE,
-                llm_config={"config_list": config_list}
-            )
-        return cls._summarizer
-
-    @classmethod
-    def get_validator(cls) -> AssistantAgent:
-        """获取或创建验证器Agent。
-
-        Returns:
-            AssistantAgent: 配置好的验证器Agent实例
-        """
-        if cls._validator is None:
-            config_list = [
-                {
-                    "model": os.getenv("OPENAI_MODEL"),
-                    "api_key": os.getenv("OPENAI_API_KEY")
-                }
-            ]
-            
-            cls._validator = AssistantAgent(
-                name="OutputValidator",
-                system_message=VALIDATOR_SYSTEM_MESSAGE,
-                llm_config={"config_list": config_list}
-            )
-        return cls._validator
-
-    @classmethod
-    def get_user_proxy(cls) -> UserProxyAgent:
-        """获取或创建用户代理Agent。
-
-        Returns:
-            UserProxyAgent: 配置好的用户代理Agent实例
-        """
-        if cls._user_proxy is None:
-            cls._user_proxy = UserProxyAgent(
-                name="User",
-                human_input_mode="NEVER",
-                max_consecutive_auto_reply=1,
-                code_execution_config=False
-            )
-        return cls._user_proxy
-
-    @classmethod
-    def get_group_chat(cls) -> GroupChat:
-        """获取或创建群组对话。
-
-        Returns:
-            GroupChat: 配置好的群组对话实例
-        """
-        if cls._group_chat is None:
-            cls._group_chat = GroupChat(
-                agents=[cls.get_user_proxy(), cls.get_summarizer(), cls.get_validator()],
-                messages=[],
-                max_round=50
-            )
-        return cls._group_chat
-
-    @classmethod
-    def get_group_chat_manager(cls) -> GroupChatManager:
-        """获取或创建群组对话管理器。
-
-        Returns:
-            GroupChatManager: 配置好的群组对话管理器实例
-        """
-        if cls._group_chat_manager is None:
-            cls._group_chat_manager = GroupChatManager(
-                group_chat=cls.get_group_chat(),
-                llm_config={
-                    "config_list": [{
-                        "model": os.getenv("OPENAI_MODEL"),
-                        "api_key": os.getenv("OPENAI_API_KEY")
-                    }]
-                }
-            )
-        return cls._group_chat_manager
-
-    @classmethod
-    def reset(cls) -> None:
-        """重置所有Agent实例。"""
-        cls._summarizer = None
-        cls._validator = None
-        cls._user_proxy = None
-        cls._group_chat = None
-        cls._group_chat_manager = None
-
-# 创建Agent管理器实例
-agent_manager = AgentManager()
-
 # Function to parse VTT captions
 def parse_vtt(vtt_content: str) -> List[Dict[str, str]]:
-    """解析VTT格式的字幕内容为结构化格式。
+    """解析字幕内容为结构化格式。
+
+    支持 WebVTT、SRV3 和 JSON3 格式，并去除 YouTube 自动字幕的滚动重复。
 
     Args:
-        vtt_content: VTT格式的字幕内容
+        vtt_content: 字幕内容
 
     Returns:
         包含时间戳和文本的字幕列表
@@ -161,53 +50,7 @@ def parse_vtt(vtt_content: str) -> List[Dict[str, str]]:
         CaptionParsingError: 当字幕解析失败时
     """
     try:
-        # Remove WebVTT header
-        if vtt_content.startswith("WEBVTT"):
-            vtt_content = vtt_content.split("\n\n", 1)[1]
-        
-        # Split by double newline (each caption block)
-        caption_blocks = vtt_content.strip().split("\n\n")
-        parsed_captions = []
-        total_length = 0
-        
-        for block in caption_blocks:
-            lines = block.strip().split("\n")
-            if len(lines) < 2:
-                continue
-            
-            # Get timestamp line
-            timestamp_line = lines[0]
-            if "-->" not in timestamp_line:
-                timestamp_line = lines[1]
-            
-            # Extract start time
-            start_time = timestamp_line.split("-->")[0].strip()
-            # Remove milliseconds
-            start_time = start_time.split(".")[0]
-            
-            # Get caption text (can be multiline)
-            text_lines = lines[1:] if "-->" in lines[0] else lines[2:]
-            raw_text = " ".join(text_lines)
-            
-            # Clean text:
-            text = clean_vtt_text(raw_text)
-            
-            # Skip if this text is the same as the previous one
-            if parsed_captions and parsed_captions[-1]["txt"] == text:
-                continue
-            
-            # 计算包含JSON格式的key在内的字符数
-            # caption_length = len('"stime":"' + start_time + '","txt":"' + text + '"')
-            # if total_length + caption_length > 90000:
-            #     break
-                
-            parsed_captions.append({
-                "stime": start_time,
-                "txt": text
-            })
-            #total_length += caption_length
-        
-        return parsed_captions
+        return list(iter_cues(vtt_content))
     except Exception as e:
         raise CaptionParsingError(f"Failed to parse VTT content: {str(e)}")
 
@@ -220,37 +63,7 @@ def clean_vtt_text(text: str) -> str:
     Returns:
         清理后的文本
     """
-    # 移除时间戳标签 <00:00:01.000>
-    text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
-    
-    # 移除所有HTML标签
-    text = re.sub(r'</?[^>]+?>', '', text)
-    
-    # 移除HTML实体
-    text = text.replace('&nbsp;', ' ').replace('&gt;', '>').replace('&lt;', '<').replace('&amp;', '&')
-    
-    # 移除align和position信息
-    text = re.sub(r'align:start position:\d+%', '', text)
-    
-    # 移除重复的空格和换行
-    text = re.sub(r'\s+', ' ', text)
-    
-    # 移除行首和行尾的空白字符
-    text = text.strip()
-    
-    # 移除重复的标点符号
-    text = re.sub(r'([.,!?;:])\1+', r'\1', text)
-    
-    # 移除多余的空格和标点组合
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
-    
-    # 移除空行
-    text = re.sub(r'\n\s*\n', '\n', text)
-    
-    # 移除时间戳行（如果存在）
-    text = re.sub(r'\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}', '', text)
-    
-    return text.strip()
+    return clean_caption_text(text)
 
 # Function to convert seconds to HH:MM:SS format
 def format_timestamp(timestamp: str) -> str:
@@ -315,157 +128,179 @@ def format_summary_prompt(
         language=language
     )
 
-def validate_summary(summary_json: str, validator: AssistantAgent, user_proxy: AssistantAgent) -> Tuple[bool, str]:
-    """验证摘要输出。
+def split_caption_chunks(
+    parsed_captions: List[Dict[str, str]],
+    chunk_tokens: int,
+    tokenizer: Optional[Tokenizer] = None
+) -> List[List[Dict[str, str]]]:
+    """按时间顺序把字幕切分为 token 数不超过 chunk_tokens 的连续分段。
 
     Args:
-        summary_json: 要验证的JSON字符串
-        validator: 验证器Agent实例
-        user_proxy: 用户代理Agent实例
+        parsed_captions: 解析后的字幕列表
+        chunk_tokens: 每段的 token 上限
+        tokenizer: token 计数器
 
     Returns:
-        Tuple[bool, str]: (是否有效, 错误信息)
+        分段后的字幕列表
+    """
+    tokenizer = tokenizer or Tokenizer()
+    chunks: List[List[Dict[str, str]]] = []
+    current: List[Dict[str, str]] = []
+    current_tokens = 0
+    for cue in parsed_captions:
+        cue_tokens = tokenizer.count(cue['txt']) + 1
+        if current and current_tokens + cue_tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(cue)
+        current_tokens += cue_tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def summarize_chunk(
+    index: int,
+    total: int,
+    chunk: List[Dict[str, str]],
+    video_title: str,
+    output_language: str,
+    semaphore: asyncio.Semaphore,
+    on_event: Optional[EventCallback] = None
+) -> Dict[str, Any]:
+    """对一段字幕生成分段摘要（map 阶段）。
+
+    Args:
+        index: 分段序号，从1开始
+        total: 分段总数
+        chunk: 该段字幕
+        video_title: 视频标题
+        output_language: 输出语言
+        semaphore: 限制并发的信号量
+        on_event: 进度事件回调，完成后发送 chunk 事件
+
+    Returns:
+        Dict[str, Any]: 包含 outline/summary/keywords 的分段摘要
 
     Raises:
-        ValidationError: 当验证失败时
+        SummaryGenerationError: 最多尝试 SUMMARY_CHUNK_MAX_ATTEMPTS 次后仍调用失败或无法解析时
     """
-    try:
-        # 发送验证请求
-        user_proxy.initiate_chat(
-            validator,
-            message=f"Please validate this summary output:\n\n{summary_json}"
-        )
-        
-        # 获取验证结果
-        validation_result = user_proxy.chat_messages[validator.name][-1]["content"]
-        validation_data = json.loads(validation_result)
-        
-        if validation_data["is_valid"]:
-            return True, validation_data["message"]
-        
-        # 构建详细的错误信息
-        error_parts = []
-        
-        if "language_issues" in validation_data:
-            error_parts.append("Language Issues:\n" + "\n".join(f"- {issue}" for issue in validation_data["language_issues"]))
-        
-        if "structure_issues" in validation_data:
-            error_parts.append("Structure Issues:\n" + "\n".join(f"- {issue}" for issue in validation_data["structure_issues"]))
-        
-        if "content_issues" in validation_data:
-            error_parts.append("Content Issues:\n" + "\n".join(f"- {issue}" for issue in validation_data["content_issues"]))
-        
-        if "errors" in validation_data:
-            error_parts.append("Detailed Errors:\n" + "\n".join(
-                f"- {error['field']}: {error['issue']}\n  {error['details']}"
-                for error in validation_data["errors"]
-            ))
-        
-        error_message = "\n\n".join(error_parts)
-        return False, error_message
-        
-    except Exception as e:
-        raise ValidationError(f"Validation failed: {str(e)}")
+    captions = "\n".join(
+        f"[{stime}] {text}"
+        for stime, text in build_paragraphs(chunk, settings.TRANSCRIPT_BUCKET_SECONDS)
+    )
+    message = CHUNK_SUMMARY_PROMPT_TEMPLATE.format(
+        title=video_title,
+        index=index,
+        total=total,
+        start=chunk[0]['stime'],
+        end=chunk[-1]['stime'],
+        captions=captions,
+        language=output_language
+    )
+    engine = get_summary_engine()
+    messages = [
+        {"role": "system", "content": CHUNK_SUMMARIZER_SYSTEM_MESSAGE},
+        {"role": "user", "content": message}
+    ]
+    result = None
+    for attempt in range(1, settings.SUMMARY_CHUNK_MAX_ATTEMPTS + 1):
+        try:
+            async with semaphore:
+                content = await engine.complete(messages)
+        except Exception as e:
+            error = f"Failed to summarize part {index}/{total}: {e}"
+        else:
+            result = extract_json(content)
+            if result is not None:
+                await engine.store_reply(messages, content)
+                break
+            await engine.forget_reply(messages)
+            error = f"Failed to parse summary of part {index}/{total}"
+        if attempt == settings.SUMMARY_CHUNK_MAX_ATTEMPTS:
+            raise SummaryGenerationError(error)
+        logger.warning(f"{error}, retrying (attempt {attempt + 1})")
+    result["start"] = chunk[0]['stime']
+    result["end"] = chunk[-1]['stime']
+    await emit_event(on_event, "chunk", {"index": index, "total": total})
+    return result
 
-class SummaryGroupChat:
-    """管理群聊中的代理交互"""
-    
-    def __init__(self, user_proxy: UserProxyAgent, summarizer: AssistantAgent, validator: AssistantAgent):
-        """初始化群聊管理器
-        
-        Args:
-            user_proxy: 用户代理
-            summarizer: 视频总结代理
-            validator: 验证代理
-        """
-        self.user_proxy = user_proxy
-        self.summarizer = summarizer
-        self.validator = validator
-        
-        # 创建群聊，设置对话顺序和规则
-        self.groupchat = GroupChat(
-            agents=[user_proxy, summarizer, validator],
-            messages=[],
-            max_round=3,  # 最多3次尝试
-            speaker_selection_method="round_robin",  # 轮流发言
-            allow_repeat_speaker=False  # 不允许连续发言
+def format_chunk_summaries(chunk_results: List[Dict[str, Any]]) -> str:
+    """把分段摘要渲染为合并阶段的输入文本，失败的分段（failed 为 True）标记为缺失。"""
+    parts = []
+    for index, chunk in enumerate(chunk_results, 1):
+        if chunk.get("failed"):
+            parts.append(
+                f"PART {index} ({chunk['start']} - {chunk['end']})\n"
+                f"[This part could not be summarized; do not invent its content.]"
+            )
+            continue
+        outline = "\n".join(
+            f"[{item.get('timestamp', '')}] {item.get('topic', '')}" for item in chunk.get("outline", [])
         )
-        
-        # 创建群聊管理器
-        self.manager = GroupChatManager(
-            groupchat=self.groupchat,
-            llm_config={
-                "config_list": summarizer.llm_config["config_list"],
-                "timeout": 120,
-                "temperature": 0.7,
-                "max_tokens": 4000
-            }
+        parts.append(
+            f"PART {index} ({chunk['start']} - {chunk['end']})\n"
+            f"Outline:\n{outline}\n"
+            f"Summary: {chunk.get('summary', '')}\n"
+            f"Keywords: {', '.join(chunk.get('keywords', []))}"
         )
-    
-    def process_summary(self, message: str) -> Tuple[bool, str, Dict]:
-        """处理视频总结请求
-        
-        对话流程：
-        1. UserProxy 发送初始请求
-        2. VideoSummarizer 生成摘要
-        3. OutputValidator 验证摘要
-        4. 如果验证通过，返回结果
-        5. 如果验证失败，返回给 VideoSummarizer 重新生成
-        6. 重复步骤 3-5，最多尝试3次
-        7. 返回最后一次 VideoSummarizer 生成的结果
-        
-        Args:
-            message: 初始请求消息
-            
-        Returns:
-            Tuple[bool, str, Dict]: (是否成功, 错误信息, 结果数据)
-        """
-        try:
-            # 发送初始请求
-            self.user_proxy.initiate_chat(
-                self.manager,
-                message=message
-            )
-            
-            # 从对话历史中提取结果
-            messages = self.groupchat.messages
-            last_summary = None
-            
-            # 遍历消息历史，找到最后一次的总结结果
-            for msg in reversed(messages):
-                if msg["name"] == "VideoSummarizer":
-                    try:
-                        # 提取JSON内容
-                        json_match = re.search(r'```json\n(.*?)\n```', msg["content"], re.DOTALL)
-                        if json_match:
-                            json_str = json_match.group(1)
-                        else:
-                            json_match = re.search(r'({.*})', msg["content"], re.DOTALL)
-                            if json_match:
-                                json_str = json_match.group(1)
-                            else:
-                                continue
-                                
-                        last_summary = json.loads(json_str)
-                        # 找到最后一次生成的结果后直接返回
-                        return True, "", last_summary
-                    except json.JSONDecodeError:
-                        continue
-            
-            # 如果没有找到任何摘要结果
-            return False, "No summary result found", None
-                
-        except Exception as e:
-            error_msg = f"Error in summary processing: {str(e)}"
-            print(error_msg, file=sys.stderr)
-            return False, error_msg, None
+    return "\n\n".join(parts)
+
+async def build_map_reduce_message(
+    video_title: str,
+    video_description: str,
+    parsed_captions: List[Dict[str, str]],
+    output_language: str,
+    on_event: Optional[EventCallback] = None
+) -> str:
+    """分段并发摘要，并生成合并阶段（reduce）的请求消息。
+
+    Args:
+        video_title: 视频标题
+        video_description: 视频描述
+        parsed_captions: 解析后的字幕列表
+        output_language: 输出语言
+        on_event: 进度事件回调
+
+    Returns:
+        合并阶段的请求消息
+
+    Raises:
+        SummaryGenerationError: 所有分段都失败时
+    """
+    chunks = split_caption_chunks(parsed_captions, settings.SUMMARY_CHUNK_TOKENS)
+    print(f"Long transcript split into {len(chunks)} chunks", file=sys.stderr)
+    await emit_event(on_event, "chunks", {"total": len(chunks)})
+    semaphore = asyncio.Semaphore(settings.SUMMARY_CHUNK_CONCURRENCY)
+    chunk_results = await asyncio.gather(*(
+        summarize_chunk(index, len(chunks), chunk, video_title, output_language, semaphore, on_event)
+        for index, chunk in enumerate(chunks, 1)
+    ), return_exceptions=True)
+    # 个别分段重试后仍失败时，合并其余分段并标记缺失部分，不丢弃已完成的分段
+    failures = [result for result in chunk_results if isinstance(result, BaseException)]
+    for result in failures:
+        if not isinstance(result, Exception):
+            raise result
+    if len(failures) == len(chunks):
+        raise failures[0]
+    for index, (chunk, result) in enumerate(zip(chunks, chunk_results)):
+        if isinstance(result, Exception):
+            logger.warning(f"Part {index + 1}/{len(chunks)} left out of the summary: {result}")
+            chunk_results[index] = {"failed": True, "start": chunk[0]['stime'], "end": chunk[-1]['stime']}
+    return MERGE_PROMPT_TEMPLATE.format(
+        title=(video_title or "No title available")[:INPUT_LIMITS["title"]],
+        description=(video_description or "No description available")[:INPUT_LIMITS["description"]],
+        chunk_summaries=format_chunk_summaries(chunk_results),
+        language=output_language
+    )
 
 async def summarize_youtube_video(
     video_title: str,
     video_description: str,
     video_tags: List[str],
     video_captions: str,
-    output_language: str = 'Simplified Chinese'
+    output_language: str = 'Simplified Chinese',
+    parsed_captions: Optional[List[Dict[str, str]]] = None,
+    on_event: Optional[EventCallback] = None
 ) -> Dict[str, Any]:
     """生成YouTube视频摘要。
 
@@ -475,38 +310,76 @@ async def summarize_youtube_video(
         video_tags: 视频标签列表
         video_captions: 视频字幕文本
         output_language: 输出语言，默认为简体中文
+        parsed_captions: 已解析的字幕列表，提供时不再解析 video_captions
+        on_event: 进度事件回调，提供时流式输出大纲条目和摘要正文
 
     Returns:
         Dict[str, Any]: 包含视频摘要的字典
     """
-    # 初始化代理
-    agent_manager = AgentManager()
-    user_proxy = agent_manager.get_user_proxy()
-    summarizer = agent_manager.get_summarizer()
-    validator = agent_manager.get_validator()
+    if parsed_captions is None:
+        parsed_captions = parse_vtt(video_captions)
+
+    # 将字幕压缩为带时间戳的段落
+    full_captions = encode_transcript(parsed_captions, token_budget=sys.maxsize,
+                                      bucket_seconds=settings.TRANSCRIPT_BUCKET_SECONDS)
+
+    caption_tokens = Tokenizer().count(full_captions)
+
+    if caption_tokens > settings.SUMMARY_MAP_REDUCE_THRESHOLD:
+        # 长视频：分段并发摘要后再合并
+        base_message = await build_map_reduce_message(
+            video_title, video_description, parsed_captions, output_language, on_event
+        )
+    else:
+        # 准备初始消息，字幕控制在 token 预算之内
+        encoded_captions = full_captions
+        if caption_tokens > settings.TRANSCRIPT_TOKEN_BUDGET:
+            encoded_captions = encode_transcript(
+                parsed_captions,
+                token_budget=settings.TRANSCRIPT_TOKEN_BUDGET,
+                bucket_seconds=settings.TRANSCRIPT_BUCKET_SECONDS
+            )
+        base_message = format_summary_prompt(
+            video_title=video_title,
+            video_description=video_description,
+            formatted_captions_text=encoded_captions,
+            language=output_language
+        )
     
-    # 创建群聊管理器
-    group_chat = SummaryGroupChat(user_proxy, summarizer, validator)
+    # 处理总结请求（生成 + 验证，每个请求的对话状态相互独立）
+    try:
+        result = await get_summary_engine().summarize(base_message, output_language, on_event=on_event)
+    except Exception as e:
+        raise SummaryGenerationError(f"Error in summary processing: {str(e)}")
 
-    parsed_captions = parse_vtt(video_captions)
+    if result is None:
+        raise ValidationError("Summary validation failed: No summary result found")
 
-    # 准备初始消息
-    base_message = SUMMARY_PROMPT_TEMPLATE.format(
-        title=video_title,
-        description=video_description,
-        captions=parsed_captions,
-        language=output_language
+    return result
+
+async def translate_summary(summary: Dict[str, Any], output_language: str) -> Dict[str, Any]:
+    """把已生成的摘要翻译为另一种语言，不再重新分析字幕。
+
+    Args:
+        summary: 枢纽语言的摘要
+        output_language: 目标语言
+
+    Returns:
+        Dict[str, Any]: 目标语言的摘要，结构与输入相同
+    """
+    message = TRANSLATION_PROMPT_TEMPLATE.format(
+        language=output_language,
+        summary=json.dumps(summary, ensure_ascii=False, indent=2)
     )
-    
-    # 处理总结请求
-    success, error_msg, result = group_chat.process_summary(base_message)
-    
-    if not success:
-        if result:  # 如果有结果但验证失败，仍然返回结果
-            print(f"Warning: {error_msg}", file=sys.stderr)
-            return result
-        raise ValidationError(f"Summary validation failed: {error_msg}")
-        
+    # 与生成摘要相同的本地校验（结构、目标语言文字占比），失败时只重译出错的字段
+    try:
+        result = await get_summary_engine().summarize(message, output_language, system_message=TRANSLATOR_SYSTEM_MESSAGE)
+    except Exception as e:
+        raise SummaryGenerationError(f"Error in summary translation: {str(e)}")
+
+    if result is None:
+        raise ValidationError("Summary translation failed: No translation result found")
+
     return result
 
 def main() -> None:
@@ -536,12 +409,12 @@ Now let's talk about quantum algorithms and how they differ from classical compu
 """
     
     # Run the summarization
-    summary_result = summarize_youtube_video(
+    summary_result = asyncio.run(summarize_youtube_video(
         video_title=sample_title,
         video_description=sample_description,
         video_tags=sample_tags,
         video_captions=sample_captions
-    )
+    ))
     
     # Pretty print the results
     print("\n==== VIDEO SUMMARY RESULTS ====\n", file=sys.stderr)
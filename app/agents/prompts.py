@@ -121,7 +121,7 @@ VIDEO TITLE:
 VIDEO DESCRIPTION:
 {description}
 
-CAPTIONS:
+CAPTIONS (one paragraph per line, prefixed with its start time as [HH:MM:SS]):
 {captions}
 
 OUTPUT CONTENT LANGUAGE:
@@ -141,4 +141,101 @@ INPUT_LIMITS = {
     "title": 200,
     "description": 1000,
     "captions": 100000
-} 
\ No newline at end of file
+} 
+
+# 分段摘要（map 阶段）的系统消息
+CHUNK_SUMMARIZER_SYSTEM_MESSAGE = """
+You are an expert video content analyst. You receive ONE consecutive part of a long video's transcript.
+
+Summarize only this part and return JSON only, without any additional commentary:
+
+```json
+{
+  "outline": [
+    { "timestamp": "HH:MM:SS", "topic": "what is covered from this point" }
+  ],
+  "summary": "Concise, factual summary of this part, keeping all key points, arguments and opinions.",
+  "keywords": ["keyword1", "keyword2", "keyword3"]
+}
+```
+
+Rules:
+- Timestamps must be copied from the transcript lines of this part.
+- 2 to 6 outline items; topics are specific, descriptive phrases of at most 100 characters.
+- Do not reference the video itself or its structure.
+- Write outline topics, summary and keywords in the requested output language; field names stay in English.
+"""
+
+# 分段摘要提示模板
+CHUNK_SUMMARY_PROMPT_TEMPLATE = """
+VIDEO TITLE:
+{title}
+
+PART {index} OF {total} ({start} - {end})
+
+CAPTIONS (one paragraph per line, prefixed with its start time as [HH:MM:SS]):
+{captions}
+
+OUTPUT CONTENT LANGUAGE:
+{language}
+"""
+
+# 合并分段摘要（reduce 阶段）的提示模板
+MERGE_PROMPT_TEMPLATE = """
+You are tasked with summarizing a long YouTube video. The transcript was split into consecutive parts,
+and each part has already been summarized. Merge the partial summaries below into one summary of the whole video.
+
+VIDEO TITLE:
+{title}
+
+VIDEO DESCRIPTION:
+{description}
+
+PARTIAL SUMMARIES (in chronological order):
+{chunk_summaries}
+
+OUTPUT CONTENT LANGUAGE:
+{language}
+
+Instructions:
+- Generate the entire summary content in the specified language: **{language}**, including all outline topics.
+- Build the outline from the partial outlines: merge adjacent or related items, keep their original timestamps, 5 to 15 items in total.
+- The summary must cover the whole video, structured by themes rather than by part.
+- Follow the JSON output format strictly as described in the system message.
+- Do **not** include any introductory or trailing text—**only the JSON object** is expected in your final output.
+"""
+
+# 摘要翻译（多语言扇出）的系统消息
+TRANSLATOR_SYSTEM_MESSAGE = """
+You are a professional translator. You receive a video summary as a JSON object and translate it into the requested language.
+
+Return JSON only, without any additional commentary, with exactly the same structure:
+
+```json
+{
+  "outline": [
+    { "timestamp": "HH:MM:SS", "topic": "translated topic" }
+  ],
+  "summary": "translated summary",
+  "keywords": ["translated keyword1", "translated keyword2"],
+  "language": "the requested output language"
+}
+```
+
+Rules:
+- Translate outline topics, summary and keywords faithfully; do not add, drop or reorder information.
+- Keep every timestamp and the number and order of outline items unchanged.
+- Field names stay in English; set "language" to the requested output language.
+- Proper nouns without an established translation may stay in their original form.
+"""
+
+# 摘要翻译提示模板
+TRANSLATION_PROMPT_TEMPLATE = """
+Translate the following video summary.
+
+OUTPUT CONTENT LANGUAGE:
+{language}
+
+SUMMARY:
+{summary}
+"""
@@ -0,0 +1,369 @@
+"""异步摘要引擎：每个请求独立的对话状态 + 全局并发上限 + 本地输出校验。"""
+import re
+import json
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+
+from openai import AsyncOpenAI
+
+from app.agents.llm_cache import LLMResponseCache
+from app.agents.prompts import SUMMARIZER_SYSTEM_MESSAGE, VALIDATOR_SYSTEM_MESSAGE
+from app.agents.summary_validator import SUMMARY_FIELDS, SummaryIssue, validate_summary
+from app.config import settings
+from app.config.redis_config import RedisClient
+from app.utils.compressed_store import CompressedRedisStore
+
+# 进度事件回调：on_event(事件名, 数据)
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+async def emit_event(on_event: Optional[EventCallback], event: str, data: Dict[str, Any]) -> None:
+    """on_event 不为空时发送进度事件。"""
+    if on_event is not None:
+        await on_event(event, data)
+
+
+def extract_json(content: str) -> Optional[Dict[str, Any]]:
+    """从模型回复中提取JSON对象，支持```json代码块或裸JSON。
+
+    Args:
+        content: 模型回复内容
+
+    Returns:
+        解析后的字典，无法解析时返回None
+    """
+    json_match = re.search(r'```json\n(.*?)\n```', content, re.DOTALL)
+    if not json_match:
+        json_match = re.search(r'({.*})', content, re.DOTALL)
+    if not json_match:
+        return None
+    try:
+        return json.loads(json_match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+
+def format_validation_feedback(validation: Dict[str, Any]) -> str:
+    """把验证器返回的JSON整理为给摘要生成器的修改意见。"""
+    parts = [validation.get("message", "")]
+    for key, title in (
+        ("language_issues", "Language Issues"),
+        ("structure_issues", "Structure Issues"),
+        ("content_issues", "Content Issues"),
+    ):
+        if validation.get(key):
+            parts.append(f"{title}:\n" + "\n".join(f"- {issue}" for issue in validation[key]))
+    if validation.get("errors"):
+        parts.append("Detailed Errors:\n" + "\n".join(
+            f"- {error.get('field')}: {error.get('issue')}\n  {error.get('details')}"
+            for error in validation["errors"]
+        ))
+    return "\n\n".join(part for part in parts if part)
+
+
+def _unescape(raw: str) -> str:
+    try:
+        return json.loads(f'"{raw}"')
+    except json.JSONDecodeError:
+        return raw
+
+
+class SummaryStreamParser:
+    """从流式输出的摘要JSON中尽早取出已完成的大纲条目和摘要正文片段。
+
+    只识别 {"timestamp": ..., "topic": ...} 顺序的大纲条目；
+    无法识别的输出不产生事件，最终结果仍以完整解析为准。
+    """
+
+    _OUTLINE_ITEM = re.compile(
+        r'\{\s*"timestamp"\s*:\s*"((?:[^"\\]|\\.)*)"\s*,\s*"topic"\s*:\s*"((?:[^"\\]|\\.)*)"\s*\}'
+    )
+    _SUMMARY_START = re.compile(r'"summary"\s*:\s*"')
+
+    def __init__(self):
+        self.buffer = ""
+        self._outline_pos = 0
+        self._summary_pos: Optional[int] = None
+        self._summary_done = False
+
+    def feed(self, delta: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """追加一段模型输出，返回新产生的 (事件名, 数据) 列表。"""
+        self.buffer += delta
+        buffer = self.buffer
+        events = []
+
+        for match in self._OUTLINE_ITEM.finditer(buffer, self._outline_pos):
+            events.append(("outline", {"timestamp": _unescape(match.group(1)), "topic": _unescape(match.group(2))}))
+            self._outline_pos = match.end()
+
+        if self._summary_pos is None:
+            match = self._SUMMARY_START.search(buffer)
+            if match:
+                self._summary_pos = match.end()
+        if self._summary_pos is not None and not self._summary_done:
+            start = end = self._summary_pos
+            while end < len(buffer):
+                char = buffer[end]
+                if char == "\\":
+                    # 转义序列不完整时等待下一段输出
+                    step = 6 if buffer[end + 1:end + 2] == "u" else 2
+                    if end + step > len(buffer):
+                        break
+                    end += step
+                    continue
+                if char == '"':
+                    self._summary_done = True
+                    break
+                end += 1
+            if end > start:
+                events.append(("summary_delta", {"text": _unescape(buffer[start:end])}))
+                self._summary_pos = end
+        return events
+
+
+class SummaryEngine:
+    """基于 AsyncOpenAI 的摘要引擎。
+
+    客户端和并发信号量在进程内共享；对话消息只存在于单次调用的局部变量中，
+    请求之间互不可见，调用结束即释放。重试时只保留系统消息、原始请求、
+    最近一次回复和修改意见，单个请求占用的内存不会随重试次数增长。
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_concurrency: int = settings.SUMMARY_MAX_CONCURRENCY,
+        max_attempts: int = settings.SUMMARY_MAX_ATTEMPTS,
+        timeout: float = settings.SUMMARY_LLM_TIMEOUT,
+        temperature: float = settings.SUMMARY_TEMPERATURE,
+        max_tokens: int = settings.SUMMARY_MAX_TOKENS,
+        cache: Optional[LLMResponseCache] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """初始化摘要引擎
+
+        Args:
+            model: 模型名称，默认读取 OPENAI_MODEL
+            api_key: API key，默认读取 OPENAI_API_KEY
+            max_concurrency: 同时进行的 LLM 调用数上限
+            max_attempts: 摘要生成的最大尝试次数
+            timeout: 单次 LLM 调用超时时间（秒）
+            temperature: 采样温度
+            max_tokens: 单次回复的最大 token 数
+            cache: LLM 回复缓存，为空时不缓存
+            logger: 日志记录器，默认使用模块 logger
+        """
+        self.model = model or settings.OPENAI_MODEL
+        self.client = AsyncOpenAI(api_key=api_key or settings.OPENAI_API_KEY, timeout=timeout)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cache = cache
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """发送一次对话补全请求，受全局并发上限约束。
+
+        完全相同的请求（模型、消息、采样参数）直接返回缓存的回复；流式请求命中缓存时，
+        整段回复作为一次 on_delta 回调发出。回复不会自动写入缓存，
+        调用方校验通过后调用 store_reply，校验失败时调用 forget_reply。
+
+        Args:
+            messages: 本次请求的完整消息列表
+            temperature: 覆盖默认采样温度
+            on_delta: 提供时以流式方式请求，每收到一段输出调用一次
+
+        Returns:
+            str: 模型回复内容
+        """
+        temperature = self.temperature if temperature is None else temperature
+        if self.cache is not None:
+            content = await self.cache.get(self._cache_key(messages, temperature))
+            if content is not None:
+                if on_delta is not None and content:
+                    await on_delta(content)
+                return content
+        return await self._request(messages, temperature, on_delta)
+
+    def _cache_key(self, messages: List[Dict[str, str]], temperature: Optional[float]) -> str:
+        temperature = self.temperature if temperature is None else temperature
+        return self.cache.key(self.model, messages, temperature, self.max_tokens)
+
+    async def store_reply(self, messages: List[Dict[str, str]], content: str, temperature: Optional[float] = None) -> None:
+        """缓存一条已校验通过的回复，参数需与对应的 complete 调用一致。"""
+        if self.cache is not None and content:
+            await self.cache.put(self._cache_key(messages, temperature), content)
+
+    async def forget_reply(self, messages: List[Dict[str, str]], temperature: Optional[float] = None) -> None:
+        """移除校验未通过的回复，避免之后相同的请求重放它。"""
+        if self.cache is not None:
+            await self.cache.delete(self._cache_key(messages, temperature))
+
+    async def _request(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        on_delta: Optional[Callable[[str], Awaitable[None]]]
+    ) -> str:
+        async with self.semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=self.max_tokens,
+                stream=on_delta is not None
+            )
+            if on_delta is None:
+                return response.choices[0].message.content or ""
+
+            parts = []
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    await on_delta(delta)
+            return "".join(parts)
+
+    async def validate(self, summary: Dict[str, Any]) -> Optional[str]:
+        """用验证器检查摘要输出。
+
+        Args:
+            summary: 摘要结果
+
+        Returns:
+            Optional[str]: 验证通过返回None，否则返回修改意见
+        """
+        messages = [
+            {"role": "system", "content": VALIDATOR_SYSTEM_MESSAGE},
+            {"role": "user", "content": "Please validate this summary output:\n\n"
+                                        + json.dumps(summary, ensure_ascii=False)}
+        ]
+        content = await self.complete(messages, temperature=0)
+        validation = extract_json(content)
+        if validation is None:
+            return None
+        await self.store_reply(messages, content, temperature=0)
+        if validation.get("is_valid", True):
+            return None
+        return format_validation_feedback(validation)
+
+    async def summarize(
+        self,
+        message: str,
+        language: str,
+        system_message: str = SUMMARIZER_SYSTEM_MESSAGE,
+        on_event: Optional[EventCallback] = None
+    ) -> Optional[Dict[str, Any]]:
+        """生成摘要并在本地校验，校验失败时只要求重写出错的字段。
+
+        对话流程：
+        1. 摘要生成器根据请求生成摘要
+        2. 本地校验结构和各文本字段的语言（见 summary_validator）
+        3. 本地校验通过后，按 SUMMARY_LLM_VALIDATION_RATE 抽样交给 LLM 验证器复核
+        4. 校验通过则返回；否则只把出错字段和原因交给摘要生成器重写，并合并回摘要
+        5. 最多尝试 max_attempts 次，返回最后一次可解析的摘要
+
+        Args:
+            message: 初始请求消息
+            language: 期望的输出语言
+            system_message: 摘要生成器的系统消息
+            on_event: 提供时流式生成，并发送 outline / summary_delta / retry 事件
+
+        Returns:
+            Optional[Dict[str, Any]]: 摘要结果，模型始终未返回可解析的JSON时为None
+        """
+        base = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": message}
+        ]
+        messages = base
+        summary = None
+        fields = None  # 本轮只要求重写的字段，None 表示整体重写
+        for attempt in range(1, self.max_attempts + 1):
+            content = await self._complete_with_events(messages, on_event)
+            reply = extract_json(content)
+            if reply is not None:
+                if fields and summary is not None:
+                    summary = {**summary, **{key: reply[key] for key in fields if key in reply}}
+                else:
+                    summary = reply
+
+            if summary is None:
+                fields = None
+                feedback = "The previous reply was not a valid JSON object. Return only the JSON object."
+            else:
+                summary, issues = validate_summary(summary, language)
+                if not issues and random.random() < settings.SUMMARY_LLM_VALIDATION_RATE:
+                    llm_feedback = await self.validate(summary)
+                    if llm_feedback is not None:
+                        issues = [SummaryIssue("*", llm_feedback)]
+                if not issues:
+                    await self.store_reply(messages, content)
+                    return summary
+                fields = sorted({issue.field for issue in issues})
+                if "*" in fields or not set(fields) <= set(SUMMARY_FIELDS):
+                    fields = None
+                feedback = "\n".join(f"- {issue.detail}" for issue in issues)
+
+            self.logger.warning(f"Summary attempt {attempt} rejected: {feedback}")
+            await self.forget_reply(messages)
+            if attempt == self.max_attempts:
+                break
+            await emit_event(on_event, "retry", {"attempt": attempt + 1, "fields": fields or list(SUMMARY_FIELDS)})
+            # 只保留当前摘要和修改意见，出错字段以外的内容不再重新生成
+            if fields:
+                instruction = (
+                    f"Please fix the following issues:\n\n{feedback}\n\n"
+                    f"Return a JSON object containing ONLY these fields: {', '.join(fields)}."
+                )
+            else:
+                instruction = f"Please fix the following issues and return the corrected JSON only:\n\n{feedback}"
+            messages = base + [
+                {"role": "assistant", "content": content if summary is None else json.dumps(summary, ensure_ascii=False)},
+                {"role": "user", "content": instruction}
+            ]
+        return summary
+
+    async def _complete_with_events(self, messages: List[Dict[str, str]], on_event: Optional[EventCallback]) -> str:
+        if on_event is None:
+            return await self.complete(messages)
+
+        parser = SummaryStreamParser()
+
+        async def on_delta(delta: str) -> None:
+            for event, data in parser.feed(delta):
+                await on_event(event, data)
+
+        return await self.complete(messages, on_delta=on_delta)
+
+
+_engine: Optional[SummaryEngine] = None
+
+# LLM 回复缓存的 Redis key 前缀
+LLM_CACHE_PREFIX = 'llm_response'
+
+
+def get_summary_engine() -> SummaryEngine:
+    """获取进程内共享的摘要引擎（首次调用时创建）。"""
+    global _engine
+    if _engine is None:
+        cache = None
+        if settings.LLM_CACHE_ENABLED:
+            cache = LLMResponseCache(CompressedRedisStore(
+                RedisClient.get_instance(),
+                prefix=LLM_CACHE_PREFIX,
+                ttl=settings.LLM_CACHE_TTL,
+                max_entry_bytes=settings.LLM_CACHE_MAX_ENTRY_BYTES,
+                max_total_bytes=settings.LLM_CACHE_MAX_TOTAL_BYTES
+            ))
+        _engine = SummaryEngine(cache=cache)
+    return _engine
@@ -0,0 +1,175 @@
+"""摘要输出的本地校验：Pydantic 结构校验 + 文字脚本（语言）启发式检查。"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from app.config import settings
+
+SUMMARY_FIELDS = ("outline", "summary", "keywords", "language")
+MAX_KEYWORDS = 3
+
+# 各文字系统的 Unicode 区间
+SCRIPT_RANGES = {
+    "latin": ((0x0041, 0x024F), (0x1E00, 0x1EFF)),
+    "han": ((0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)),
+    "kana": ((0x3040, 0x30FF), (0x31F0, 0x31FF)),
+    "hangul": ((0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)),
+    "cyrillic": ((0x0400, 0x04FF),),
+    "greek": ((0x0370, 0x03FF),),
+    "arabic": ((0x0600, 0x06FF), (0x0750, 0x077F)),
+    "hebrew": ((0x0590, 0x05FF),),
+    "thai": ((0x0E00, 0x0E7F),),
+    "devanagari": ((0x0900, 0x097F),),
+}
+
+# 输出语言名称（小写子串）到期望文字系统的映射
+LANGUAGE_SCRIPTS = {
+    "chinese": {"han"},
+    "japanese": {"han", "kana"},
+    "korean": {"hangul", "han"},
+    "russian": {"cyrillic"},
+    "ukrainian": {"cyrillic"},
+    "bulgarian": {"cyrillic"},
+    "greek": {"greek"},
+    "arabic": {"arabic"},
+    "persian": {"arabic"},
+    "urdu": {"arabic"},
+    "hebrew": {"hebrew"},
+    "thai": {"thai"},
+    "hindi": {"devanagari"},
+    "english": {"latin"},
+    "spanish": {"latin"},
+    "french": {"latin"},
+    "german": {"latin"},
+    "portuguese": {"latin"},
+    "italian": {"latin"},
+    "dutch": {"latin"},
+    "indonesian": {"latin"},
+    "vietnamese": {"latin"},
+    "turkish": {"latin"},
+    "polish": {"latin"},
+}
+
+# 字母数少于此值的文本不做文字系统检查（专有名词、缩写等）
+_MIN_SCRIPT_LETTERS = 4
+
+
+class OutlineItem(BaseModel):
+    """大纲条目。"""
+    model_config = ConfigDict(extra="forbid")
+
+    timestamp: str = Field(pattern=r"^\d{2}:\d{2}:\d{2}$")
+    topic: str = Field(min_length=1, max_length=100)
+
+
+class SummaryOutput(BaseModel):
+    """摘要生成器的输出结构。"""
+    model_config = ConfigDict(extra="forbid")
+
+    outline: List[OutlineItem] = Field(min_length=1, max_length=20)
+    summary: str = Field(min_length=1)
+    keywords: List[str] = Field(min_length=1, max_length=MAX_KEYWORDS)
+    language: str = Field(min_length=1)
+
+
+@dataclass
+class SummaryIssue:
+    """一处校验失败：field 为顶层字段名，detail 为给摘要生成器的说明。"""
+    field: str
+    detail: str
+
+
+def _script_of(char: str) -> Optional[str]:
+    """返回字符所属的文字系统，不在已知区间内时返回None。"""
+    code = ord(char)
+    for script, ranges in SCRIPT_RANGES.items():
+        for low, high in ranges:
+            if low <= code <= high:
+                return script
+    return None
+
+
+def expected_scripts(language: str) -> Optional[set]:
+    """根据输出语言名称推断期望的文字系统，无法识别时返回None。"""
+    name = (language or "").lower()
+    for key, scripts in LANGUAGE_SCRIPTS.items():
+        if key in name:
+            return scripts
+    return None
+
+
+def script_ratio(text: str, scripts: set) -> Optional[float]:
+    """计算文本中属于期望文字系统的字母占比。
+
+    Returns:
+        Optional[float]: 占比；字母太少无法判断时返回None
+    """
+    letters = matched = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        if _script_of(char) in scripts:
+            matched += 1
+    if letters < _MIN_SCRIPT_LETTERS:
+        return None
+    return matched / letters
+
+
+def _check_script(field: str, path: str, text: str, scripts: set, language: str, min_ratio: float) -> Optional[SummaryIssue]:
+    ratio = script_ratio(text, scripts)
+    if ratio is None or ratio >= min_ratio:
+        return None
+    return SummaryIssue(field, f"{path}: not written in {language} ({ratio:.0%} of letters in the expected script)")
+
+
+def repair_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """对可以确定性修复的问题直接修复：去掉多余字段、截断过多的关键词。"""
+    repaired = {key: data[key] for key in SUMMARY_FIELDS if key in data}
+    keywords = repaired.get("keywords")
+    if isinstance(keywords, list) and len(keywords) > MAX_KEYWORDS:
+        repaired["keywords"] = keywords[:MAX_KEYWORDS]
+    return repaired
+
+
+def validate_summary(
+    data: Dict[str, Any],
+    language: str,
+    min_ratio: float = settings.SUMMARY_SCRIPT_MIN_RATIO
+) -> Tuple[Dict[str, Any], List[SummaryIssue]]:
+    """在本地校验摘要输出。
+
+    Args:
+        data: 摘要生成器返回的JSON对象
+        language: 期望的输出语言
+        min_ratio: 文本中期望文字系统字母的最低占比
+
+    Returns:
+        Tuple[Dict[str, Any], List[SummaryIssue]]: (修复/规范化后的摘要, 校验失败列表)
+    """
+    data = repair_summary(data)
+    try:
+        output = SummaryOutput.model_validate(data)
+    except ValidationError as e:
+        issues = []
+        for error in e.errors():
+            loc = error["loc"]
+            field = str(loc[0]) if loc else "outline"
+            path = ".".join(str(part) for part in loc)
+            issues.append(SummaryIssue(field, f"{path}: {error['msg']}"))
+        return data, issues
+
+    data = output.model_dump()
+    scripts = expected_scripts(language)
+    if scripts is None:
+        return data, []
+
+    checks = [_check_script("summary", "summary", output.summary, scripts, language, min_ratio)]
+    checks.extend(
+        _check_script("outline", f"outline.{index}.topic", item.topic, scripts, language, min_ratio)
+        for index, item in enumerate(output.outline)
+    )
+    # 关键词常为专有名词，放宽要求
+    checks.append(_check_script("keywords", "keywords", " ".join(output.keywords), scripts, language, min_ratio / 2))
+    return data, [issue for issue in checks if issue is not None]
@@ -0,0 +1,134 @@
+"""将解析后的字幕压缩为按时间分段的段落文本，并控制在 token 预算之内。"""
+import functools
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CJK_RE = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]')
+_SENTENCE_END = ('.', '!', '?', '。', '！', '？', '…')
+_TRUNCATION_MARK = '…'
+
+
+def _to_seconds(stime: str) -> int:
+    hours, minutes, seconds = (int(p) for p in stime.split(':'))
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class Tokenizer:
+    """token 计数与截断；优先使用 tiktoken，不可用时（如离线环境无法下载编码表）按字符估算。"""
+
+    def __init__(self, model: Optional[str] = None):
+        self.encoding = _load_encoding(model or os.getenv("OPENAI_MODEL") or '')
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        # 中日韩文字约 1 字 1 token，其他文字约 4 字符 1 token
+        cjk = len(_CJK_RE.findall(text))
+        return cjk + (len(text) - cjk + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ''
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self.encoding.decode(tokens[:max_tokens]) + _TRUNCATION_MARK
+        total = self.count(text)
+        if total <= max_tokens:
+            return text
+        return text[:max(1, len(text) * max_tokens // total)] + _TRUNCATION_MARK
+
+
+@functools.lru_cache(maxsize=8)
+def _load_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, falling back to estimation: {e}")
+        return None
+
+
+def build_paragraphs(cues: List[Dict[str, str]], bucket_seconds: int) -> List[Tuple[str, str]]:
+    """合并相邻字幕为段落。
+
+    段落时长达到 bucket_seconds 后在句末断开；没有句末标点（如自动字幕）时，最长不超过 2 倍 bucket_seconds。
+
+    Returns:
+        List[Tuple[str, str]]: [(段落起始时间, 段落文本)]
+    """
+    paragraphs: List[Tuple[str, str]] = []
+    start: Optional[str] = None
+    start_seconds = 0
+    texts: List[str] = []
+    for cue in cues:
+        seconds = _to_seconds(cue['stime'])
+        if start is not None:
+            elapsed = seconds - start_seconds
+            if elapsed >= 2 * bucket_seconds or (elapsed >= bucket_seconds and texts[-1].endswith(_SENTENCE_END)):
+                paragraphs.append((start, ' '.join(texts)))
+                start = None
+        if start is None:
+            start, start_seconds, texts = cue['stime'], seconds, []
+        texts.append(cue['txt'])
+    if start is not None:
+        paragraphs.append((start, ' '.join(texts)))
+    return paragraphs
+
+
+def _render(paragraphs: List[Tuple[str, str]]) -> str:
+    return '\n'.join(f"[{stime}] {text}" for stime, text in paragraphs)
+
+
+def encode_transcript(
+    cues: List[Dict[str, str]],
+    token_budget: int,
+    bucket_seconds: int = 30,
+    tokenizer: Optional[Tokenizer] = None
+) -> str:
+    """把字幕编码为紧凑的 "[HH:MM:SS] 段落" 文本，并保证不超过 token_budget。
+
+    超出预算时，先加大分段间隔以减少时间戳开销，再按比例截断每个段落的尾部，
+    从而保留整个视频时间轴上的大纲时间点，而不是直接丢掉视频后半部分。
+    """
+    tokenizer = tokenizer or Tokenizer()
+    if not cues:
+        return ''
+
+    paragraphs = build_paragraphs(cues, bucket_seconds)
+    encoded = _render(paragraphs)
+    total = tokenizer.count(encoded)
+    if total <= token_budget:
+        return encoded
+
+    # 时间戳开销（每行约 8 token）不应超过预算的四分之一
+    while len(paragraphs) * 8 > token_budget // 4 and len(paragraphs) > 1:
+        bucket_seconds *= 2
+        paragraphs = build_paragraphs(cues, bucket_seconds)
+
+    counts = [tokenizer.count(text) for _, text in paragraphs]
+    overhead = len(paragraphs) * 8
+    ratio = max(token_budget - overhead, 0) / max(sum(counts), 1)
+    for _ in range(5):
+        truncated = [
+            (stime, tokenizer.truncate(text, int(count * ratio)))
+            for (stime, text), count in zip(paragraphs, counts)
+        ]
+        encoded = _render([(stime, text) for stime, text in truncated if text])
+        total = tokenizer.count(encoded)
+        if total <= token_budget:
+            break
+        ratio *= token_budget / total * 0.95
+    logger.info(f"Transcript encoded into {len(paragraphs)} paragraphs, ~{total} tokens (budget {token_budget})")
+    return encoded
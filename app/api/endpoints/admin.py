@@ -0,0 +1,81 @@
+from fastapi import APIRouter
+from app.api.endpoints.yt_dlp import yt_service
+from app.config.redis_config import RedisClient
+from app.agents.summary_engine import get_summary_engine
+from app.utils.yt_dlp_utils import video_info_pool, identity_pool
+from app.workers.warmup_worker import warmup_stats
+
+router = APIRouter()
+
+
+@router.get("/cache")
+async def cache_stats():
+    stores = [yt_service.subtitle_store.store]
+    engine = get_summary_engine()
+    if engine.cache is not None:
+        stores.append(engine.cache.store)
+    return {
+        "msg": "",
+        "code": "000",
+        "data": [cache.stats() for cache in yt_service.local_caches.values()] + [
+            await store.stats() for store in stores
+        ]
+    }
+
+
+@router.get("/redis")
+async def redis_stats():
+    return {
+        "msg": "",
+        "code": "000",
+        "data": RedisClient.stats()
+    }
+
+
+@router.get("/extraction")
+async def extraction_stats():
+    return {
+        "msg": "",
+        "code": "000",
+        "data": {
+            "pending": yt_service.extraction_executor.pending,
+            "ydl_pool": video_info_pool.stats(),
+            "guard": await yt_service.extraction_guard.stats()
+        }
+    }
+
+
+@router.get("/identities")
+async def identity_stats():
+    return {
+        "msg": "",
+        "code": "000",
+        "data": identity_pool.stats()
+    }
+
+
+@router.get("/queues")
+async def queue_stats():
+    return {
+        "msg": "",
+        "code": "000",
+        "data": [await yt_service.transcript_queue.stats()]
+    }
+
+
+@router.get("/queues/dead")
+async def queue_dead_letters(limit: int = 100):
+    return {
+        "msg": "",
+        "code": "000",
+        "data": await yt_service.transcript_queue.dead_letters(limit)
+    }
+
+
+@router.get("/warmup")
+async def warmup_status():
+    return {
+        "msg": "",
+        "code": "000",
+        "data": await warmup_stats(yt_service.redis_client)
+    }
@@ -1,11 +1,22 @@
 from app.services.yt_dlp_service import YoutubeDLPService, SubtitleError, VideoProcessingError
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 import traceback
+import asyncio
+import json
 import sys
 import logging
 import os
 from app.config.redis_config import redis_client
+from app.config import settings
+from app.utils.extraction_executor import ExtractionBusyError, ExtractionTimeoutError
+from app.utils.identity_pool import IdentityUnavailableError
+from app.utils.extraction_guard import ExtractionGuardError
+from app.utils.single_flight import SingleFlightTimeoutError
+from app.utils.yt_dlp_utils import select_video_info_fields
+from app.models.youtube import YoutubeVideoInfo
 
 # 配置日志
 logging.basicConfig(
@@ -26,21 +37,94 @@ router = APIRouter()
 # Initialize the service
 yt_service = YoutubeDLPService(redis_client=redis_client, logger=logger)
 
+# SSE 空闲时发送注释行的间隔（秒），防止代理断开连接
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def check_summary_languages(languages: Optional[List[str]]) -> Optional[List[str]]:
+    unknown = [language for language in languages or [] if language not in YoutubeDLPService.SUMMARY_LANGUAGES]
+    if unknown:
+        raise ValueError(f"Unsupported languages: {', '.join(unknown)}; "
+                         f"supported: {', '.join(YoutubeDLPService.SUMMARY_LANGUAGES)}")
+    return languages
+
 class SummaryRequest(BaseModel):
     video_id: str
-class VideoRequest(BaseModel):
+    # 摘要语言代码，默认只返回枢纽语言；返回的摘要列表与其顺序一致
+    languages: Optional[List[str]] = Field(None, min_length=1)
+
+    _check_languages = field_validator('languages')(check_summary_languages)
+class VideoInfoView(BaseModel):
+    # 响应字段：fields 优先，否则使用 profile 预设（见 YoutubeDLPService.VIDEO_INFO_PROFILES）
+    fields: Optional[List[str]] = Field(None, min_length=1)
+    profile: str = 'full'
+    # 指定时 thumbnail 为最适合该宽度（像素）的缩略图
+    thumbnail_width: Optional[int] = Field(None, gt=0)
+
+    @field_validator('fields')
+    @classmethod
+    def check_fields(cls, fields: Optional[List[str]]) -> Optional[List[str]]:
+        unknown = [field for field in fields or [] if field not in YoutubeVideoInfo.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(fields)) if fields else fields
+
+    @field_validator('profile')
+    @classmethod
+    def check_profile(cls, profile: str) -> str:
+        if profile not in YoutubeDLPService.VIDEO_INFO_PROFILES:
+            raise ValueError(f"Unknown profile: {profile}; supported: {', '.join(YoutubeDLPService.VIDEO_INFO_PROFILES)}")
+        return profile
+
+    def selected_fields(self) -> Optional[List[str]]:
+        return self.fields or YoutubeDLPService.VIDEO_INFO_PROFILES[self.profile]
+
+    def view(self, info):
+        return select_video_info_fields(info, self.selected_fields(), self.thumbnail_width)
+class VideoRequest(VideoInfoView):
     video_url: str
+    force_refresh: bool = False
+class VideoBatchRequest(VideoInfoView):
+    video_urls: List[str] = Field(min_length=1, max_length=settings.BATCH_MAX_ITEMS)
+    force_refresh: bool = False
+class SummaryBatchRequest(BaseModel):
+    video_ids: List[str] = Field(min_length=1, max_length=settings.BATCH_MAX_ITEMS)
+    languages: Optional[List[str]] = Field(None, min_length=1)
+
+    _check_languages = field_validator('languages')(check_summary_languages)
+class PlaylistRequest(BaseModel):
+    playlist_url: str
+    page: int = Field(1, ge=1)
+    page_size: int = Field(settings.PLAYLIST_PAGE_SIZE, ge=1, le=settings.BATCH_MAX_ITEMS)
+    schedule: bool = True
+
+def extraction_guard_response(e: ExtractionGuardError):
+    """上游提取被全局限流或熔断拒绝：返回 004，retry_after 为建议的重试等待秒数。"""
+    return {"msg": str(e), "code": "004", "data": {"retry_after": round(e.retry_after, 1)}}
 
 @router.post("/videoinfo")
 async def video_info(request: VideoRequest):
     logger.info(f"Get video info via video URL: {request.video_url}")
     try:
-        video_info = await yt_service.get_video_info(request.video_url)
+        video_info = await yt_service.get_video_info(
+            request.video_url,
+            force_refresh=request.force_refresh,
+            groups=yt_service.freshness_groups(request.selected_fields())
+        )
         return {
             "msg": "",
             "code": "000",
-            "data": video_info
+            "data": request.view(video_info)
         }
+    except ExtractionGuardError as e:
+        logger.warning(f"Extraction rejected: {str(e)}")
+        return extraction_guard_response(e)
+    except (ExtractionBusyError, IdentityUnavailableError) as e:
+        logger.warning(f"Extraction busy: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except ExtractionTimeoutError as e:
+        logger.warning(f"Extraction timeout: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         # 获取完整的错误堆栈
         error_traceback = traceback.format_exc()
@@ -55,23 +139,66 @@ async def video_info(request: VideoRequest):
             detail=f"Error get video info {str(e)}\nTraceback:\n{error_traceback}"
         )
 
-@router.post("/summary")
-async def summary_post(request: SummaryRequest):
-    logger.info(f"Processing video ID: {request.video_id}")
+@router.post("/videoinfo/batch")
+async def video_info_batch(request: VideoBatchRequest):
+    """批量获取视频信息，每个条目带独立的状态码：000 成功，002 处理失败。"""
+    logger.info(f"Get video info batch: {len(request.video_urls)} items")
+    results = await yt_service.get_video_info_batch(
+        request.video_urls,
+        force_refresh=request.force_refresh,
+        groups=yt_service.freshness_groups(request.selected_fields())
+    )
+    items = []
+    for video_url in request.video_urls:
+        result = results[video_url]
+        if isinstance(result, ExtractionGuardError):
+            items.append({"video_url": video_url, **extraction_guard_response(result)})
+        elif isinstance(result, Exception):
+            items.append({"video_url": video_url, "msg": str(result), "code": "002", "data": None})
+        else:
+            items.append({"video_url": video_url, "msg": "", "code": "000", "data": request.view(result)})
+    return {
+        "msg": "",
+        "code": "000",
+        "data": items
+    }
+
+@router.post("/playlist")
+async def playlist_entries(request: PlaylistRequest):
+    """分页列出播放列表或频道上传的视频，并在后台处理尚未缓存的视频。"""
+    logger.info(f"List playlist entries: {request.playlist_url} page {request.page}")
     try:
-        data = await yt_service.get_video_summary(request.video_id)
-        if not data or len(data) == 0:
-            return {
-                "msg": "No video summary",
-                "code": "003",
-                "data": None
-            }
+        data = await yt_service.get_playlist_entries(
+            request.playlist_url,
+            page=request.page,
+            page_size=request.page_size,
+            schedule=request.schedule
+        )
         return {
             "msg": "",
             "code": "000",
             "data": data
         }
-    except VideoProcessingError as e:
+    except ExtractionGuardError as e:
+        logger.warning(f"Extraction rejected: {str(e)}")
+        return extraction_guard_response(e)
+    except (ExtractionBusyError, IdentityUnavailableError) as e:
+        logger.warning(f"Extraction busy: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except ExtractionTimeoutError as e:
+        logger.warning(f"Extraction timeout: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing playlist: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error listing playlist: {str(e)}")
+
+@router.post("/summary")
+async def summary_post(request: SummaryRequest):
+    logger.info(f"Processing video ID: {request.video_id}")
+    try:
+        data = await yt_service.get_video_summary(request.video_id, languages=request.languages)
+        return summary_response(data)
+    except (VideoProcessingError, SingleFlightTimeoutError) as e:
         logger.warning(f"Video processing error: {str(e)}")
         return {
             "msg": str(e),
@@ -85,6 +212,9 @@ async def summary_post(request: SummaryRequest):
             "code": "001",
             "data": None
         }
+    except ExtractionGuardError as e:
+        logger.warning(f"Extraction rejected: {str(e)}")
+        return extraction_guard_response(e)
     except Exception as e:
         # 获取完整的错误堆栈
         error_traceback = traceback.format_exc()
@@ -99,6 +229,103 @@ async def summary_post(request: SummaryRequest):
             detail=f"Error processing video: {str(e)}\nTraceback:\n{error_traceback}"
         )
 
+def summary_response(data):
+    if not data or len(data) == 0:
+        return {
+            "msg": "No video summary",
+            "code": "003",
+            "data": None
+        }
+    return {
+        "msg": "",
+        "code": "000",
+        "data": data
+    }
+
+def summary_error_response(e: Exception):
+    if isinstance(e, (VideoProcessingError, SingleFlightTimeoutError)):
+        return {"msg": str(e), "code": "002", "data": None}
+    if isinstance(e, SubtitleError):
+        return {"msg": str(e), "code": "001", "data": None}
+    if isinstance(e, ExtractionGuardError):
+        return extraction_guard_response(e)
+    return None
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/summary/batch")
+async def summary_batch(request: SummaryBatchRequest):
+    """批量获取视频摘要，每个条目的状态码与 /summary 相同。"""
+    logger.info(f"Processing summary batch: {len(request.video_ids)} items")
+    results = await yt_service.get_video_summary_batch(request.video_ids, languages=request.languages)
+    items = []
+    for video_id in request.video_ids:
+        result = results[video_id]
+        if isinstance(result, Exception):
+            response = summary_error_response(result)
+            if response is None:
+                logger.error(f"Error processing video {video_id}: {str(result)}")
+                response = {"msg": f"Error processing video: {str(result)}", "code": "002", "data": None}
+        else:
+            response = summary_response(result)
+        items.append({"video_id": video_id, **response})
+    return {
+        "msg": "",
+        "code": "000",
+        "data": items
+    }
+
+@router.post("/summary/stream")
+async def summary_stream(request: SummaryRequest):
+    """以 Server-Sent Events 流式返回摘要。
+
+    进度事件：info、subtitle、cues、chunks、chunk、waiting、retry、translate（开始翻译其他语言）；
+    模型输出事件：outline（每个大纲条目）、summary_delta（摘要正文片段）；
+    最后以 result 事件（与 /summary 相同的响应结构）或 error 事件结束。
+    缓存命中时只发送一个 result 事件。
+    """
+    logger.info(f"Streaming summary for video ID: {request.video_id}")
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def on_event(event: str, data) -> None:
+        await events.put((event, data))
+
+    async def run() -> None:
+        try:
+            data = await yt_service.get_video_summary(request.video_id, on_event, languages=request.languages)
+            await events.put(("result", summary_response(data)))
+        except Exception as e:
+            response = summary_error_response(e)
+            if response is None:
+                logger.error(f"Error processing video: {str(e)}", exc_info=True)
+                response = {"msg": f"Error processing video: {str(e)}", "code": "500", "data": None}
+            else:
+                logger.warning(f"Summary error: {str(e)}")
+            await events.put(("error", response))
+        finally:
+            await events.put(None)
+
+    # 客户端断开后任务继续执行，结果照常写入缓存；由服务统一跟踪，进程退出时取消
+    yt_service.spawn_background(run())
+
+    async def stream():
+        while True:
+            try:
+                item = await asyncio.wait_for(events.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            yield sse_event(*item)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/summary_mock")
 async def summary_mock():
     mock_data = {
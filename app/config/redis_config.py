@@ -1,19 +1,125 @@
 import os
-import redis
-from typing import Optional
+import time
+import bisect
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+from typing import Any, Dict, List, Optional
+from app.config import settings
+
+
+class LatencyHistogram:
+    """按固定桶统计命令耗时（毫秒）。"""
+
+    BUCKETS_MS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, elapsed_ms)] += 1
+        self.total += 1
+        self.sum_ms += elapsed_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b}ms" for b in self.BUCKETS_MS] + ["gt_1000ms"]
+        return {
+            'count': self.total,
+            'avg_ms': self.sum_ms / self.total if self.total else 0.0,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class _InstrumentedPipeline(Pipeline):
+    latency: Dict[str, LatencyHistogram]
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            _record(self.latency, 'PIPELINE', start)
+
+
+class InstrumentedRedis(redis.Redis):
+    """记录每种命令耗时直方图的异步 Redis 客户端。"""
+
+    latency: Dict[str, LatencyHistogram]
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            _record(self.latency, str(args[0]).upper(), start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        pipe = _InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+        pipe.latency = self.latency
+        return pipe
+
+
+def _record(latency: Dict[str, LatencyHistogram], command: str, start: float) -> None:
+    histogram = latency.get(command)
+    if histogram is None:
+        histogram = latency[command] = LatencyHistogram()
+    histogram.record((time.perf_counter() - start) * 1000)
+
 
 class RedisClient:
-    _instance: Optional[redis.Redis] = None
+    _instance: Optional[InstrumentedRedis] = None
 
     @classmethod
-    def get_instance(cls) -> redis.Redis:
+    def get_instance(cls) -> InstrumentedRedis:
         if cls._instance is None:
             redis_url = os.getenv("REDIS_URL")
             print(redis_url)
             if not redis_url:
                 raise ValueError("REDIS_URL environment variable is not set")
-            cls._instance = redis.Redis.from_url(redis_url)
+            # 连接池满时阻塞等待而不是无限新建连接；连接错误时按指数退避重连
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                retry=Retry(
+                    ExponentialBackoff(cap=settings.REDIS_RETRY_BACKOFF_CAP, base=settings.REDIS_RETRY_BACKOFF_BASE),
+                    settings.REDIS_RETRY_ATTEMPTS
+                ),
+                retry_on_error=[ConnectionError, TimeoutError],
+            )
+            cls._instance = InstrumentedRedis(connection_pool=pool)
+            cls._instance.latency = {}
         return cls._instance
 
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """连接池配置、使用情况和命令耗时直方图。"""
+        client = cls.get_instance()
+        pool = client.connection_pool
+        return {
+            'pool': {
+                'max_connections': pool.max_connections,
+                'timeout': pool.timeout,
+                'in_use': len(pool._in_use_connections),
+                'available': len(pool._available_connections),
+                'health_check_interval': settings.REDIS_HEALTH_CHECK_INTERVAL,
+                'retry_attempts': settings.REDIS_RETRY_ATTEMPTS,
+            },
+            'latency': {command: h.snapshot() for command, h in sorted(client.latency.items())},
+        }
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._instance is not None:
+            await cls._instance.aclose()
+            cls._instance = None
+
 # Create a global instance for easy access
-redis_client = RedisClient.get_instance() 
\ No newline at end of file
+redis_client = RedisClient.get_instance() 
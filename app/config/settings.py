@@ -12,3 +12,130 @@ elif ENV == 'development':
     load_dotenv('.env.dev')
 else:
     load_dotenv('.env.local')  # for local testing
+
+# yt-dlp 提取线程池配置
+EXTRACTION_MAX_WORKERS = int(os.getenv('EXTRACTION_MAX_WORKERS', '4'))      # 并发提取线程数
+EXTRACTION_MAX_QUEUE = int(os.getenv('EXTRACTION_MAX_QUEUE', '16'))         # 排队等待的最大任务数
+EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', '90'))           # 单次提取超时时间（秒）
+
+# /summary 单飞（single-flight）配置
+SUMMARY_LOCK_LEASE = float(os.getenv('SUMMARY_LOCK_LEASE', '300'))                 # 分布式锁租约（秒）
+SUMMARY_LOCK_POLL_INTERVAL = float(os.getenv('SUMMARY_LOCK_POLL_INTERVAL', '2'))   # 等待方轮询间隔（秒）
+SUMMARY_WAIT_TIMEOUT = float(os.getenv('SUMMARY_WAIT_TIMEOUT', '600'))             # 等待方最长等待时间（秒）
+SUMMARY_RESULT_TTL = float(os.getenv('SUMMARY_RESULT_TTL', '30'))                   # 生成结果（含转写任务状态）交给其他进程等待方的保留时间（秒）
+
+# video_info 读穿缓存：各字段组的新鲜度（秒）
+VIDEO_INFO_STATIC_TTL = float(os.getenv('VIDEO_INFO_STATIC_TTL', str(7 * 24 * 3600)))  # 标题、描述、频道等静态元数据
+VIDEO_INFO_STATS_TTL = float(os.getenv('VIDEO_INFO_STATS_TTL', '3600'))                  # 播放量、点赞数等统计数据
+VIDEO_INFO_SUBTITLE_TTL = float(os.getenv('VIDEO_INFO_SUBTITLE_TTL', str(3 * 3600)))     # 带签名的字幕 URL
+
+# 进程内一级缓存配置
+LOCAL_CACHE_TTL = float(os.getenv('LOCAL_CACHE_TTL', '300'))                                        # 条目存活时间（秒）
+LOCAL_CACHE_SUMMARY_MAX_BYTES = int(os.getenv('LOCAL_CACHE_SUMMARY_MAX_BYTES', str(32 * 1024 * 1024)))
+LOCAL_CACHE_VIDEO_INFO_MAX_BYTES = int(os.getenv('LOCAL_CACHE_VIDEO_INFO_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Redis 连接池配置
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '32'))              # 每个 worker 的最大连接数
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', '5'))                   # 等待空闲连接的超时时间（秒）
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', '30'))  # 空闲连接健康检查间隔（秒）
+REDIS_RETRY_ATTEMPTS = int(os.getenv('REDIS_RETRY_ATTEMPTS', '3'))                 # 连接错误时的重连次数
+REDIS_RETRY_BACKOFF_BASE = float(os.getenv('REDIS_RETRY_BACKOFF_BASE', '0.05'))    # 指数退避起始时间（秒）
+REDIS_RETRY_BACKOFF_CAP = float(os.getenv('REDIS_RETRY_BACKOFF_CAP', '2'))         # 指数退避上限（秒）
+
+# 转写 worker 配置
+TRANSCRIPT_WORKER_EMBEDDED = os.getenv('TRANSCRIPT_WORKER_EMBEDDED', 'false').lower() == 'true'  # 是否随 API 进程启动
+TRANSCRIPT_WORKER_CONCURRENCY = int(os.getenv('TRANSCRIPT_WORKER_CONCURRENCY', '2'))             # 同时处理的任务数
+TRANSCRIPT_LEASE_SECONDS = float(os.getenv('TRANSCRIPT_LEASE_SECONDS', '600'))                   # 任务租约（秒），超时未续约可被重新认领
+TRANSCRIPT_POLL_INTERVAL = float(os.getenv('TRANSCRIPT_POLL_INTERVAL', '5'))                     # 无任务时的轮询间隔（秒）
+TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', 'app.workers.transcription_backends:WhisperTranscriptionBackend')
+TRANSCRIPTION_MODEL = os.getenv('TRANSCRIPTION_MODEL', 'whisper-1')
+TRANSCRIPT_MAX_ATTEMPTS = int(os.getenv('TRANSCRIPT_MAX_ATTEMPTS', '3'))                         # 失败多少次后进入死信
+TRANSCRIPT_AUDIO_TIMEOUT = float(os.getenv('TRANSCRIPT_AUDIO_TIMEOUT', '600'))                   # 音频下载超时时间（秒）
+
+# 共享 HTTP 客户端配置（字幕下载）
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '10'))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '60'))         # 空闲连接保持时间（秒）
+HTTP_RETRY_BACKOFF_BASE = float(os.getenv('HTTP_RETRY_BACKOFF_BASE', '1'))      # 退避起始时间（秒）
+HTTP_RETRY_BACKOFF_CAP = float(os.getenv('HTTP_RETRY_BACKOFF_CAP', '10'))       # 退避上限（秒）
+
+# 字幕内容缓存配置
+SUBTITLE_STORE_TTL = float(os.getenv('SUBTITLE_STORE_TTL', str(30 * 24 * 3600)))                       # 条目存活时间（秒）
+SUBTITLE_STORE_MAX_ENTRY_BYTES = int(os.getenv('SUBTITLE_STORE_MAX_ENTRY_BYTES', str(2 * 1024 * 1024)))  # 压缩后单条上限
+SUBTITLE_STORE_MAX_TOTAL_BYTES = int(os.getenv('SUBTITLE_STORE_MAX_TOTAL_BYTES', str(512 * 1024 * 1024)))
+
+# 摘要提示中的字幕编码
+TRANSCRIPT_TOKEN_BUDGET = int(os.getenv('TRANSCRIPT_TOKEN_BUDGET', '24000'))     # 字幕部分的 token 上限
+TRANSCRIPT_BUCKET_SECONDS = int(os.getenv('TRANSCRIPT_BUCKET_SECONDS', '30'))    # 段落时间间隔（秒）
+
+# 长视频分段摘要（map-reduce）
+SUMMARY_MAP_REDUCE_THRESHOLD = int(os.getenv('SUMMARY_MAP_REDUCE_THRESHOLD', str(TRANSCRIPT_TOKEN_BUDGET)))  # 字幕超过此 token 数时分段摘要
+SUMMARY_CHUNK_TOKENS = int(os.getenv('SUMMARY_CHUNK_TOKENS', '8000'))             # 每段字幕的 token 上限
+SUMMARY_CHUNK_CONCURRENCY = int(os.getenv('SUMMARY_CHUNK_CONCURRENCY', '4'))      # 同时进行的分段摘要数
+SUMMARY_CHUNK_MAX_ATTEMPTS = max(1, int(os.getenv('SUMMARY_CHUNK_MAX_ATTEMPTS', '3')))  # 单个分段摘要的最大尝试次数
+
+# 摘要引擎（OpenAI）配置
+OPENAI_MODEL = os.getenv('OPENAI_MODEL')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+SUMMARY_MAX_CONCURRENCY = int(os.getenv('SUMMARY_MAX_CONCURRENCY', '8'))   # 每个进程同时进行的 LLM 调用数
+SUMMARY_MAX_ATTEMPTS = int(os.getenv('SUMMARY_MAX_ATTEMPTS', '3'))         # 摘要生成的最大尝试次数
+SUMMARY_LLM_TIMEOUT = float(os.getenv('SUMMARY_LLM_TIMEOUT', '120'))       # 单次 LLM 调用超时时间（秒）
+SUMMARY_TEMPERATURE = float(os.getenv('SUMMARY_TEMPERATURE', '0.7'))
+SUMMARY_MAX_TOKENS = int(os.getenv('SUMMARY_MAX_TOKENS', '4000'))          # 单次回复的最大 token 数
+
+# 摘要输出校验
+SUMMARY_SCRIPT_MIN_RATIO = float(os.getenv('SUMMARY_SCRIPT_MIN_RATIO', '0.6'))            # 文本中目标语言文字的最低占比
+SUMMARY_LLM_VALIDATION_RATE = float(os.getenv('SUMMARY_LLM_VALIDATION_RATE', '0'))       # 本地校验通过后仍交给 LLM 验证器抽检的比例
+
+# 批量接口配置
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '50'))                          # 单次请求的最大条目数
+BATCH_VIDEO_INFO_CONCURRENCY = int(os.getenv('BATCH_VIDEO_INFO_CONCURRENCY', '4'))  # 缓存未命中时的并发提取数
+BATCH_SUMMARY_CONCURRENCY = int(os.getenv('BATCH_SUMMARY_CONCURRENCY', '2'))        # 缓存未命中时的并发摘要数
+PLAYLIST_PAGE_SIZE = int(os.getenv('PLAYLIST_PAGE_SIZE', '20'))                    # 播放列表/频道展开的默认每页条目数
+
+# YoutubeDL 实例复用
+YDL_POOL_MAX_USES = int(os.getenv('YDL_POOL_MAX_USES', '50'))   # 单个实例使用多少次后重建
+
+# 请求身份池（cookies / User-Agent / 代理轮换）
+IDENTITY_POOL_FILE = os.getenv('IDENTITY_POOL_FILE')                                    # 身份列表 JSON 文件，未配置时使用默认 cookies
+IDENTITY_RATE_PER_MINUTE = float(os.getenv('IDENTITY_RATE_PER_MINUTE', '30'))          # 每个身份的平均请求速率，0 表示不限速
+IDENTITY_BURST = float(os.getenv('IDENTITY_BURST', '5'))                               # 令牌桶容量
+IDENTITY_COOLDOWN_BASE = float(os.getenv('IDENTITY_COOLDOWN_BASE', '60'))              # 被限流后的首次冷却时间（秒），连续限流时翻倍
+IDENTITY_COOLDOWN_MAX = float(os.getenv('IDENTITY_COOLDOWN_MAX', '1800'))
+IDENTITY_ACQUIRE_TIMEOUT = float(os.getenv('IDENTITY_ACQUIRE_TIMEOUT', '10'))          # 等待可用身份的最长时间（秒）
+IDENTITY_MAX_ATTEMPTS = int(os.getenv('IDENTITY_MAX_ATTEMPTS', '2'))                   # 单次提取最多尝试的身份数
+
+# YouTube 提取的全局限流（AIMD）与熔断，所有 worker 通过 Redis 共享
+EXTRACTION_QPS_MAX = float(os.getenv('EXTRACTION_QPS_MAX', '5'))                          # 全局提取速率上限（次/秒）
+EXTRACTION_QPS_MIN = float(os.getenv('EXTRACTION_QPS_MIN', '0.5'))                        # 退避后的速率下限，也是熔断恢复后的起始速率
+EXTRACTION_AIMD_WINDOW = float(os.getenv('EXTRACTION_AIMD_WINDOW', '10'))                 # 统计失败率并调整速率的时间窗口（秒）
+EXTRACTION_AIMD_FAILURE_THRESHOLD = float(os.getenv('EXTRACTION_AIMD_FAILURE_THRESHOLD', '0.1'))  # 窗口失败率超过此值时降速
+EXTRACTION_AIMD_DECREASE = float(os.getenv('EXTRACTION_AIMD_DECREASE', '0.5'))            # 降速时的乘数
+EXTRACTION_AIMD_INCREASE = float(os.getenv('EXTRACTION_AIMD_INCREASE', '0.5'))            # 每个正常窗口增加的速率（次/秒）
+EXTRACTION_BREAKER_MIN_FAILURES = int(os.getenv('EXTRACTION_BREAKER_MIN_FAILURES', '5'))  # 窗口内至少失败多少次才可能熔断
+EXTRACTION_BREAKER_FAILURE_THRESHOLD = float(os.getenv('EXTRACTION_BREAKER_FAILURE_THRESHOLD', '0.5'))  # 熔断的窗口失败率
+EXTRACTION_BREAKER_OPEN_SECONDS = float(os.getenv('EXTRACTION_BREAKER_OPEN_SECONDS', '60'))      # 熔断持续时间（秒）
+EXTRACTION_BREAKER_PROBE_TIMEOUT = float(os.getenv('EXTRACTION_BREAKER_PROBE_TIMEOUT', '60'))    # 探测请求未报告结果时，多久后允许下一个探测
+EXTRACTION_BREAKER_PROBE_SUCCESSES = int(os.getenv('EXTRACTION_BREAKER_PROBE_SUCCESSES', '2'))   # 连续成功多少次探测后恢复
+EXTRACTION_RATE_MAX_WAIT = float(os.getenv('EXTRACTION_RATE_MAX_WAIT', '10'))             # 等待提取名额的最长时间（秒）
+YTDLP_EXTRACTOR_RETRIES = int(os.getenv('YTDLP_EXTRACTOR_RETRIES', '3'))                  # yt-dlp 内部的提取重试次数
+
+# LLM 回复缓存（按模型 + 消息 + 采样参数的哈希寻址）
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', str(30 * 24 * 3600)))                          # 条目存活时间（秒）
+LLM_CACHE_MAX_ENTRY_BYTES = int(os.getenv('LLM_CACHE_MAX_ENTRY_BYTES', str(256 * 1024)))         # 压缩后单条上限
+LLM_CACHE_MAX_TOTAL_BYTES = int(os.getenv('LLM_CACHE_MAX_TOTAL_BYTES', str(256 * 1024 * 1024)))
+
+# 多语言摘要：只用枢纽语言分析字幕，其他语言由枢纽语言摘要翻译得到
+SUMMARY_PIVOT_LANGUAGE = os.getenv('SUMMARY_PIVOT_LANGUAGE', 'zh-Hans')   # 语言代码，见 YoutubeDLPService.SUMMARY_LANGUAGES；已缓存的摘要按此语言存储
+
+# 预热 worker：低峰时段为关注的频道/播放列表的新视频预先生成视频信息和摘要
+WARMUP_WORKER_EMBEDDED = os.getenv('WARMUP_WORKER_EMBEDDED', 'false').lower() == 'true'  # 是否随 API 进程启动
+WARMUP_SOURCES_FILE = os.getenv('WARMUP_SOURCES_FILE')                                   # 来源列表 JSON 文件
+WARMUP_POLL_INTERVAL = float(os.getenv('WARMUP_POLL_INTERVAL', '1800'))                  # 扫描间隔（秒）
+WARMUP_SCAN_DEPTH = int(os.getenv('WARMUP_SCAN_DEPTH', '20'))                            # 每个来源检查最新的多少个条目
+WARMUP_WINDOW = os.getenv('WARMUP_WINDOW', '01:00-07:00')                                # 工作时段（本地时间 HH:MM-HH:MM，可跨零点），留空表示不限
+WARMUP_DAILY_BUDGET = int(os.getenv('WARMUP_DAILY_BUDGET', '200'))                       # 每天最多预热的视频数（所有 worker 共享）
+WARMUP_FAILURE_BACKOFF = float(os.getenv('WARMUP_FAILURE_BACKOFF', str(6 * 3600)))        # 预热失败的视频首次重试前的等待时间（秒），之后每次失败翻倍
+WARMUP_FAILURE_BACKOFF_MAX = float(os.getenv('WARMUP_FAILURE_BACKOFF_MAX', str(7 * 24 * 3600)))  # 失败重试等待时间上限（秒）
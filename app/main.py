@@ -4,9 +4,47 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from app.api.endpoints import yt_dlp
+import asyncio
+from contextlib import asynccontextmanager
+from app.config import settings
+from app.api.endpoints import yt_dlp, admin
+from app.config.redis_config import RedisClient
+from app.workers.transcript_worker import TranscriptWorker
+from app.workers.warmup_worker import WarmupWorker
+from app.utils.yt_dlp_utils import video_info_pool
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yt_dlp.yt_service.start_cache_invalidation_listener()
+    # 可选：在 API 进程内运行转写 worker
+    transcript_worker = None
+    if settings.TRANSCRIPT_WORKER_EMBEDDED:
+        transcript_worker = TranscriptWorker(yt_dlp.yt_service)
+        worker_task = asyncio.create_task(transcript_worker.run())
+    # 可选：在 API 进程内运行预热 worker
+    warmup_worker = None
+    if settings.WARMUP_WORKER_EMBEDDED:
+        warmup_worker = WarmupWorker(yt_dlp.yt_service)
+        warmup_task = asyncio.create_task(warmup_worker.run())
+    yield
+    if warmup_worker is not None:
+        await warmup_worker.stop()
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    if transcript_worker is not None:
+        await transcript_worker.stop()
+        await worker_task
+    await yt_dlp.yt_service.stop_cache_invalidation_listener()
+    await yt_dlp.yt_service.cancel_background_tasks()
+    # 关闭提取线程池，等待进行中的提取结束后再关闭池中的 YoutubeDL 实例，避免关闭仍在使用的实例
+    await asyncio.to_thread(yt_dlp.yt_service.extraction_executor.shutdown, True)
+    video_info_pool.close_all()
+    await yt_dlp.yt_service.http_client.aclose()
+    await RedisClient.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # 配置CORS
 app.add_middleware(
@@ -23,6 +61,11 @@ app.include_router(
     prefix=f"/api/v1/youtube",
     tags=["youtube"]
 )
+app.include_router(
+    admin.router,
+    prefix=f"/api/v1/admin",
+    tags=["admin"]
+)
 
 
 @app.get("/")
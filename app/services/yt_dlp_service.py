@@ -1,15 +1,31 @@
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import json
 import sys
-import redis
-import requests
+import asyncio
+import redis.asyncio as redis
+import httpx
 import logging
+import math
 import time
+import uuid
 from enum import Enum
 from fastapi import HTTPException
-from app.utils.yt_dlp_utils import get_video_info_utils, get_cookies_path
+from app.utils.yt_dlp_utils import (
+    get_video_info_utils, list_playlist_entries_utils, get_cookies_path, extract_video_id, canonical_video_url,
+    is_neutral_extraction_error, VideoInfoError
+)
+from app.utils.extraction_executor import ExtractionExecutor
+from app.utils.extraction_guard import ExtractionGuard
+from app.utils.single_flight import SingleFlight
+from app.utils.local_cache import LocalCache
+from app.utils.task_queue import RedisTaskQueue
+from app.utils.http_client import HttpClient, http_client as shared_http_client, cookie_jar_cache
+from app.utils.compressed_store import CompressedRedisStore
+from app.utils.subtitle_store import SubtitleStore, subtitle_source
+from app.config import settings
 from app.models.youtube import YoutubeVideoInfo
-from app.agents.openai_summarizer import summarize_youtube_video
+from app.agents.openai_summarizer import summarize_youtube_video, translate_summary, parse_vtt
+from app.agents.summary_engine import EventCallback, emit_event
 
 class SubtitleError(Exception):
     """字幕处理相关的异常"""
@@ -22,13 +38,46 @@ class VideoProcessingError(Exception):
 class YoutubeDLPService:
     # Redis key constants
     REDIS_VIDEO_INFO_KEY = 'video_info'
+    REDIS_VIDEO_INFO_FETCHED_AT_KEY = 'video_info_fetched_at'
     REDIS_VIDEO_SUMMARY_KEY = 'video_summary'
     REDIS_TRANSCRIPT_TASK_KEY = 'video_transcript_task'
+    REDIS_TRANSCRIPT_QUEUE = 'video_transcript_queue'
+    REDIS_SUMMARY_LOCK_PREFIX = 'video_summary_lock'
+    REDIS_CACHE_INVALIDATION_CHANNEL = 'cache_invalidation'
+    REDIS_SUBTITLE_STORE_PREFIX = 'video_subtitle'
+    REDIS_EXTRACTION_GUARD_KEY = 'extraction_guard'
+
+    # 可请求的摘要语言：语言代码 -> 提示中使用的语言名称
+    SUMMARY_LANGUAGES = {
+        'zh-Hans': 'Simplified Chinese',
+        'zh-Hant': 'Traditional Chinese',
+        'en': 'English',
+        'ja': 'Japanese',
+        'ko': 'Korean',
+        'es': 'Spanish',
+        'fr': 'French',
+        'de': 'German',
+        'pt': 'Portuguese',
+        'ru': 'Russian',
+        'vi': 'Vietnamese',
+    }
 
-    # Language patterns for subtitle extraction
-    LANGUAGE_PATTERNS = {
-        'en': ['en', 'en-zh-Hans'],
-        'cn': ['cn', 'zh-Hans-zh-Hans', 'zh-Hans']
+    # video_info 字段分组，各组有独立的新鲜度 TTL
+    FIELD_GROUPS = {
+        'static': ['id', 'title', 'fulltitle', 'description', 'thumbnail', 'thumbnails', 'duration',
+                   'categories', 'tags', 'chapters', 'channel', 'channel_id', 'uploader', 'upload_date'],
+        'stats': ['view_count', 'like_count', 'comment_count', 'channel_follower_count', 'heatmap'],
+        'subtitles': ['cn_subtitle_url', 'en_subtitle_url'],
+    }
+    # /videoinfo 的响应字段预设，None 表示全部字段
+    VIDEO_INFO_PROFILES = {
+        'full': None,
+        'list': ['id', 'title', 'thumbnail', 'duration', 'duration_string', 'channel', 'view_count', 'upload_date'],
+    }
+    FIELD_GROUP_TTLS = {
+        'static': settings.VIDEO_INFO_STATIC_TTL,
+        'stats': settings.VIDEO_INFO_STATS_TTL,
+        'subtitles': settings.VIDEO_INFO_SUBTITLE_TTL,
     }
 
     class TranscriptStatus(str, Enum):
@@ -44,12 +93,82 @@ class YoutubeDLPService:
         redis_client: redis.Redis,
         logger: Optional[logging.Logger] = None,
         download_max_retries: int = 2,
-        download_timeout: int = 60
+        download_timeout: int = 60,
+        extraction_executor: Optional[ExtractionExecutor] = None,
+        http_client: Optional[HttpClient] = None
     ):
         self.redis_client = redis_client
         self.logger = logger or logging.getLogger(__name__)
         self.download_max_retries = download_max_retries
         self.download_timeout = download_timeout
+        self.http_client = http_client or shared_http_client
+        self.extraction_executor = extraction_executor or ExtractionExecutor(
+            max_workers=settings.EXTRACTION_MAX_WORKERS,
+            max_queue=settings.EXTRACTION_MAX_QUEUE,
+            timeout=settings.EXTRACTION_TIMEOUT
+        )
+        # 所有 worker 共享的提取速率上限与熔断器
+        self.extraction_guard = ExtractionGuard(
+            redis_client,
+            self.REDIS_EXTRACTION_GUARD_KEY,
+            max_qps=settings.EXTRACTION_QPS_MAX,
+            min_qps=settings.EXTRACTION_QPS_MIN,
+            window_seconds=settings.EXTRACTION_AIMD_WINDOW,
+            aimd_failure_threshold=settings.EXTRACTION_AIMD_FAILURE_THRESHOLD,
+            decrease_factor=settings.EXTRACTION_AIMD_DECREASE,
+            increase_step=settings.EXTRACTION_AIMD_INCREASE,
+            min_failures=settings.EXTRACTION_BREAKER_MIN_FAILURES,
+            failure_threshold=settings.EXTRACTION_BREAKER_FAILURE_THRESHOLD,
+            open_seconds=settings.EXTRACTION_BREAKER_OPEN_SECONDS,
+            probe_timeout=settings.EXTRACTION_BREAKER_PROBE_TIMEOUT,
+            probe_successes=settings.EXTRACTION_BREAKER_PROBE_SUCCESSES,
+            max_wait=settings.EXTRACTION_RATE_MAX_WAIT,
+            is_neutral=is_neutral_extraction_error
+        )
+        self.summary_flight = SingleFlight(
+            redis_client,
+            lock_prefix=self.REDIS_SUMMARY_LOCK_PREFIX,
+            lease_seconds=settings.SUMMARY_LOCK_LEASE,
+            poll_interval=settings.SUMMARY_LOCK_POLL_INTERVAL,
+            wait_timeout=settings.SUMMARY_WAIT_TIMEOUT,
+            result_ttl=settings.SUMMARY_RESULT_TTL,
+            logger=self.logger
+        )
+
+        self.transcript_queue = RedisTaskQueue(
+            redis_client,
+            self.REDIS_TRANSCRIPT_QUEUE,
+            max_attempts=settings.TRANSCRIPT_MAX_ATTEMPTS,
+            on_dead=lambda video_id, error: self.update_transcript_task_state(
+                video_id, self.TranscriptStatus.ERROR, error
+            )
+        )
+
+        self.subtitle_store = SubtitleStore(CompressedRedisStore(
+            redis_client,
+            prefix=self.REDIS_SUBTITLE_STORE_PREFIX,
+            ttl=settings.SUBTITLE_STORE_TTL,
+            max_entry_bytes=settings.SUBTITLE_STORE_MAX_ENTRY_BYTES,
+            max_total_bytes=settings.SUBTITLE_STORE_MAX_TOTAL_BYTES
+        ))
+
+        # 进程内一级缓存，key 与对应 Redis hash 同名
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_task: Optional[asyncio.Task] = None
+        # 播放列表展开的后台任务，以及已安排处理、尚未完成的 video_id
+        self._background_tasks = set()
+        self._expanding = set()
+        self.summary_cache = LocalCache(
+            self.REDIS_VIDEO_SUMMARY_KEY,
+            max_bytes=settings.LOCAL_CACHE_SUMMARY_MAX_BYTES,
+            ttl=settings.LOCAL_CACHE_TTL
+        )
+        self.video_info_cache = LocalCache(
+            self.REDIS_VIDEO_INFO_KEY,
+            max_bytes=settings.LOCAL_CACHE_VIDEO_INFO_MAX_BYTES,
+            ttl=settings.LOCAL_CACHE_TTL
+        )
+        self.local_caches = {cache.name: cache for cache in (self.summary_cache, self.video_info_cache)}
 
         # Configure logging if no logger provided
         if logger is None:
@@ -87,94 +206,526 @@ class YoutubeDLPService:
             'update_time': time.time()
         }
 
-    def _update_transcript_task_state(self, video_id: str, status: str, msg: str):
+    async def update_transcript_task_state(self, video_id: str, status: str, msg: str):
         task_data = self._handle_transcript_error(video_id, status, msg)
-        self.redis_client.hset(self.REDIS_TRANSCRIPT_TASK_KEY, video_id, json.dumps(task_data))
+        await self.redis_client.hset(self.REDIS_TRANSCRIPT_TASK_KEY, video_id, json.dumps(task_data))
+
+    def start_cache_invalidation_listener(self) -> None:
+        """订阅失效通知，使多个 worker 的一级缓存保持一致。"""
+        self._invalidation_task = asyncio.create_task(self._listen_cache_invalidation())
+
+    async def stop_cache_invalidation_listener(self) -> None:
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            await asyncio.gather(self._invalidation_task, return_exceptions=True)
+            self._invalidation_task = None
+
+    async def _listen_cache_invalidation(self) -> None:
+        while True:
+            try:
+                async with self.redis_client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.REDIS_CACHE_INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        self._on_cache_invalidation(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 订阅断开期间可能错过失效通知，清空一级缓存后重新订阅
+                self.logger.warning(f"Cache invalidation listener error, resubscribing: {e}")
+                for cache in self.local_caches.values():
+                    cache.clear()
+                await asyncio.sleep(1)
 
-    async def get_video_info(self, video_url: str) -> Dict[str, Any]:
+    def _on_cache_invalidation(self, message: Dict[str, Any]) -> None:
         try:
-            # 获取视频信息
-            info = get_video_info_utils(video_url)
+            data = json.loads(message['data'])
+        except (TypeError, ValueError):
+            return
+        # 忽略自己发出的通知，本地缓存在写入时已更新
+        if data.get('origin') == self._instance_id:
+            return
+        cache = self.local_caches.get(data.get('cache'))
+        if cache is not None:
+            cache.invalidate(data.get('key'))
+
+    async def _publish_invalidation(self, cache_name: str, key: str) -> None:
+        message = json.dumps({'origin': self._instance_id, 'cache': cache_name, 'key': key})
+        await self.redis_client.publish(self.REDIS_CACHE_INVALIDATION_CHANNEL, message)
+
+    def spawn_background(self, coro: Awaitable[Any]) -> asyncio.Task:
+        """启动不随请求结束而取消的后台任务，进程退出时由 cancel_background_tasks 统一取消。"""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def cancel_background_tasks(self) -> None:
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    async def run_extraction(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """在提取线程池中执行一次 yt-dlp 操作，受全局限流和熔断保护。
+
+        失败时最多共尝试 IDENTITY_MAX_ATTEMPTS 次，每次换一个身份，并重新向限流器申请令牌，
+        不在提取线程内等待；视频本身不可用等中性错误不重试。func 需接受 exclude 参数（见 run_with_identity）。
+        """
+        tried: List[str] = []
+        for attempt in range(1, settings.IDENTITY_MAX_ATTEMPTS + 1):
+            try:
+                return await self.extraction_guard.run(
+                    lambda: self.extraction_executor.run(func, *args, exclude=tried, timeout=timeout)
+                )
+            except VideoInfoError as e:
+                if attempt >= settings.IDENTITY_MAX_ATTEMPTS or is_neutral_extraction_error(e):
+                    raise
+                self.logger.warning(f"Extraction attempt {attempt} failed, retrying with another identity: {e}")
+
+    async def get_playlist_entries(self, playlist_url: str, page: int = 1, page_size: int = 20, schedule: bool = True) -> Dict[str, Any]:
+        """扁平提取播放列表/频道的一页条目，并在后台为尚未缓存的视频获取信息和摘要。
+
+        Args:
+            playlist_url: 播放列表或频道链接
+            page: 页码，从1开始
+            page_size: 每页条目数
+            schedule: 是否为未缓存的视频安排后台处理
+
+        Returns:
+            Dict[str, Any]: 列表信息、本页条目（带 cached 标记）及本次安排处理的 video_id
+        """
+        start = (page - 1) * page_size + 1
+        playlist = await self.run_extraction(list_playlist_entries_utils, playlist_url, start, page_size)
+
+        entries = playlist['entries']
+        pipe = self.redis_client.pipeline()
+        for entry in entries:
+            pipe.hexists(self.REDIS_VIDEO_INFO_KEY, entry['id'])
+        exists = await pipe.execute() if entries else []
+        for entry, cached in zip(entries, exists):
+            entry['cached'] = bool(cached)
+
+        scheduled = []
+        if schedule:
+            scheduled = [
+                entry['id'] for entry in entries
+                if not entry['cached'] and entry['id'] not in self._expanding
+            ]
+            scheduled = list(dict.fromkeys(scheduled))
+            if scheduled:
+                self._expanding.update(scheduled)
+                self.spawn_background(self._expand_videos(scheduled))
+
+        return {**playlist, 'page': page, 'page_size': page_size, 'scheduled': scheduled}
+
+    async def _expand_videos(self, video_ids: List[str]) -> None:
+        """后台获取视频信息，成功后生成摘要；复用批量接口的并发限制。"""
+        try:
+            infos = await self.get_video_info_batch(video_ids, groups=())
+            ready = [video_id for video_id in video_ids if not isinstance(infos[video_id], Exception)]
+            for video_id in video_ids:
+                if video_id not in ready:
+                    self.logger.warning(f"Playlist expansion failed to fetch {video_id}: {infos[video_id]}")
+            summaries = await self.get_video_summary_batch(ready)
+            for video_id, result in summaries.items():
+                if isinstance(result, Exception):
+                    self.logger.warning(f"Playlist expansion failed to summarize {video_id}: {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Playlist expansion error: {str(e)}", exc_info=True)
+        finally:
+            self._expanding.difference_update(video_ids)
+
+    def freshness_groups(self, fields: Optional[List[str]]) -> Tuple[str, ...]:
+        """响应字段所在的、需要保持新鲜的字段组；未指定字段时返回全部会过期的字段组（静态字段组始终参与判断）。"""
+        if fields is None:
+            return ('stats', 'subtitles')
+        return tuple(
+            group for group in ('stats', 'subtitles')
+            if set(fields) & set(self.FIELD_GROUPS[group])
+        )
+
+    def _is_fresh(self, fetched_at: float, groups: Tuple[str, ...]) -> bool:
+        """判断缓存是否对所需字段组仍然新鲜；静态字段组始终参与判断。"""
+        age = time.time() - fetched_at
+        return all(age < self.FIELD_GROUP_TTLS[group] for group in ('static',) + tuple(groups))
+
+    async def _get_cached_video_info(self, video_id: str, groups: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        return (await self._get_cached_video_infos([video_id], groups)).get(video_id)
+
+    async def _get_cached_video_infos(self, video_ids: List[str], groups: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+        """批量读取缓存中仍然新鲜的视频信息，一级缓存未命中的部分用一次 pipeline（HMGET）读取。"""
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        remote_ids = []
+        for video_id in video_ids:
+            local = self.video_info_cache.get(video_id)
+            if local is not None:
+                found[video_id] = local
+            else:
+                remote_ids.append(video_id)
+
+        if remote_ids:
+            pipe = self.redis_client.pipeline()
+            pipe.hmget(self.REDIS_VIDEO_INFO_KEY, remote_ids)
+            pipe.hmget(self.REDIS_VIDEO_INFO_FETCHED_AT_KEY, remote_ids)
+            infos_json, fetched_ats = await pipe.execute()
+            for video_id, info_json, fetched_at in zip(remote_ids, infos_json, fetched_ats):
+                if not info_json or not fetched_at:
+                    continue
+                entry = (json.loads(info_json), float(fetched_at))
+                self.video_info_cache.set(video_id, entry, len(info_json))
+                found[video_id] = entry
+
+        return {
+            video_id: info
+            for video_id, (info, fetched_at) in found.items()
+            if self._is_fresh(fetched_at, groups)
+        }
+
+    async def get_video_info(
+        self,
+        video_url: str,
+        force_refresh: bool = False,
+        groups: Tuple[str, ...] = ('stats',)
+    ) -> Dict[str, Any]:
+        """读穿缓存获取视频信息。
+
+        Args:
+            video_url: 视频链接（支持 youtu.be、shorts、watch?v= 等形式）或 video_id
+            force_refresh: 为 True 时跳过缓存，强制重新提取
+            groups: 调用方需要保持新鲜的字段组，见 FIELD_GROUPS
+        """
+        try:
+            video_id = extract_video_id(video_url)
+            if video_id:
+                if not force_refresh:
+                    cached = await self._get_cached_video_info(video_id, groups)
+                    if cached is not None:
+                        self.logger.info(f"Video info cache hit: {video_id}")
+                        return cached
+                # 使用标准链接提取，去掉无关查询参数
+                video_url = canonical_video_url(video_id)
+
+            # 在独立线程池中获取视频信息，避免阻塞事件循环；受全局限流和熔断保护。
+            # 返回的信息已在提取线程内投影为模型所需字段，字幕列表已替换为选中的字幕链接
+            info = await self.run_extraction(get_video_info_utils, video_url)
             if not info:
                 raise VideoProcessingError("Failed to fetch video information")
 
-            # 获取字幕URL
-            en_sub_url, cn_sub_url = self._extract_subtitle_url_for_languages(info)
-            info['cn_subtitle_url'] = cn_sub_url
-            info['en_subtitle_url'] = en_sub_url
-            
             # 创建视频信息模型
             video_info = YoutubeVideoInfo.model_validate(info)
             result = video_info.model_dump()
 
             # Save to Redis
             video_id = video_info.id
-            self.redis_client.hset(self.REDIS_VIDEO_INFO_KEY, video_id, json.dumps(result))
+            result_json = json.dumps(result)
+            fetched_at = time.time()
+            pipe = self.redis_client.pipeline()
+            pipe.hset(self.REDIS_VIDEO_INFO_KEY, video_id, result_json)
+            pipe.hset(self.REDIS_VIDEO_INFO_FETCHED_AT_KEY, video_id, fetched_at)
+            await pipe.execute()
+            self.video_info_cache.set(video_id, (result, fetched_at), len(result_json))
+            await self._publish_invalidation(self.REDIS_VIDEO_INFO_KEY, video_id)
 
             return result
         except Exception as e:
             self.logger.error(f"Error when get_video_info: {str(e)}", exc_info=True)
             raise e
 
-    async def get_video_summary(self, video_id: str) -> Dict[str, Any]:
+    async def get_video_info_batch(
+        self,
+        video_urls: List[str],
+        force_refresh: bool = False,
+        groups: Tuple[str, ...] = ('stats',)
+    ) -> Dict[str, Any]:
+        """批量获取视频信息：缓存命中的部分一次读取，未命中的部分限制并发提取。
+
+        Args:
+            video_urls: 视频链接或 video_id 列表
+            force_refresh: 为 True 时跳过缓存，强制重新提取
+            groups: 调用方需要保持新鲜的字段组，见 FIELD_GROUPS
+
+        Returns:
+            Dict[str, Any]: {video_url: 视频信息或失败时的异常}
+        """
+        results: Dict[str, Any] = {}
+        ids = {url: extract_video_id(url) for url in dict.fromkeys(video_urls)}
+        if not force_refresh:
+            cached = await self._get_cached_video_infos([i for i in set(ids.values()) if i], groups)
+            results.update({url: cached[video_id] for url, video_id in ids.items() if video_id in cached})
+
+        # 同一视频的不同链接形式（youtu.be、带时间参数等）只提取一次，结果分发给每个链接
+        pending: Dict[str, List[str]] = {}
+        for url, video_id in ids.items():
+            if url not in results:
+                pending.setdefault(video_id or url, []).append(url)
+
+        semaphore = asyncio.Semaphore(settings.BATCH_VIDEO_INFO_CONCURRENCY)
+
+        async def fetch(urls: List[str]) -> None:
+            async with semaphore:
+                try:
+                    # 缓存已检查过，直接提取
+                    result = await self.get_video_info(urls[0], force_refresh=True, groups=groups)
+                except Exception as e:
+                    result = e
+            for url in urls:
+                results[url] = result
+
+        await asyncio.gather(*(fetch(urls) for urls in pending.values()))
+        return results
+
+    async def get_summarized_ids(self, video_ids: List[str]) -> set:
+        """已缓存枢纽语言摘要的 video_id。"""
+        return set(await self._get_cached_summaries(video_ids))
+
+    async def _get_cached_summary(self, video_id: str) -> Optional[Any]:
+        return (await self._get_cached_summaries([video_id])).get(video_id)
+
+    async def _get_cached_summaries(self, video_ids: List[str]) -> Dict[str, Any]:
+        """批量读取已缓存的摘要，一级缓存未命中的部分用一次 HMGET 读取。"""
+        found: Dict[str, Any] = {}
+        remote_ids = []
+        for video_id in video_ids:
+            local = self.summary_cache.get(video_id)
+            if local is not None:
+                found[video_id] = local
+            else:
+                remote_ids.append(video_id)
+
+        if remote_ids:
+            summaries = await self.redis_client.hmget(self.REDIS_VIDEO_SUMMARY_KEY, remote_ids)
+            for video_id, video_summary in zip(remote_ids, summaries):
+                if video_summary and len(video_summary) > 0:
+                    result = json.loads(video_summary)
+                    self.summary_cache.set(video_id, result, len(video_summary))
+                    found[video_id] = result
+        return found
+
+    async def get_video_summary(
+        self,
+        video_id: str,
+        on_event: Optional[EventCallback] = None,
+        languages: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """获取视频摘要，缓存未命中时生成。
+
+        Args:
+            video_id: 视频ID
+            on_event: 进度事件回调（info / subtitle / cues / chunks / chunk / outline / summary_delta / retry / waiting /
+                translate）；缓存命中时不发送任何事件
+            languages: 需要的摘要语言代码（见 SUMMARY_LANGUAGES），默认只返回枢纽语言
+
+        Returns:
+            按 languages 顺序排列的摘要列表；没有字幕时返回转写任务状态
+        """
         try:
             # Check Redis cache first
-            video_summary = self.redis_client.hget(self.REDIS_VIDEO_SUMMARY_KEY, video_id)
-            if video_summary and len(video_summary) > 0:
-                return json.loads(video_summary)
-
-            # Get video info from Redis
-            video_info_json = self.redis_client.hget(self.REDIS_VIDEO_INFO_KEY, video_id)
-            if not video_info_json:
-                raise VideoProcessingError(f"Video info not found in Redis for video_id: {video_id}")
-            
-            info = json.loads(video_info_json)
-            video_info = YoutubeVideoInfo(**info)
-
-            # Handle subtitle content
-            subtitle_url = video_info.cn_subtitle_url or video_info.en_subtitle_url
-            if not subtitle_url:
-                return self._handle_missing_subtitle(video_id)
-
-            caption_text = self._download_text(subtitle_url)
-            if not caption_text:
-                self.logger.error('Failed to download subtitle content')
-                raise SubtitleError("Failed to download subtitle content")
-
-            # Generate summary
-            summary_result_cn = await summarize_youtube_video(
-                video_title=video_info.title,
-                video_description=video_info.description,
-                video_tags=video_info.tags,
-                video_captions=caption_text,
-                output_language='Simplified Chinese'
-            )
-            result = [summary_result_cn]
-            
-            # Cache in Redis
-            self.redis_client.hset(self.REDIS_VIDEO_SUMMARY_KEY, video_id, json.dumps(result))
-
-            return result
+            pivot = await self._get_cached_summary(video_id)
+            if pivot is None:
+                # 同一视频的并发请求只生成一次摘要，其余请求等待结果
+                pivot = await self.summary_flight.do(
+                    video_id,
+                    lambda: self._generate_video_summary(video_id, on_event),
+                    lambda: self._get_cached_summary(video_id),
+                    on_wait=(lambda: emit_event(on_event, 'waiting', {'video_id': video_id})) if on_event else None
+                )
+            return await self._localize_summary(video_id, pivot, languages, on_event)
 
         except Exception as e:
             self.logger.error(f"Error processing video: {str(e)}", exc_info=True)
             raise e
 
-    def _handle_missing_subtitle(self, video_id: str) -> Dict[str, Any]:
+    async def get_video_summary_batch(self, video_ids: List[str], languages: Optional[List[str]] = None) -> Dict[str, Any]:
+        """批量获取视频摘要：缓存命中的部分一次读取，未命中的部分限制并发生成。
+
+        Returns:
+            Dict[str, Any]: {video_id: 摘要结果或失败时的异常}
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        results: Dict[str, Any] = await self._get_cached_summaries(video_ids)
+        semaphore = asyncio.Semaphore(settings.BATCH_SUMMARY_CONCURRENCY)
+
+        async def generate(video_id: str) -> None:
+            async with semaphore:
+                try:
+                    results[video_id] = await self.get_video_summary(video_id, languages=languages)
+                except Exception as e:
+                    results[video_id] = e
+
+        async def localize(video_id: str) -> None:
+            try:
+                results[video_id] = await self._localize_summary(video_id, results[video_id], languages)
+            except Exception as e:
+                results[video_id] = e
+
+        # 已缓存枢纽语言摘要的视频只需翻译，翻译调用由摘要引擎的全局并发上限约束
+        tasks = [generate(video_id) for video_id in video_ids if video_id not in results]
+        tasks += [localize(video_id) for video_id in video_ids if video_id in results]
+        await asyncio.gather(*tasks)
+        return results
+
+    @staticmethod
+    def _summary_field(video_id: str, language: str) -> str:
+        """摘要在 Redis hash 中的字段名：枢纽语言沿用 video_id，其他语言为 "video_id:语言代码"。"""
+        return video_id if language == settings.SUMMARY_PIVOT_LANGUAGE else f"{video_id}:{language}"
+
+    async def _localize_summary(
+        self,
+        video_id: str,
+        pivot: Any,
+        languages: Optional[List[str]],
+        on_event: Optional[EventCallback] = None
+    ) -> Any:
+        """由枢纽语言摘要得到请求的各语言摘要：已缓存的直接读取，其余并行翻译并分别缓存。"""
+        languages = list(dict.fromkeys(languages or [settings.SUMMARY_PIVOT_LANGUAGE]))
+        # 转写任务状态等非摘要结果原样返回
+        if not isinstance(pivot, list) or not pivot or languages == [settings.SUMMARY_PIVOT_LANGUAGE]:
+            return pivot
+
+        fields = {
+            language: self._summary_field(video_id, language)
+            for language in languages if language != settings.SUMMARY_PIVOT_LANGUAGE
+        }
+        summaries = await self._get_cached_summaries(list(fields.values()))
+        missing = [language for language, field in fields.items() if field not in summaries]
+        if missing:
+            await emit_event(on_event, 'translate', {'languages': missing})
+
+        async def translate(language: str) -> None:
+            field = fields[language]
+            summaries[field] = await self.summary_flight.do(
+                field,
+                lambda: self._translate_summary(field, pivot[0], language),
+                lambda: self._get_cached_summary(field)
+            )
+
+        await asyncio.gather(*(translate(language) for language in missing))
+        return [
+            pivot[0] if language == settings.SUMMARY_PIVOT_LANGUAGE else summaries[fields[language]]
+            for language in languages
+        ]
+
+    async def _translate_summary(self, field: str, pivot_summary: Dict[str, Any], language: str) -> Dict[str, Any]:
+        # 拿到锁后再检查一次缓存，其他进程可能刚刚完成
+        cached = await self._get_cached_summary(field)
+        if cached is not None:
+            return cached
+        summary = await translate_summary(pivot_summary, self.SUMMARY_LANGUAGES[language])
+        await self._store_summary(field, summary)
+        return summary
+
+    async def _store_summary(self, field: str, result: Any) -> None:
+        result_json = json.dumps(result)
+        await self.redis_client.hset(self.REDIS_VIDEO_SUMMARY_KEY, field, result_json)
+        self.summary_cache.set(field, result, len(result_json))
+        await self._publish_invalidation(self.REDIS_VIDEO_SUMMARY_KEY, field)
+
+    async def _generate_video_summary(self, video_id: str, on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+        # 拿到锁后再检查一次缓存，其他进程可能刚刚完成
+        cached = await self._get_cached_summary(video_id)
+        if cached is not None:
+            return cached
+
+        # Get video info from Redis；此处不要求字幕 URL 新鲜，已缓存的字幕内容无需重新下载
+        info = await self._get_cached_video_info(video_id, ())
+        if info is None:
+            if not await self.redis_client.hexists(self.REDIS_VIDEO_INFO_KEY, video_id):
+                raise VideoProcessingError(f"Video info not found in Redis for video_id: {video_id}")
+            info = await self.get_video_info(video_id, force_refresh=True)
+        video_info = YoutubeVideoInfo(**info)
+        await emit_event(on_event, 'info', {'video_id': video_id, 'title': video_info.title, 'duration': video_info.duration})
+
+        # Handle subtitle content
+        subtitle_url = video_info.cn_subtitle_url or video_info.en_subtitle_url
+        if not subtitle_url:
+            return await self._handle_missing_subtitle(video_id, video_info)
+
+        caption_text, cues = await self._load_subtitle(video_id, subtitle_url, on_event)
+        await emit_event(on_event, 'cues', {'count': len(cues)})
+        return await self._summarize_captions(video_id, video_info, caption_text, cues, on_event)
+
+    async def _load_subtitle(
+        self,
+        video_id: str,
+        subtitle_url: str,
+        on_event: Optional[EventCallback] = None
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """读取字幕原文及解析结果，优先使用字幕缓存，未命中时下载并写入缓存。"""
+        lang, origin = subtitle_source(subtitle_url)
+        stored = await self.subtitle_store.get(video_id, lang, origin)
+        if stored is not None:
+            self.logger.info(f"Subtitle cache hit: {video_id} {lang} {origin}")
+            await emit_event(on_event, 'subtitle', {'lang': lang, 'origin': origin, 'cached': True})
+            return stored['vtt'], stored['cues']
+
+        # 带签名的字幕 URL 会过期，过期时先刷新视频信息
+        if await self._get_cached_video_info(video_id, ('subtitles',)) is None:
+            info = await self.get_video_info(video_id, force_refresh=True)
+            subtitle_url = info.get('cn_subtitle_url') or info.get('en_subtitle_url') or subtitle_url
+            lang, origin = subtitle_source(subtitle_url)
+
+        caption_text = await self._download_text(subtitle_url)
+        if not caption_text:
+            self.logger.error('Failed to download subtitle content')
+            raise SubtitleError("Failed to download subtitle content")
+
+        await emit_event(on_event, 'subtitle', {'lang': lang, 'origin': origin, 'cached': False})
+
+        cues = parse_vtt(caption_text)
+        await self.subtitle_store.put(video_id, lang, origin, caption_text, cues)
+        return caption_text, cues
+
+    async def generate_summary_from_transcript(self, video_id: str, caption_text: str) -> List[Dict[str, Any]]:
+        """用转写得到的字幕生成并缓存摘要，供转写 worker 调用。"""
+        async def generate():
+            info = await self.get_video_info(video_id, groups=())
+            return await self._summarize_captions(video_id, YoutubeVideoInfo(**info), caption_text)
+
+        return await self.summary_flight.do(video_id, generate, lambda: self._get_cached_summary(video_id))
+
+    async def _summarize_captions(
+        self,
+        video_id: str,
+        video_info: YoutubeVideoInfo,
+        caption_text: str,
+        cues: Optional[List[Dict[str, str]]] = None,
+        on_event: Optional[EventCallback] = None
+    ) -> List[Dict[str, Any]]:
+        # 只用枢纽语言分析字幕，其他语言由它翻译
+        summary = await summarize_youtube_video(
+            video_title=video_info.title,
+            video_description=video_info.description,
+            video_tags=video_info.tags,
+            video_captions=caption_text,
+            output_language=self.SUMMARY_LANGUAGES[settings.SUMMARY_PIVOT_LANGUAGE],
+            parsed_captions=cues,
+            on_event=on_event
+        )
+        result = [summary]
+
+        # Cache in Redis
+        await self._store_summary(video_id, result)
+
+        return result
+
+    async def _handle_missing_subtitle(self, video_id: str, video_info: YoutubeVideoInfo) -> Dict[str, Any]:
         # Check existing transcript task
-        transcript_task = self.redis_client.hget(self.REDIS_TRANSCRIPT_TASK_KEY, video_id)
+        transcript_task = await self.redis_client.hget(self.REDIS_TRANSCRIPT_TASK_KEY, video_id)
         if transcript_task:
             task_dict = json.loads(transcript_task)
             status = task_dict['status']
             
             if status == self.TranscriptStatus.CREATED:
+                # 入队是幂等的，保证早于队列创建的任务也能被处理
+                await self._enqueue_transcript_task(video_id, video_info)
                 return {'code': '101', "msg": "transcript task created"}
             elif status == self.TranscriptStatus.PROCESSING:
                 return {'code': '102', "msg": "transcript task processing"}
             elif status == self.TranscriptStatus.SUCCESS:
                 caption_text = task_dict['msg']
                 task_dict['code'] = self.TranscriptStatus.READ
-                self.redis_client.hset(self.REDIS_TRANSCRIPT_TASK_KEY, video_id, json.dumps(task_dict))
+                await self.redis_client.hset(self.REDIS_TRANSCRIPT_TASK_KEY, video_id, json.dumps(task_dict))
                 return {'code': '103', "msg": caption_text}
             elif status == self.TranscriptStatus.ERROR:
                 return {'code': '110', "msg": f"transcript task failed, {task_dict['msg']}"}
@@ -182,94 +733,40 @@ class YoutubeDLPService:
                 return {'code': '199', "msg": f"transcript task status unknown, {status}"}
 
         # Create new transcript task
-        self._update_transcript_task_state(
+        await self.update_transcript_task_state(
             video_id, 
             self.TranscriptStatus.CREATED, 
             "transcript task created"
         )
+        await self._enqueue_transcript_task(video_id, video_info)
         return {'code': '101', "msg": "transcript task created"}
 
-    def _download_text(self, url: str) -> Optional[str]:
+    async def _enqueue_transcript_task(self, video_id: str, video_info: YoutubeVideoInfo) -> None:
+        # 播放量越高越优先转写，取对数避免热门视频之间的差距过大
+        priority = math.log10(max(video_info.view_count, 0) + 1)
+        await self.transcript_queue.enqueue(video_id, {'video_id': video_id}, priority=priority)
+
+    async def _download_text(self, url: str) -> Optional[str]:
         cookies_path = get_cookies_path()
-        cookies = None
-        if cookies_path:
-            try:
-                import http.cookiejar
-                cookie_jar = http.cookiejar.MozillaCookieJar(cookies_path)
-                cookie_jar.load(ignore_discard=True, ignore_expires=True)
-                cookies = cookie_jar
-            except Exception as e:
-                self.logger.warning(f"Failed to load cookies from {cookies_path}: {e}")
+        cookie_jar = cookie_jar_cache.get(cookies_path) if cookies_path else None
 
-        for attempt in range(self.download_max_retries + 1):
-            try:
-                self.logger.info(f"Attempting to download text from URL: {url}")
-                response = requests.get(
-                    url,
-                    headers=self.default_headers,
-                    cookies=cookies,
-                    timeout=self.download_timeout,
-                    allow_redirects=True
-                )
-                response.raise_for_status()
-                
-                if not response.text:
-                    raise SubtitleError("Failed to download text content.")
-                    
-                self.logger.info("Successfully downloaded text content")
-                return response.text
-                
-            except requests.RequestException as e:
-                if attempt < self.download_max_retries:
-                    wait_time = (attempt + 1) * 2
-                    self.logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time}s... Error: {e}")
-                    time.sleep(wait_time)
-                    continue
-                self.logger.error(f"Error downloading {url} after {self.download_max_retries + 1} attempts: {e}")
-                return None
+        try:
+            self.logger.info(f"Attempting to download text from URL: {url}")
+            text = await self.http_client.get_text(
+                url,
+                headers=self.default_headers,
+                cookie_jar=cookie_jar,
+                max_retries=self.download_max_retries,
+                timeout=self.download_timeout
+            )
+        except httpx.HTTPError as e:
+            self.logger.error(f"Error downloading {url} after {self.download_max_retries + 1} attempts: {e}")
+            return None
 
-    def _get_subtitle_url(
-        self, 
-        languages: Dict[str, List[Dict[str, str]]], 
-        lang_code: str, 
-        format: str = 'vtt'
-    ) -> str:
-        if not languages:
-            return ''
-            
-        patterns = self.LANGUAGE_PATTERNS.get(lang_code, [])
-        
-        for pattern in patterns:
-            for lang_key in languages:
-                if lang_key.startswith(pattern):
-                    for sub in languages[lang_key]:
-                        if sub['ext'] == format:
-                            return sub['url']
-        
-        return ''
-
-    def _extract_subtitle_url_for_languages(
-        self, 
-        info: Dict[str, Any], 
-        lang_codes: List[str] = ['cn', 'en']
-    ) -> Tuple[str, str]:
-        en_sub_url = ''
-        cn_sub_url = ''
-        languages = None
-
-        # 优先使用自动生成的字幕
-        if 'automatic_captions' in info and info['automatic_captions']:
-            languages = info['automatic_captions']
-        elif 'subtitles' in info and info['subtitles']:
-            languages = info['subtitles']
-
-        if languages:
-            for lang_key in languages:
-                if lang_key.startswith('en'):
-                    en_sub_url = self._get_subtitle_url(languages, 'en')
-                elif lang_key.startswith('zh-Hans') or lang_key == 'cn':
-                    cn_sub_url = self._get_subtitle_url(languages, 'cn')
-
-        return en_sub_url, cn_sub_url
+        if not text:
+            raise SubtitleError("Failed to download text content.")
+
+        self.logger.info("Successfully downloaded text content")
+        return text
 
 
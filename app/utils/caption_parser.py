@@ -0,0 +1,136 @@
+"""单遍、惰性的字幕解析器，支持 WebVTT、SRV3 (XML) 和 JSON3 格式。"""
+import io
+import json
+import re
+import xml.etree.ElementTree as ET
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_TIMESTAMP_RE = re.compile(r'^\s*((?:\d+:)?\d{1,2}:\d{2})[.,]\d{3}\s+-->')
+_TAG_RE = re.compile(r'<[^>]*>')
+_PUNCT_RE = re.compile(r'([.,!?;:])\1| [.,!?;:]')
+_REPEATED_PUNCT_RE = re.compile(r'([.,!?;:])\1+')
+_SPACE_BEFORE_PUNCT_RE = re.compile(r' ([.,!?;:])')
+
+# 与前一条字幕重叠的词数至少为此值才视为滚动重复，避免 "the"、"and" 等常见词误判
+_MIN_OVERLAP_WORDS = 2
+
+
+def clean_caption_text(text: str) -> str:
+    """移除内联时间戳/样式标签和 HTML 实体，并规整空白和标点。"""
+    # 先做廉价的字符判断，绝大多数 cue 可以跳过对应的正则/反转义
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = unescape(text)
+    text = ' '.join(text.split())
+    if _PUNCT_RE.search(text):
+        text = _REPEATED_PUNCT_RE.sub(r'\1', text)
+        text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+    return text
+
+
+def _normalize_time(timestamp: str) -> str:
+    """将 MM:SS 或 H:MM:SS 统一为 HH:MM:SS。"""
+    parts = timestamp.split(':')
+    if len(parts) == 2:
+        parts.insert(0, '0')
+    return f"{int(parts[0]):02d}:{parts[1]}:{parts[2]}"
+
+
+def _ms_to_time(ms: int) -> str:
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _iter_vtt_raw(content: str) -> Iterator[Tuple[str, str]]:
+    stime: Optional[str] = None
+    text_lines: List[str] = []
+    for line in io.StringIO(content):
+        if stime is None:
+            match = _TIMESTAMP_RE.match(line)
+            if match:
+                stime = _normalize_time(match.group(1))
+            continue
+        # 只有真正的空行才结束 cue，YouTube 字幕的 cue 内部常有只含空格的行
+        if line not in ('\n', '\r\n', ''):
+            line = line.strip()
+            if line:
+                text_lines.append(line)
+            continue
+        yield stime, ' '.join(text_lines)
+        stime, text_lines = None, []
+    if stime is not None:
+        yield stime, ' '.join(text_lines)
+
+
+def _iter_srv3_raw(content: str) -> Iterator[Tuple[str, str]]:
+    for _event, element in ET.iterparse(io.StringIO(content), events=('end',)):
+        if element.tag == 'p':
+            start = element.get('t')
+            if start is not None:
+                yield _ms_to_time(int(start)), ''.join(element.itertext())
+            element.clear()
+
+
+def _iter_json3_raw(content: str) -> Iterator[Tuple[str, str]]:
+    for event in json.loads(content).get('events', []):
+        segs = event.get('segs')
+        if not segs:
+            continue
+        yield _ms_to_time(int(event.get('tStartMs', 0))), ''.join(seg.get('utf8', '') for seg in segs)
+
+
+def _dedupe_rolling(raw_cues: Iterable[Tuple[str, str]]) -> Iterator[Dict[str, str]]:
+    """清理文本并去除 YouTube 自动字幕的滚动重复。
+
+    自动字幕的每条 cue 通常会重复上一条的末尾行，再追加新词；
+    这里只输出相对上一条 cue 新增的部分，完全重复的 cue 直接跳过。
+    """
+    prev_words: List[str] = []
+    for stime, raw_text in raw_cues:
+        text = clean_caption_text(raw_text)
+        if not text:
+            continue
+        words = text.split(' ')
+        if words == prev_words:
+            continue
+
+        overlap = 0
+        for size in range(min(len(prev_words), len(words)), 0, -1):
+            if prev_words[-size:] == words[:size]:
+                overlap = size
+                break
+        prev_words = words
+        if overlap == len(words):
+            continue
+        if overlap >= _MIN_OVERLAP_WORDS:
+            text = ' '.join(words[overlap:])
+        yield {'stime': stime, 'txt': text}
+
+
+def detect_format(content: str) -> str:
+    """根据内容判断字幕格式：'vtt'、'srv3' 或 'json3'。"""
+    head = content.lstrip('﻿ \t\r\n')[:64]
+    if head.startswith('{'):
+        return 'json3'
+    if head.startswith('<'):
+        return 'srv3'
+    return 'vtt'
+
+
+def iter_cues(content: str, fmt: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """惰性地逐条产出 {'stime': 'HH:MM:SS', 'txt': 文本}。
+
+    Args:
+        content: 字幕内容
+        fmt: 'vtt'、'srv3' 或 'json3'，默认自动识别
+    """
+    fmt = fmt or detect_format(content)
+    if fmt == 'json3':
+        raw = _iter_json3_raw(content)
+    elif fmt == 'srv3':
+        raw = _iter_srv3_raw(content)
+    else:
+        raw = _iter_vtt_raw(content)
+    return _dedupe_rolling(raw)
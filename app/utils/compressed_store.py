@@ -0,0 +1,125 @@
+"""zlib 压缩后存入 Redis 的 JSON 存储，带 TTL、单条大小限制和总容量淘汰。"""
+import json
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+# 写入并按写入时间淘汰最旧的条目，直到总字节数不超过上限
+_PUT_SCRIPT = """
+local index, sizes, total = KEYS[1], KEYS[2], KEYS[3]
+local prefix, field, blob = ARGV[1], ARGV[2], ARGV[3]
+local ttl, max_total, now = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+
+local old = redis.call('HGET', sizes, field)
+if old then redis.call('DECRBY', total, old) end
+redis.call('SET', prefix .. field, blob, 'EX', ttl)
+redis.call('HSET', sizes, field, string.len(blob))
+redis.call('INCRBY', total, string.len(blob))
+redis.call('ZADD', index, now, field)
+
+local evicted = 0
+while tonumber(redis.call('GET', total) or 0) > max_total do
+    local oldest = redis.call('ZRANGE', index, 0, 0)[1]
+    if not oldest or oldest == field then break end
+    redis.call('DEL', prefix .. oldest)
+    redis.call('DECRBY', total, redis.call('HGET', sizes, oldest) or 0)
+    redis.call('HDEL', sizes, oldest)
+    redis.call('ZREM', index, oldest)
+    evicted = evicted + 1
+end
+return evicted
+"""
+
+# 条目已因 TTL 过期时，从索引和容量统计中移除
+_FORGET_SCRIPT = """
+local size = redis.call('HGET', KEYS[2], ARGV[1])
+if size then
+    redis.call('DECRBY', KEYS[3], size)
+    redis.call('HDEL', KEYS[2], ARGV[1])
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 0
+"""
+
+
+class CompressedRedisStore:
+    """压缩存储 JSON 值。
+
+    每个条目是一个独立的带 TTL 的字符串键 "{prefix}:{key}"；
+    "{prefix}:_index" / "_sizes" / "_total" 记录写入时间和大小，用于按总容量淘汰最旧的条目。
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        prefix: str,
+        ttl: float,
+        max_entry_bytes: int,
+        max_total_bytes: int,
+        compress_level: int = 6
+    ):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.ttl = int(ttl)
+        self.max_entry_bytes = max_entry_bytes
+        self.max_total_bytes = max_total_bytes
+        self.compress_level = compress_level
+        self._put = redis_client.register_script(_PUT_SCRIPT)
+        self._forget = redis_client.register_script(_FORGET_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.skipped = 0
+        self.evictions = 0
+
+    def _meta_keys(self):
+        return [f"{self.prefix}:_index", f"{self.prefix}:_sizes", f"{self.prefix}:_total"]
+
+    async def get(self, key: str) -> Optional[Any]:
+        blob = await self.redis_client.get(f"{self.prefix}:{key}")
+        if blob is None:
+            self.misses += 1
+            await self._forget(keys=self._meta_keys(), args=[key])
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(blob))
+
+    async def put(self, key: str, value: Any) -> bool:
+        """写入条目，压缩后超过单条上限时不写入并返回 False。"""
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'), self.compress_level)
+        if len(blob) > self.max_entry_bytes:
+            self.skipped += 1
+            return False
+        self.evictions += int(await self._put(
+            keys=self._meta_keys(),
+            args=[f"{self.prefix}:", key, blob, self.ttl, self.max_total_bytes, time.time()]
+        ))
+        self.writes += 1
+        return True
+
+    async def delete(self, key: str) -> None:
+        await self.redis_client.delete(f"{self.prefix}:{key}")
+        await self._forget(keys=self._meta_keys(), args=[key])
+
+    async def stats(self) -> Dict[str, Any]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zcard(self._meta_keys()[0])
+        pipe.get(self._meta_keys()[2])
+        entries, total = await pipe.execute()
+        lookups = self.hits + self.misses
+        return {
+            'name': self.prefix,
+            'entries': entries,
+            'bytes': int(total or 0),
+            'max_total_bytes': self.max_total_bytes,
+            'max_entry_bytes': self.max_entry_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'skipped': self.skipped,
+            'evictions': self.evictions,
+        }
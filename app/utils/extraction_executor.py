@@ -0,0 +1,79 @@
+"""在独立的有界线程池中执行阻塞的 yt-dlp 提取，避免阻塞事件循环。"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class ExtractionBusyError(Exception):
+    """提取队列已满时抛出的异常"""
+    pass
+
+
+class ExtractionTimeoutError(Exception):
+    """提取超时时抛出的异常"""
+    pass
+
+
+class ExtractionExecutor:
+    """有界的提取执行器。
+
+    同时运行的任务数由 max_workers 限制，排队等待的任务数由 max_queue 限制，
+    超出时立即抛出 ExtractionBusyError，而不是无限堆积。
+    超时的任务无法强制中断线程，其占用的名额会在线程真正结束后才释放。
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: Optional[float] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yt-dlp')
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """正在运行及排队中的任务数"""
+        return self._pending
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """在线程池中执行 func 并等待结果。
+
+        Args:
+            func: 要执行的阻塞函数
+            timeout: 本次调用的超时时间（秒），默认使用构造时的配置
+
+        Raises:
+            ExtractionBusyError: 当运行和排队的任务数已达上限时
+            ExtractionTimeoutError: 当任务在超时时间内未完成时
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise ExtractionBusyError(
+                    f"Extraction queue is full ({self._pending} pending)"
+                )
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise ExtractionTimeoutError(f"Extraction timed out after {timeout}s")
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭线程池，取消尚未开始的任务。"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,274 @@
+"""跨进程共享的 YouTube 提取限流器与熔断器，状态保存在 Redis 中。"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# 申请一次提取：
+#   open      熔断中，返回剩余秒数；到期后转为 half_open
+#   half_open 同一时间只放行一个探测请求，其余请求快速失败
+#   closed    令牌桶限速（速率为当前 limit，容量为 max(1, limit)），令牌可透支，
+#             调用方按返回的秒数等待后执行；需要等待超过 max_wait 时不透支，返回 limited
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local now, max_qps, open_seconds, probe_timeout, max_wait =
+    tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+local s = redis.call('HMGET', key, 'state', 'opened_at', 'probe_at', 'limit', 'tokens', 'tokens_at')
+local state = s[1] or 'closed'
+
+if state == 'open' then
+    local remaining = tonumber(s[2]) + open_seconds - now
+    if remaining > 0 then
+        return {'open', tostring(remaining)}
+    end
+    state = 'half_open'
+    redis.call('HSET', key, 'state', state, 'probe_ok', 0)
+    redis.call('HDEL', key, 'probe_at')
+    s[3] = false
+end
+
+if state == 'half_open' then
+    if s[3] and now - tonumber(s[3]) < probe_timeout then
+        return {'open', tostring(probe_timeout - (now - tonumber(s[3])))}
+    end
+    redis.call('HSET', key, 'probe_at', tostring(now))
+    return {'probe', '0'}
+end
+
+local limit = math.min(tonumber(s[4]) or max_qps, max_qps)
+local burst = math.max(1, limit)
+local tokens = tonumber(s[5]) or burst
+local tokens_at = tonumber(s[6]) or now
+tokens = math.min(burst, tokens + math.max(0, now - tokens_at) * limit)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / limit
+    if wait > max_wait then
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'tokens_at', tostring(now))
+        return {'limited', tostring(wait)}
+    end
+end
+redis.call('HSET', key, 'tokens', tostring(tokens - 1), 'tokens_at', tostring(now))
+return {'ok', tostring(wait)}
+"""
+
+# 报告一次提取的结果（ok / fail / skip）：
+#   半开状态只统计探测请求：连续成功 probe_successes 次后关闭熔断并从 min_qps 慢启动，失败则重新熔断
+#   关闭状态按时间窗口统计：窗口内失败数和失败率达到阈值时立即熔断；
+#   每个窗口结束时，失败率超过 aimd_threshold 则 limit 乘以 decrease，否则加上 increase（AIMD）
+_REPORT_SCRIPT = """
+local key = KEYS[1]
+local outcome, probe, now = ARGV[1], ARGV[2] == '1', tonumber(ARGV[3])
+local min_qps, max_qps, window = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local aimd_threshold, decrease, increase = tonumber(ARGV[7]), tonumber(ARGV[8]), tonumber(ARGV[9])
+local min_failures, breaker_threshold, probe_successes = tonumber(ARGV[10]), tonumber(ARGV[11]), tonumber(ARGV[12])
+local s = redis.call('HMGET', key, 'state', 'limit', 'ok', 'fail', 'window_at', 'probe_ok')
+local state = s[1] or 'closed'
+local limit = math.min(tonumber(s[2]) or max_qps, max_qps)
+
+if state ~= 'closed' then
+    -- 熔断前放行的请求晚到的结果不影响熔断状态
+    if state == 'open' or not probe then
+        return state
+    end
+    if outcome == 'ok' then
+        local probe_ok = tonumber(s[6] or 0) + 1
+        if probe_ok >= probe_successes then
+            redis.call('HSET', key, 'state', 'closed', 'limit', tostring(min_qps), 'ok', 0, 'fail', 0,
+                'window_at', tostring(now), 'tokens', 1, 'tokens_at', tostring(now))
+            redis.call('HDEL', key, 'opened_at', 'probe_at', 'probe_ok')
+            return 'closed'
+        end
+        redis.call('HSET', key, 'probe_ok', probe_ok)
+        redis.call('HDEL', key, 'probe_at')
+    elseif outcome == 'fail' then
+        redis.call('HSET', key, 'state', 'open', 'opened_at', tostring(now))
+        redis.call('HDEL', key, 'probe_at', 'probe_ok')
+        return 'open'
+    else
+        redis.call('HDEL', key, 'probe_at')
+    end
+    return state
+end
+
+if outcome == 'skip' then
+    return state
+end
+
+local ok, fail = tonumber(s[3] or 0), tonumber(s[4] or 0)
+if outcome == 'ok' then ok = ok + 1 else fail = fail + 1 end
+local total = ok + fail
+local window_at = tonumber(s[5]) or now
+
+if outcome == 'fail' and fail >= min_failures and fail / total >= breaker_threshold then
+    redis.call('HSET', key, 'state', 'open', 'opened_at', tostring(now),
+        'limit', tostring(math.max(min_qps, limit * decrease)), 'ok', 0, 'fail', 0, 'window_at', tostring(now))
+    return 'open'
+end
+
+if now - window_at >= window then
+    if fail / total > aimd_threshold then
+        limit = math.max(min_qps, limit * decrease)
+    else
+        limit = math.min(max_qps, limit + increase)
+    end
+    ok, fail, window_at = 0, 0, now
+end
+redis.call('HSET', key, 'limit', tostring(limit), 'ok', ok, 'fail', fail, 'window_at', tostring(window_at))
+return state
+"""
+
+
+class ExtractionGuardError(Exception):
+    """提取请求被全局限流器或熔断器拒绝。"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ExtractionGuardError):
+    """上游失败率过高，熔断器处于打开状态。"""
+    pass
+
+
+class RateLimitedError(ExtractionGuardError):
+    """全局提取速率已达上限，等待时间超过允许值。"""
+    pass
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class ExtractionGuard:
+    """所有 worker 共享的提取 QPS 上限（AIMD 自适应）和熔断器。
+
+    - 速率上限在 [min_qps, max_qps] 之间按时间窗口内的失败率调整：失败率高时乘性减小，否则加性增大。
+    - 窗口内失败达到 min_failures 次且失败率达到 failure_threshold 时熔断，open_seconds 内的请求直接失败；
+      之后进入半开状态逐个放行探测请求，连续 probe_successes 次成功后恢复，并从 min_qps 重新开始增长。
+    - 被 is_neutral 判定的错误（本地排队已满、视频本身不可用等）不计入失败率。
+    - Redis 不可用时放行请求，不因限流器故障拒绝服务。
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key: str,
+        max_qps: float,
+        min_qps: float,
+        window_seconds: float,
+        aimd_failure_threshold: float,
+        decrease_factor: float,
+        increase_step: float,
+        min_failures: int,
+        failure_threshold: float,
+        open_seconds: float,
+        probe_timeout: float,
+        probe_successes: int,
+        max_wait: float,
+        is_neutral: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.redis_client = redis_client
+        self.key = key
+        self.max_qps = max_qps
+        self.min_qps = min(min_qps, max_qps)
+        self.window_seconds = window_seconds
+        self.aimd_failure_threshold = aimd_failure_threshold
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_failures = max(1, min_failures)
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+        self.probe_successes = max(1, probe_successes)
+        self.max_wait = max_wait
+        self.is_neutral = is_neutral or (lambda e: False)
+        self._acquire = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._report = redis_client.register_script(_REPORT_SCRIPT)
+
+    async def acquire(self) -> bool:
+        """申请一次提取，必要时等待令牌。
+
+        Returns:
+            bool: 是否为半开状态下的探测请求
+
+        Raises:
+            CircuitOpenError: 熔断器打开或已有探测请求在进行
+            RateLimitedError: 需要等待的时间超过 max_wait
+        """
+        try:
+            decision, seconds = await self._acquire(
+                keys=[self.key],
+                args=[time.time(), self.max_qps, self.open_seconds, self.probe_timeout, self.max_wait]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Extraction guard unavailable, allowing request: {e}")
+            return False
+
+        decision, seconds = _decode(decision), float(_decode(seconds))
+        if decision == 'open':
+            raise CircuitOpenError(
+                f"YouTube extraction circuit is open, retry in {seconds:.0f}s", retry_after=seconds
+            )
+        if decision == 'limited':
+            raise RateLimitedError(
+                f"YouTube extraction rate limit reached, next slot in {seconds:.1f}s", retry_after=seconds
+            )
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+        return decision == 'probe'
+
+    async def report(self, outcome: str, probe: bool = False) -> None:
+        """报告一次提取的结果：ok、fail 或 skip（不计入统计，只释放探测名额）。"""
+        if outcome == 'skip' and not probe:
+            return
+        try:
+            state = _decode(await self._report(
+                keys=[self.key],
+                args=[outcome, int(probe), time.time(), self.min_qps, self.max_qps, self.window_seconds,
+                      self.aimd_failure_threshold, self.decrease_factor, self.increase_step,
+                      self.min_failures, self.failure_threshold, self.probe_successes]
+            ))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to report extraction outcome: {e}")
+            return
+        if outcome == 'fail' and state == 'open':
+            logger.warning(f"YouTube extraction circuit opened for {self.open_seconds:.0f}s")
+        elif probe and state == 'closed':
+            logger.info("YouTube extraction circuit closed after successful probes")
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """在限流和熔断的保护下执行一次提取，并报告结果。"""
+        probe = await self.acquire()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            await self.report('skip', probe)
+            raise
+        except Exception as e:
+            await self.report('skip' if self.is_neutral(e) else 'fail', probe)
+            raise
+        await self.report('ok', probe)
+        return result
+
+    async def stats(self) -> Dict[str, Any]:
+        raw = await self.redis_client.hgetall(self.key)
+        state = {_decode(k): _decode(v) for k, v in raw.items()}
+        now = time.time()
+        opened_at = float(state.get('opened_at') or 0)
+        return {
+            'state': state.get('state', 'closed'),
+            'limit_qps': round(min(float(state.get('limit') or self.max_qps), self.max_qps), 3),
+            'max_qps': self.max_qps,
+            'min_qps': self.min_qps,
+            'window_ok': int(state.get('ok') or 0),
+            'window_fail': int(state.get('fail') or 0),
+            'open_remaining_seconds': max(0.0, round(opened_at + self.open_seconds - now, 1)) if opened_at else 0.0,
+        }
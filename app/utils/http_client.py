@@ -0,0 +1,125 @@
+"""共享的异步 HTTP 客户端，复用连接并在可用时启用 HTTP/2。"""
+import asyncio
+import http.cookiejar
+import importlib.util
+import logging
+import os
+import random
+import threading
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 依赖可选的 h2 包
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CookieJarCache:
+    """缓存解析后的 Mozilla cookie 文件，仅在文件 mtime 变化时重新加载。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, http.cookiejar.MozillaCookieJar]] = {}
+
+    def get(self, path: str) -> Optional[http.cookiejar.MozillaCookieJar]:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError as e:
+            logger.warning(f"Failed to stat cookies file {path}: {e}")
+            return None
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            try:
+                cookie_jar = http.cookiejar.MozillaCookieJar(path)
+                cookie_jar.load(ignore_discard=True, ignore_expires=True)
+            except Exception as e:
+                logger.warning(f"Failed to load cookies from {path}: {e}")
+                return None
+            self._cache[path] = (mtime, cookie_jar)
+            return cookie_jar
+
+
+def cookie_header(cookie_jar: http.cookiejar.CookieJar, url: str) -> Optional[str]:
+    """按 URL 从 cookie jar 中挑选匹配的 cookie，生成 Cookie 请求头。"""
+    request = urllib.request.Request(url)
+    cookie_jar.add_cookie_header(request)
+    return request.get_header('Cookie')
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """带完全抖动的指数退避时间。"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HttpClient:
+    """进程内共享的 httpx.AsyncClient，在首次使用时创建。"""
+
+    def __init__(self, timeout: float = 60):
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    async def get_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        cookie_jar: Optional[http.cookiejar.CookieJar] = None,
+        max_retries: int = 2,
+        timeout: Optional[float] = None
+    ) -> str:
+        """GET 文本内容，网络错误及 429/5xx 时按带抖动的指数退避重试。
+
+        Raises:
+            httpx.HTTPError: 重试用尽后仍失败时
+        """
+        headers = dict(headers or {})
+        if cookie_jar is not None:
+            cookie = cookie_header(cookie_jar, url)
+            if cookie:
+                headers['Cookie'] = cookie
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self.client.get(url, headers=headers, timeout=timeout or self.timeout)
+                response.raise_for_status()
+                return response.text
+            except httpx.HTTPError as e:
+                retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in RETRYABLE_STATUS_CODES
+                if not retryable or attempt >= max_retries:
+                    raise
+                wait_time = backoff_delay(attempt, settings.HTTP_RETRY_BACKOFF_BASE, settings.HTTP_RETRY_BACKOFF_CAP)
+                logger.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time:.1f}s... Error: {e}")
+                await asyncio.sleep(wait_time)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 全局共享实例
+cookie_jar_cache = CookieJarCache()
+http_client = HttpClient()
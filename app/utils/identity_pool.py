@@ -0,0 +1,208 @@
+"""请求身份（cookies / User-Agent / 代理）轮换池：按健康度选择，逐身份限速，被限流时自动冷却。"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 视为被限流 / 触发风控的错误特征
+THROTTLE_MARKERS = (
+    'HTTP Error 429',
+    'Too Many Requests',
+    "confirm you're not a bot",
+    'confirm you’re not a bot',
+    'Sign in to confirm',
+)
+
+_HEALTH_ALPHA = 0.2   # 健康度（成功率）的指数移动平均系数
+_LATENCY_ALPHA = 0.2
+_HEALTH_RECOVERY_SECONDS = 600.0   # 空闲身份的健康度在此时间尺度上逐渐恢复，避免被永久冷落
+
+
+class IdentityUnavailableError(Exception):
+    """在等待时间内没有可用身份（全部冷却中或令牌耗尽）。"""
+    pass
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    message = str(error)
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+@dataclass
+class Identity:
+    """一个请求身份及其运行时状态。cookies_path 为空时使用默认 cookies 文件。"""
+    name: str
+    cookies_path: Optional[str] = None
+    user_agent: Optional[str] = None
+    proxy: Optional[str] = None
+    visitor_data: Optional[str] = None
+
+    health: float = 1.0
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    cooldown_until: float = 0.0
+    strikes: int = 0
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    throttled: int = 0
+    latency_ms: Optional[float] = None
+    last_error: Optional[str] = field(default=None, repr=False)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'proxy': bool(self.proxy),
+            'health': round(self.health, 3),
+            'tokens': round(self.tokens, 2),
+            'cooldown_seconds': max(0.0, round(self.cooldown_until - now, 1)),
+            'requests': self.requests,
+            'successes': self.successes,
+            'failures': self.failures,
+            'throttled': self.throttled,
+            'latency_ms': None if self.latency_ms is None else round(self.latency_ms, 1),
+            'last_error': self.last_error,
+        }
+
+
+def load_identities(path: Optional[str]) -> List[Identity]:
+    """从 JSON 文件读取身份列表；未配置时返回单个默认身份（沿用默认 cookies 文件）。
+
+    文件格式：
+        [{"name": "a", "cookies": "/path/cookies_a.txt", "user_agent": "...", "proxy": "socks5://...", "visitor_data": "..."}]
+    """
+    if not path:
+        return [Identity(name='default')]
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    identities = [
+        Identity(
+            name=entry.get('name') or f'identity-{index}',
+            cookies_path=entry.get('cookies'),
+            user_agent=entry.get('user_agent'),
+            proxy=entry.get('proxy'),
+            visitor_data=entry.get('visitor_data'),
+        )
+        for index, entry in enumerate(entries)
+    ]
+    if not identities:
+        raise ValueError(f"No identities configured in {path}")
+    return identities
+
+
+class IdentityPool:
+    """线程安全的身份池。
+
+    每个身份一个令牌桶（rate_per_second / burst），只在令牌可用且不在冷却期的身份中选择健康度最高的；
+    遇到 429 或人机验证时按 cooldown_base * 2^(连续次数-1) 冷却（不超过 cooldown_max），成功后清零。
+    """
+
+    def __init__(
+        self,
+        identities: Iterable[Identity],
+        rate_per_second: float,
+        burst: float,
+        cooldown_base: float,
+        cooldown_max: float
+    ):
+        self.identities = list(identities)
+        self.rate = rate_per_second
+        self.burst = max(1.0, burst)
+        self.cooldown_base = cooldown_base
+        self.cooldown_max = cooldown_max
+        self._cond = threading.Condition()
+        now = time.monotonic()
+        for identity in self.identities:
+            identity.tokens = self.burst
+            identity.refilled_at = now
+
+    def _refill(self, identity: Identity, now: float) -> None:
+        elapsed = now - identity.refilled_at
+        identity.refilled_at = now
+        identity.health += (1.0 - identity.health) * min(1.0, elapsed / _HEALTH_RECOVERY_SECONDS)
+        if self.rate <= 0:
+            # 不限速
+            identity.tokens = self.burst
+        else:
+            identity.tokens = min(self.burst, identity.tokens + elapsed * self.rate)
+
+    def _wait_time(self, identity: Identity, now: float) -> float:
+        """该身份可用前还需等待的秒数。"""
+        wait = max(0.0, identity.cooldown_until - now)
+        if identity.tokens < 1 and self.rate > 0:
+            wait = max(wait, (1 - identity.tokens) / self.rate)
+        return wait
+
+    def acquire(self, timeout: float, exclude: Iterable[str] = ()) -> Identity:
+        """选择一个可用身份并消耗一个令牌。
+
+        Args:
+            timeout: 最长等待时间（秒）
+            exclude: 优先避开的身份名（如刚失败的身份）；没有其他可用身份时仍可选中
+
+        Raises:
+            IdentityUnavailableError: 等待超时仍无可用身份
+        """
+        exclude = set(exclude)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for identity in self.identities:
+                    self._refill(identity, now)
+                ready = [i for i in self.identities if self._wait_time(i, now) == 0]
+                preferred = [i for i in ready if i.name not in exclude] or ready
+                if preferred:
+                    identity = max(preferred, key=lambda i: (i.health, i.tokens))
+                    identity.tokens -= 1
+                    identity.requests += 1
+                    return identity
+
+                wait = min(self._wait_time(i, now) for i in self.identities)
+                remaining = deadline - now
+                if remaining <= 0 or wait > remaining:
+                    raise IdentityUnavailableError(
+                        f"No identity available within {timeout:.1f}s (next in {wait:.1f}s)"
+                    )
+                self._cond.wait(wait)
+
+    def report(self, identity: Identity, ok: bool, latency: float, error: Optional[BaseException] = None) -> None:
+        """记录一次请求的结果。
+
+        Args:
+            identity: acquire 返回的身份
+            ok: 是否成功
+            latency: 耗时（秒）
+            error: 失败时的异常
+        """
+        with self._cond:
+            latency_ms = latency * 1000
+            identity.latency_ms = latency_ms if identity.latency_ms is None else (
+                _LATENCY_ALPHA * latency_ms + (1 - _LATENCY_ALPHA) * identity.latency_ms
+            )
+            identity.health = _HEALTH_ALPHA * (1.0 if ok else 0.0) + (1 - _HEALTH_ALPHA) * identity.health
+            if ok:
+                identity.successes += 1
+                identity.strikes = 0
+                return
+
+            identity.failures += 1
+            identity.last_error = str(error)[:200] if error else None
+            if error is not None and is_throttle_error(error):
+                identity.throttled += 1
+                identity.strikes += 1
+                cooldown = min(self.cooldown_max, self.cooldown_base * 2 ** (identity.strikes - 1))
+                identity.cooldown_until = time.monotonic() + cooldown
+                logger.warning(f"Identity {identity.name} throttled, cooling down for {cooldown:.0f}s")
+            self._cond.notify_all()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            now = time.monotonic()
+            for identity in self.identities:
+                self._refill(identity, now)
+            return [identity.stats(now) for identity in self.identities]
@@ -0,0 +1,169 @@
+"""按 key 合并并发请求：同一进程内共享结果，跨进程通过带租约的 Redis 锁协调。"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as redis
+
+# 仅当锁仍归自己持有时才续约/释放
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightTimeoutError(Exception):
+    """等待进行中的任务结果超时"""
+    pass
+
+
+class SingleFlight:
+    """单飞（single-flight）执行器。
+
+    - 同一进程内，相同 key 的任务在独立的 Task 中执行，所有调用方（包括发起者）通过 shield 等待它，
+      任一调用方被取消都不会影响其他调用方和任务本身。
+    - 跨进程时，只有拿到 Redis 锁的进程执行任务，锁带租约并在执行期间自动续约，
+      持有者崩溃后锁会自然过期；其他进程轮询 fetch_result 获取结果。
+    - result_ttl 大于 0 时，执行者在释放锁之前把结果（JSON）写入结果 key 并保留 result_ttl 秒，
+      fetch_result 查不到的结果（如未缓存的中间状态）也能交给其他进程中正在等待的调用方，
+      它们不会在锁释放后重新执行任务。
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        lock_prefix: str,
+        lease_seconds: float = 300,
+        poll_interval: float = 2,
+        wait_timeout: float = 600,
+        result_ttl: float = 0,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.redis_client = redis_client
+        self.lock_prefix = lock_prefix
+        self.lease_ms = int(lease_seconds * 1000)
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.result_ttl_ms = int(result_ttl * 1000)
+        self.logger = logger or logging.getLogger(__name__)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.lock_prefix}:{key}"
+
+    def _result_key(self, key: str) -> str:
+        return f"{self.lock_prefix}:result:{key}"
+
+    async def _publish_result(self, key: str, result: Any) -> None:
+        if self.result_ttl_ms <= 0 or result is None:
+            return
+        try:
+            await self.redis_client.set(self._result_key(key), json.dumps(result), px=self.result_ttl_ms)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Single-flight result for {key} is not JSON serializable: {e}")
+
+    async def _fetch(self, key: str, fetch_result: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        result = await fetch_result()
+        if result is not None or self.result_ttl_ms <= 0:
+            return result
+        shared = await self.redis_client.get(self._result_key(key))
+        return json.loads(shared) if shared else None
+
+    async def _acquire(self, key: str, token: str) -> bool:
+        return bool(await self.redis_client.set(self._lock_key(key), token, nx=True, px=self.lease_ms))
+
+    async def _release(self, key: str, token: str) -> None:
+        await self.redis_client.eval(_RELEASE_SCRIPT, 1, self._lock_key(key), token)
+
+    async def _keep_alive(self, key: str, token: str) -> None:
+        """每隔 1/3 租约时间续约一次，直到任务结束。"""
+        while True:
+            await asyncio.sleep(self.lease_ms / 3000)
+            renewed = await self.redis_client.eval(_RENEW_SCRIPT, 1, self._lock_key(key), token, self.lease_ms)
+            if not renewed:
+                self.logger.warning(f"Lost single-flight lease for {key}")
+                return
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        fetch_result: Callable[[], Awaitable[Optional[Any]]],
+        on_wait: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Any:
+        """执行 fn，或等待其他调用方正在执行的同一任务。
+
+        Args:
+            key: 任务标识，如 video_id
+            fn: 实际执行任务的协程函数
+            fetch_result: 读取已完成结果的协程函数（如查询缓存），未完成时返回 None
+            on_wait: 开始等待其他调用方的结果时调用一次
+
+        Raises:
+            SingleFlightTimeoutError: 等待其他进程的结果超时
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            if on_wait is not None:
+                await on_wait()
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._run_or_wait(key, fn, fetch_result, on_wait))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 所有调用方都已取消时避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_or_wait(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        fetch_result: Callable[[], Awaitable[Optional[Any]]],
+        on_wait: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Any:
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if await self._acquire(key, token):
+                keep_alive = asyncio.create_task(self._keep_alive(key, token))
+                try:
+                    result = await fn()
+                    await self._publish_result(key, result)
+                    return result
+                finally:
+                    keep_alive.cancel()
+                    await self._release(key, token)
+
+            # 其他进程正在执行，轮询结果；锁消失但无结果时重新竞争锁
+            self.logger.info(f"Waiting for in-flight task {key} in another worker")
+            if on_wait is not None:
+                await on_wait()
+                on_wait = None
+            while await self.redis_client.exists(self._lock_key(key)):
+                result = await self._fetch(key, fetch_result)
+                if result is not None:
+                    return result
+                if time.monotonic() >= deadline:
+                    raise SingleFlightTimeoutError(f"Timed out waiting for in-flight task {key}")
+                await asyncio.sleep(self.poll_interval)
+
+            result = await self._fetch(key, fetch_result)
+            if result is not None:
+                return result
@@ -0,0 +1,39 @@
+"""按 video_id + 语言 + 来源（自动/人工）持久化字幕原文及解析结果。"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from app.utils.compressed_store import CompressedRedisStore
+
+
+def subtitle_source(url: str) -> Tuple[str, str]:
+    """从 YouTube timedtext 链接解析字幕语言和来源。
+
+    Returns:
+        Tuple[str, str]: (语言, 来源)，来源为 'auto'（自动生成）或 'manual'（人工上传）；
+        翻译字幕的语言形如 'en>zh-Hans'
+    """
+    params = parse_qs(urlparse(url).query)
+    lang = params.get('lang', ['unknown'])[0]
+    tlang = params.get('tlang', [None])[0]
+    if tlang:
+        lang = f"{lang}>{tlang}"
+    origin = 'auto' if params.get('kind', [''])[0] == 'asr' else 'manual'
+    return lang, origin
+
+
+class SubtitleStore:
+    """字幕内容缓存，签名的字幕 URL 过期后仍可复用已下载的字幕。"""
+
+    def __init__(self, store: CompressedRedisStore):
+        self.store = store
+
+    @staticmethod
+    def _key(video_id: str, lang: str, origin: str) -> str:
+        return f"{video_id}:{lang}:{origin}"
+
+    async def get(self, video_id: str, lang: str, origin: str) -> Optional[Dict[str, Any]]:
+        """返回 {'vtt': 原始字幕, 'cues': [{'stime', 'txt'}]}，未缓存时返回 None。"""
+        return await self.store.get(self._key(video_id, lang, origin))
+
+    async def put(self, video_id: str, lang: str, origin: str, vtt: str, cues: List[Dict[str, str]]) -> bool:
+        return await self.store.put(self._key(video_id, lang, origin), {'vtt': vtt, 'cues': cues})
@@ -0,0 +1,265 @@
+"""基于 Redis 有序集合的优先级任务队列，支持可见性超时和死信。"""
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# 优先级换算成分数时的倍数，需大于时间戳的取值范围，保证高优先级总是先出队、同优先级先进先出
+PRIORITY_SCALE = 1e10
+
+# 入队：已在队列中（等待或处理中）的任务不重复入队
+_ENQUEUE_SCRIPT = """
+local pending, inflight, data, score, age = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local task_id = ARGV[1]
+if redis.call('ZSCORE', pending, task_id) or redis.call('ZSCORE', inflight, task_id) then
+    return 0
+end
+redis.call('HSET', data, task_id, ARGV[2])
+redis.call('HSET', score, task_id, ARGV[3])
+redis.call('ZADD', pending, ARGV[3], task_id)
+redis.call('ZADD', age, 'NX', ARGV[4], task_id)
+return 1
+"""
+
+# 出队：先回收可见性超时的任务（超过最大次数则进死信），再按分数取出最多 count 个任务。
+# 返回 {死信数 n, n 个死信 task_id, 每个取出任务的 task_id, payload, attempt}
+_CLAIM_SCRIPT = """
+local pending, inflight, data, score, age, attempts, dead = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6], KEYS[7]
+local now, count, deadline, max_attempts = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+
+local expired = {}
+for _, task_id in ipairs(redis.call('ZRANGEBYSCORE', inflight, '-inf', now)) do
+    redis.call('ZREM', inflight, task_id)
+    if tonumber(redis.call('HGET', attempts, task_id) or 0) >= max_attempts then
+        redis.call('HSET', dead, task_id, cjson.encode({
+            payload = redis.call('HGET', data, task_id),
+            error = ARGV[5],
+            attempts = tonumber(redis.call('HGET', attempts, task_id)),
+            failed_at = now
+        }))
+        redis.call('HDEL', data, task_id)
+        redis.call('HDEL', score, task_id)
+        redis.call('HDEL', attempts, task_id)
+        redis.call('ZREM', age, task_id)
+        table.insert(expired, task_id)
+    else
+        redis.call('ZADD', pending, redis.call('HGET', score, task_id) or now, task_id)
+    end
+end
+
+local claimed = {#expired}
+for _, task_id in ipairs(expired) do
+    table.insert(claimed, task_id)
+end
+for _, task_id in ipairs(redis.call('ZRANGE', pending, 0, count - 1)) do
+    redis.call('ZREM', pending, task_id)
+    redis.call('ZADD', inflight, deadline, task_id)
+    local attempt = redis.call('HINCRBY', attempts, task_id, 1)
+    table.insert(claimed, task_id)
+    table.insert(claimed, redis.call('HGET', data, task_id) or '')
+    table.insert(claimed, attempt)
+end
+return claimed
+"""
+
+# 续约/确认/失败都以 attempt 作为防护令牌，任务被重新认领后旧的处理者无法再修改它
+_EXTEND_SCRIPT = """
+if tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or 0) ~= tonumber(ARGV[2]) then return 0 end
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+_ACK_SCRIPT = """
+local inflight, data, score, age, attempts, counter = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6]
+if tonumber(redis.call('HGET', attempts, ARGV[1]) or 0) ~= tonumber(ARGV[2]) then return 0 end
+if redis.call('ZREM', inflight, ARGV[1]) == 0 then return 0 end
+redis.call('HDEL', data, ARGV[1])
+redis.call('HDEL', score, ARGV[1])
+redis.call('HDEL', attempts, ARGV[1])
+redis.call('ZREM', age, ARGV[1])
+redis.call('INCR', counter)
+redis.call('EXPIRE', counter, ARGV[3])
+return 1
+"""
+
+# 返回值：0 表示不再持有该任务，1 表示已重新入队，2 表示已进入死信
+_NACK_SCRIPT = """
+local pending, inflight, data, score, age, attempts, dead, counter = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6], KEYS[7], KEYS[8]
+local task_id, attempt = ARGV[1], tonumber(ARGV[2])
+if tonumber(redis.call('HGET', attempts, task_id) or 0) ~= attempt then return 0 end
+if redis.call('ZREM', inflight, task_id) == 0 then return 0 end
+redis.call('INCR', counter)
+redis.call('EXPIRE', counter, ARGV[6])
+if attempt >= tonumber(ARGV[3]) then
+    redis.call('HSET', dead, task_id, cjson.encode({
+        payload = redis.call('HGET', data, task_id),
+        error = ARGV[4],
+        attempts = attempt,
+        failed_at = tonumber(ARGV[5])
+    }))
+    redis.call('HDEL', data, task_id)
+    redis.call('HDEL', score, task_id)
+    redis.call('HDEL', attempts, task_id)
+    redis.call('ZREM', age, task_id)
+    return 2
+end
+redis.call('ZADD', pending, redis.call('HGET', score, task_id), task_id)
+return 1
+"""
+
+
+@dataclass
+class QueuedTask:
+    """已出队的任务，attempt 同时作为后续续约/确认的防护令牌"""
+    task_id: str
+    payload: Dict[str, Any]
+    attempt: int
+
+
+class RedisTaskQueue:
+    """优先级任务队列。
+
+    - 等待队列为有序集合，优先级高者先出，同优先级先进先出。
+    - 出队的任务进入处理中集合，分数为可见性截止时间；处理者需定期 extend，
+      超时未确认的任务会被重新入队，失败次数达到 max_attempts 后进入死信。
+    - 出队时因超时进入死信的任务会通过 on_dead(task_id, error) 通知调用方，
+      nack 进入死信的任务由调用方根据返回值自行处理。
+    - 任务内容只在入队时写入一次，状态变化只移动任务 ID。
+    """
+
+    THROUGHPUT_WINDOW_SECONDS = 3600
+
+    DEAD_ON_TIMEOUT_ERROR = 'visibility timeout expired'
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        name: str,
+        max_attempts: int = 3,
+        on_dead: Optional[Callable[[str, str], Awaitable[None]]] = None
+    ):
+        self.redis_client = redis_client
+        self.name = name
+        self.max_attempts = max_attempts
+        self.on_dead = on_dead
+        self._enqueue = redis_client.register_script(_ENQUEUE_SCRIPT)
+        self._claim = redis_client.register_script(_CLAIM_SCRIPT)
+        self._extend = redis_client.register_script(_EXTEND_SCRIPT)
+        self._ack = redis_client.register_script(_ACK_SCRIPT)
+        self._nack = redis_client.register_script(_NACK_SCRIPT)
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.name}:{suffix}"
+
+    def _counter_key(self, kind: str, ts: float) -> str:
+        return self._key(f"{kind}:{int(ts // 60)}")
+
+    async def enqueue(self, task_id: str, payload: Dict[str, Any], priority: float = 0) -> bool:
+        """任务入队，已在队列中时返回 False。"""
+        now = time.time()
+        return bool(await self._enqueue(
+            keys=[self._key('pending'), self._key('inflight'), self._key('data'), self._key('score'), self._key('age')],
+            args=[task_id, json.dumps(payload), -priority * PRIORITY_SCALE + now, now]
+        ))
+
+    async def claim(self, count: int, visibility_timeout: float) -> List[QueuedTask]:
+        """取出最多 count 个任务，在 visibility_timeout 秒内未确认将被重新投递。"""
+        now = time.time()
+        result = await self._claim(
+            keys=[self._key('pending'), self._key('inflight'), self._key('data'), self._key('score'),
+                  self._key('age'), self._key('attempts'), self._key('dead')],
+            args=[now, count, now + visibility_timeout, self.max_attempts, self.DEAD_ON_TIMEOUT_ERROR]
+        )
+        dead_count = int(result[0])
+        for task_id in result[1:dead_count + 1]:
+            task_id = task_id.decode() if isinstance(task_id, bytes) else task_id
+            logger.warning(f"Task {task_id} in {self.name} moved to dead letters: {self.DEAD_ON_TIMEOUT_ERROR}")
+            if self.on_dead is not None:
+                try:
+                    await self.on_dead(task_id, self.DEAD_ON_TIMEOUT_ERROR)
+                except Exception as e:
+                    logger.error(f"Dead letter callback failed for {task_id}: {e}")
+        result = result[dead_count + 1:]
+        tasks = []
+        for i in range(0, len(result), 3):
+            task_id, payload, attempt = result[i:i + 3]
+            tasks.append(QueuedTask(
+                task_id=task_id.decode() if isinstance(task_id, bytes) else task_id,
+                payload=json.loads(payload) if payload else {},
+                attempt=int(attempt)
+            ))
+        return tasks
+
+    async def extend(self, task: QueuedTask, visibility_timeout: float) -> bool:
+        """延长任务的可见性超时，任务已被重新投递时返回 False。"""
+        return bool(await self._extend(
+            keys=[self._key('inflight'), self._key('attempts')],
+            args=[task.task_id, task.attempt, time.time() + visibility_timeout]
+        ))
+
+    async def ack(self, task: QueuedTask) -> bool:
+        """确认任务完成。"""
+        return bool(await self._ack(
+            keys=[self._key('inflight'), self._key('data'), self._key('score'), self._key('age'),
+                  self._key('attempts'), self._counter_key('completed', time.time())],
+            args=[task.task_id, task.attempt, self.THROUGHPUT_WINDOW_SECONDS]
+        ))
+
+    async def nack(self, task: QueuedTask, error: str) -> Optional[bool]:
+        """标记任务失败。
+
+        Returns:
+            Optional[bool]: True 表示已进入死信，False 表示已重新入队，None 表示任务已不归本处理者
+        """
+        now = time.time()
+        result = await self._nack(
+            keys=[self._key('pending'), self._key('inflight'), self._key('data'), self._key('score'),
+                  self._key('age'), self._key('attempts'), self._key('dead'), self._counter_key('failed', now)],
+            args=[task.task_id, task.attempt, self.max_attempts, error, now, self.THROUGHPUT_WINDOW_SECONDS]
+        )
+        if not result:
+            return None
+        return int(result) == 2
+
+    async def stats(self) -> Dict[str, Any]:
+        """队列长度、最早任务的等待时长以及最近的吞吐量。"""
+        now = time.time()
+        minutes = range(int(now // 60) - 59, int(now // 60) + 1)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zcard(self._key('pending'))
+        pipe.zcard(self._key('inflight'))
+        pipe.hlen(self._key('dead'))
+        pipe.zrange(self._key('age'), 0, 0, withscores=True)
+        pipe.mget([self._key(f"completed:{m}") for m in minutes])
+        pipe.mget([self._key(f"failed:{m}") for m in minutes])
+        pending, inflight, dead, oldest, completed, failed = await pipe.execute()
+
+        completed = [int(c or 0) for c in completed]
+        failed = [int(f or 0) for f in failed]
+        return {
+            'name': self.name,
+            'pending': pending,
+            'inflight': inflight,
+            'dead': dead,
+            'oldest_age_seconds': now - oldest[0][1] if oldest else 0.0,
+            'completed_last_minute': completed[-1],
+            'completed_last_hour': sum(completed),
+            'failed_last_hour': sum(failed),
+        }
+
+    async def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """列出死信任务。"""
+        items = []
+        async for task_id, raw in self.redis_client.hscan_iter(self._key('dead'), count=limit):
+            entry = json.loads(raw)
+            entry['task_id'] = task_id.decode() if isinstance(task_id, bytes) else task_id
+            items.append(entry)
+            if len(items) >= limit:
+                break
+        return items
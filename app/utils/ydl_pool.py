@@ -0,0 +1,213 @@
+"""按线程复用的 YoutubeDL 实例池。"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import yt_dlp
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledYoutubeDL:
+    __slots__ = ('key', 'ydl', 'uses', 'cookies_generation', 'cookies_copy')
+
+    def __init__(
+        self,
+        key: Hashable,
+        ydl: yt_dlp.YoutubeDL,
+        cookies_generation: Optional[int],
+        cookies_copy: Optional[str]
+    ):
+        self.key = key
+        self.ydl = ydl
+        self.uses = 0
+        self.cookies_generation = cookies_generation
+        self.cookies_copy = cookies_copy
+
+
+def _file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def copy_cookies(opts: Dict[str, Any]) -> Optional[str]:
+    """把 opts 中的 cookiefile 替换为私有副本，返回副本路径（未配置 cookies 时返回 None）。
+
+    YoutubeDL.close() 会把 cookies 写回 cookiefile，使用副本避免改写共享的 cookies 文件。
+    """
+    source = opts.get('cookiefile')
+    if not source or not os.path.isfile(source):
+        return None
+    fd, copy = tempfile.mkstemp(prefix='ydl-cookies-', suffix='.txt')
+    os.close(fd)
+    try:
+        shutil.copyfile(source, copy)
+    except OSError:
+        os.unlink(copy)
+        raise
+    opts['cookiefile'] = copy
+    return copy
+
+
+def _remove_copy(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def isolated_youtubedl(opts: Dict[str, Any]) -> Iterator[yt_dlp.YoutubeDL]:
+    """创建一次性使用的 YoutubeDL 实例，使用 cookies 文件的私有副本，退出时关闭实例并删除副本。"""
+    opts = dict(opts)
+    cookies_copy = copy_cookies(opts)
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            yield ydl
+    finally:
+        _remove_copy(cookies_copy)
+
+
+class YoutubeDLPool:
+    """每个提取线程为每个请求身份持有一个长期存活的 YoutubeDL 实例。
+
+    实例在首次使用时创建，之后复用其已初始化的提取器和 HTTP 会话（保持 TCP/TLS 连接）。
+    使用 max_uses 次后、提取出错后或 cookies 文件内容变化后关闭并在下次使用时重建。
+
+    每个实例使用 cookies 文件的私有副本：YoutubeDL.close() 会把 cookies 写回 cookiefile，
+    直接使用原文件时，各线程回收实例会反复改写同一个文件并互相触发重建。
+    原文件内容的变化由池按内容哈希记录为代数（generation），实例代数落后时重建。
+    """
+
+    def __init__(
+        self,
+        opts_factory: Callable[[Any], Dict[str, Any]],
+        max_uses: int,
+        cookies_path_fn: Optional[Callable[[Any], Optional[str]]] = None
+    ):
+        """
+        Args:
+            opts_factory: 根据身份生成 YoutubeDL 参数的函数，每次创建实例时调用
+            max_uses: 单个实例的最大使用次数
+            cookies_path_fn: 返回身份当前 cookies 文件路径的函数，用于检测 cookies 更新
+        """
+        self.opts_factory = opts_factory
+        self.max_uses = max(1, max_uses)
+        self.cookies_path_fn = cookies_path_fn
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances: Dict[int, _PooledYoutubeDL] = {}
+        # cookies 文件路径 -> ((mtime_ns, size), 内容哈希, 代数)
+        self._cookies: Dict[str, Tuple[Tuple[int, int], str, int]] = {}
+        self.created = 0
+        self.recycled = 0
+        self.reused = 0
+
+    def _cookies_generation(self, identity: Any) -> Optional[int]:
+        """身份 cookies 文件的内容代数；文件元数据未变化时不重新读取内容。"""
+        path = self.cookies_path_fn(identity) if self.cookies_path_fn else None
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+            stat_key = (st.st_mtime_ns, st.st_size)
+            with self._lock:
+                state = self._cookies.get(path)
+                if state is not None and state[0] == stat_key:
+                    return state[2]
+            digest = _file_digest(path)
+        except OSError:
+            return None
+        with self._lock:
+            state = self._cookies.get(path)
+            if state is None:
+                generation = 0
+            elif state[1] != digest:
+                generation = state[2] + 1
+            else:
+                generation = state[2]
+            self._cookies[path] = (stat_key, digest, generation)
+            return generation
+
+    @staticmethod
+    def _close(entry: _PooledYoutubeDL) -> None:
+        try:
+            entry.ydl.close()
+        except Exception as e:
+            logger.warning(f"Error closing YoutubeDL instance: {e}")
+        _remove_copy(entry.cookies_copy)
+
+    def _entries(self) -> Dict[Hashable, _PooledYoutubeDL]:
+        entries = getattr(self._local, 'entries', None)
+        if entries is None:
+            entries = self._local.entries = {}
+        return entries
+
+    def _discard(self, entry: _PooledYoutubeDL) -> None:
+        self._entries().pop(entry.key, None)
+        with self._lock:
+            self._instances.pop(id(entry), None)
+            self.recycled += 1
+        self._close(entry)
+
+    def _get(self, identity: Any) -> _PooledYoutubeDL:
+        key = getattr(identity, 'name', None)
+        entry = self._entries().get(key)
+        cookies_generation = self._cookies_generation(identity)
+        if entry is not None and entry.cookies_generation != cookies_generation:
+            self._discard(entry)
+            entry = None
+        if entry is None:
+            opts = self.opts_factory(identity)
+            cookies_copy = copy_cookies(opts)
+            try:
+                ydl = yt_dlp.YoutubeDL(opts)
+            except BaseException:
+                _remove_copy(cookies_copy)
+                raise
+            entry = _PooledYoutubeDL(key, ydl, cookies_generation, cookies_copy)
+            self._entries()[key] = entry
+            with self._lock:
+                self._instances[id(entry)] = entry
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        return entry
+
+    @contextmanager
+    def acquire(self, identity: Any = None) -> Iterator[yt_dlp.YoutubeDL]:
+        """获取当前线程绑定到该身份的 YoutubeDL 实例；出错或达到使用次数上限后回收。"""
+        entry = self._get(identity)
+        try:
+            yield entry.ydl
+        except BaseException:
+            self._discard(entry)
+            raise
+        entry.uses += 1
+        if entry.uses >= self.max_uses:
+            self._discard(entry)
+
+    def close_all(self) -> None:
+        """关闭所有实例（进程退出时调用）。"""
+        with self._lock:
+            entries = list(self._instances.values())
+            self._instances.clear()
+        for entry in entries:
+            self._close(entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'live': len(self._instances),
+                'created': self.created,
+                'reused': self.reused,
+                'recycled': self.recycled,
+                'max_uses': self.max_uses,
+            }
@@ -1,15 +1,20 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
 import yt_dlp
-import contextlib
-import io
 from app.utils.StderrLogger import StderrLogger
+from app.utils.ydl_pool import YoutubeDLPool, isolated_youtubedl
+from app.utils.identity_pool import Identity, IdentityPool, IdentityUnavailableError, load_identities, is_throttle_error
+from app.utils.extraction_executor import ExtractionBusyError
+from app.config import settings
+from app.models.youtube import YoutubeVideoInfo
 import sys
 import os
+import glob
 from pathlib import Path
 import time
-import random
 import logging
 import datetime
+import re
+from urllib.parse import urlparse, parse_qs
 
 from yt_dlp.version import __version__
 
@@ -32,6 +37,25 @@ class VideoInfoError(Exception):
     pass
 
 
+# 视频本身不可用（私有、已删除、会员专属、地区限制）的错误特征，与上游是否过载无关
+VIDEO_UNAVAILABLE_MARKERS = (
+    'video unavailable',
+    'this video is unavailable',
+    'private video',
+    'has been removed',
+    'members-only',
+    'not available in your country',
+)
+
+
+def is_neutral_extraction_error(error: BaseException) -> bool:
+    """不应计入全局提取失败率的错误：本地排队已满、没有可用身份或视频本身不可用。"""
+    if isinstance(error, (ExtractionBusyError, IdentityUnavailableError)):
+        return True
+    message = str(error).lower()
+    return not is_throttle_error(error) and any(marker in message for marker in VIDEO_UNAVAILABLE_MARKERS)
+
+
 def get_cookies_path() -> Optional[str]:
     """获取 cookies 文件路径。
     
@@ -57,11 +81,405 @@ def get_cookies_path() -> Optional[str]:
     return None
 
 
-def get_video_info_utils(url: str) -> Dict[str, Any]:
+# yt-dlp 请求使用的浏览器请求头
+YTDLP_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+    'sec-ch-ua': '"Chromium";v="123", "Google Chrome";v="123", "Not:A-Brand";v="99"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'DNT': '1',
+    'Referer': 'https://www.youtube.com/'
+}
+
+_VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+_YOUTUBE_HOSTS = ('youtube.com', 'youtube-nocookie.com')
+_PATH_ID_PREFIXES = ('shorts', 'embed', 'live', 'v', 'e')
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """从各种形式的 YouTube 链接中提取 video_id。
+
+    支持 youtu.be 短链、/shorts/、/embed/、/live/、watch?v= 以及带额外查询参数的链接，
+    也接受直接传入的 11 位 video_id。
+
+    Args:
+        url: YouTube 视频链接或 video_id
+
+    Returns:
+        Optional[str]: video_id，无法识别时返回 None
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if _VIDEO_ID_RE.match(url):
+        return url
+    if '://' not in url:
+        url = f'https://{url}'
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    path_parts = [part for part in parsed.path.split('/') if part]
+
+    candidate = None
+    if host == 'youtu.be' or host.endswith('.youtu.be'):
+        candidate = path_parts[0] if path_parts else None
+    elif any(host == h or host.endswith('.' + h) for h in _YOUTUBE_HOSTS):
+        query_id = parse_qs(parsed.query).get('v')
+        if query_id:
+            candidate = query_id[0]
+        elif len(path_parts) >= 2 and path_parts[0] in _PATH_ID_PREFIXES:
+            candidate = path_parts[1]
+
+    if candidate and _VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def canonical_video_url(video_id: str) -> str:
+    """根据 video_id 生成标准的观看链接。"""
+    return f'https://www.youtube.com/watch?v={video_id}'
+
+
+T = TypeVar('T')
+
+# 请求身份池（cookies / User-Agent / 代理）
+identity_pool = IdentityPool(
+    load_identities(settings.IDENTITY_POOL_FILE),
+    rate_per_second=settings.IDENTITY_RATE_PER_MINUTE / 60,
+    burst=settings.IDENTITY_BURST,
+    cooldown_base=settings.IDENTITY_COOLDOWN_BASE,
+    cooldown_max=settings.IDENTITY_COOLDOWN_MAX
+)
+
+
+def identity_cookies_path(identity: Optional[Identity]) -> Optional[str]:
+    """身份使用的 cookies 文件；未单独配置时使用默认 cookies 文件。"""
+    if identity is not None and identity.cookies_path:
+        return identity.cookies_path
+    return get_cookies_path()
+
+
+def apply_identity(ydl_opts: Dict[str, Any], identity: Optional[Identity]) -> Dict[str, Any]:
+    """把身份的 cookies、User-Agent、代理和 visitor_data 写入 yt-dlp 参数。"""
+    cookies_path = identity_cookies_path(identity)
+    if cookies_path:
+        ydl_opts['cookiefile'] = cookies_path
+    if identity is None:
+        return ydl_opts
+    if identity.user_agent:
+        ydl_opts['http_headers'] = {**ydl_opts.get('http_headers', {}), 'User-Agent': identity.user_agent}
+    if identity.proxy:
+        ydl_opts['proxy'] = identity.proxy
+    if identity.visitor_data:
+        extractor_args = dict(ydl_opts.get('extractor_args', {}))
+        extractor_args['youtube'] = {**extractor_args.get('youtube', {}), 'visitor_data': identity.visitor_data}
+        ydl_opts['extractor_args'] = extractor_args
+    return ydl_opts
+
+
+def run_with_identity(extract: Callable[[Identity], T], exclude: Optional[List[str]] = None) -> T:
+    """选择一个身份执行一次提取并记录结果，被限流的身份由身份池自动冷却。
+
+    只尝试一次，不在提取线程内等待或重试：重试由调用方重新经过全局限流器发起，
+    每次尝试各占一个令牌（见 YoutubeDLPService.run_extraction）。
+
+    Args:
+        extract: 使用给定身份执行的提取函数
+        exclude: 优先避开的身份名；提供时失败的身份会追加到其中，供调用方重试时换一个身份
+
+    Raises:
+        IdentityUnavailableError: 等待超时仍无可用身份
+    """
+    identity = identity_pool.acquire(settings.IDENTITY_ACQUIRE_TIMEOUT, exclude=exclude or ())
+    start = time.monotonic()
+    try:
+        result = extract(identity)
+    except Exception as e:
+        identity_pool.report(identity, False, time.monotonic() - start, e)
+        if exclude is not None:
+            exclude.append(identity.name)
+        raise
+    identity_pool.report(identity, True, time.monotonic() - start)
+    return result
+
+
+_CHANNEL_PATH_PREFIXES = ('channel', 'c', 'user')
+
+
+def playlist_source_url(url: str) -> str:
+    """把频道主页链接转换为其上传视频列表（/videos），播放列表等其他链接保持不变。
+
+    Args:
+        url: 播放列表或频道链接
+
+    Returns:
+        str: 可用于扁平提取的链接
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = f'https://{url}'
+    parsed = urlparse(url)
+    path_parts = [part for part in parsed.path.split('/') if part]
+    is_channel_root = (
+        (len(path_parts) == 1 and path_parts[0].startswith('@'))
+        or (len(path_parts) == 2 and path_parts[0] in _CHANNEL_PATH_PREFIXES)
+    )
+    if is_channel_root:
+        return parsed._replace(path='/' + '/'.join(path_parts + ['videos']), query='').geturl()
+    return url
+
+
+def list_playlist_entries_utils(url: str, start: int, count: int, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
+    """扁平提取播放列表或频道上传列表中的一页视频，不解析单个视频的详细信息。
+
+    Args:
+        url: 播放列表或频道链接
+        start: 起始位置（从1开始）
+        count: 本页条目数
+        exclude: 优先避开的身份名，见 run_with_identity
+
+    Returns:
+        Dict[str, Any]: 包含列表信息、本页条目（entries）及是否还有下一页（has_more）
+
+    Raises:
+        VideoInfoError: 当列表信息获取失败时抛出
+    """
+    ydl_opts = {
+        'skip_download': True,
+        'quiet': True,
+        'logger': StderrLogger(),
+        'no_warnings': True,
+        'logtostderr': True,             # 实例自身的 stdout 输出改写到 stderr，不替换进程全局的 sys.stdout
+        'extract_flat': 'in_playlist',   # 只列出条目，不逐个解析视频
+        'playliststart': start,
+        'playlistend': start + count,    # 多取一条用于判断是否有下一页
+        'http_headers': YTDLP_HTTP_HEADERS,
+        'socket_timeout': 30,
+        'extractor_retries': settings.YTDLP_EXTRACTOR_RETRIES,
+    }
+
+    def extract(identity: Identity) -> Dict[str, Any]:
+        # 使用 cookies 副本，关闭实例时不改写身份共享的 cookies 文件
+        with isolated_youtubedl(apply_identity(dict(ydl_opts), identity)) as ydl:
+            return ydl.extract_info(playlist_source_url(url), download=False)
+
+    try:
+        info = run_with_identity(extract, exclude)
+    except IdentityUnavailableError:
+        raise
+    except yt_dlp.utils.DownloadError as e:
+        raise VideoInfoError(f"Download error: {str(e)}")
+    except Exception as e:
+        raise VideoInfoError(f"Unexpected error: {str(e)}")
+
+    if not info:
+        raise VideoInfoError("Failed to extract playlist information")
+
+    entries = []
+    for entry in info.get('entries') or []:
+        video_id = entry.get('id') if entry else None
+        if not video_id or not _VIDEO_ID_RE.match(video_id):
+            continue
+        entries.append({
+            'id': video_id,
+            'title': entry.get('title'),
+            'duration': entry.get('duration'),
+            'view_count': entry.get('view_count'),
+        })
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title'),
+        'channel': info.get('channel') or info.get('uploader'),
+        'channel_id': info.get('channel_id'),
+        'entries': entries[:count],
+        'has_more': len(entries) > count,
+    }
+
+
+def build_video_info_opts(identity: Optional[Identity] = None) -> Dict[str, Any]:
+    """生成获取单个视频完整信息所用的 yt-dlp 参数（含身份对应的 cookies、User-Agent 和代理）。"""
+    ydl_opts = {
+        'skip_download': True,  # 不下载视频
+        'listsubtitles': True,  # 列出可用字幕
+        'quiet': True,          # 静默模式
+        'logger': StderrLogger(),  # 使用自定义logger
+        'logtostderr': True,       # listsubtitles 的字幕列表等 stdout 输出改写到 stderr（按实例生效，线程安全）
+        'progress_hooks': [],      # 禁用进度回调
+        'no_warnings': True,       # 禁用警告
+        'extract_flat': False,     # 获取完整信息
+        'ignoreerrors': False,     # 不忽略错误
+        
+        # 添加更多伪装选项
+        'http_headers': YTDLP_HTTP_HEADERS,
+        
+        # 添加更多高级选项
+        'socket_timeout': 30,  # 增加超时时间
+        'retries': 10,         # 增加重试次数
+        'fragment_retries': 10,
+        # 提取重试会在被限流时成倍放大请求量，由全局限流器和身份轮换负责退避
+        'extractor_retries': settings.YTDLP_EXTRACTOR_RETRIES,
+        'skip_unavailable_fragments': True,
+        'keepvideo': False,
+        'writedescription': False,
+        'writeinfojson': False,
+        'writesubtitles': False,
+        'writeautomaticsub': False,
+        'postprocessors': [],
+        'geo_bypass': True,    # 绕过地理限制
+        'geo_verification_proxy': None,
+        'geo_bypass_country': None,
+        'geo_bypass_ip_block': None,
+        
+        # 添加新的反检测选项
+        'extractor_args': {
+            'youtube': {
+                'player_client': ['android', 'web'],
+                'player_skip': ['webpage', 'configs'],
+                'skip': ['dash', 'hls'],
+                'formats': 'missing_pot',  # 允许使用缺少 PO Token 的格式
+                'visitor_data': 'CgtQc0FfV2FfV0FfUSiImZ6qBjIGCgJHQg%3D%3D',  # 添加访客数据
+            }
+        },
+        'format_sort': ['res', 'ext:mp4:m4a'],
+        'format': 'worst',
+        'nocheckcertificate': True,
+        'legacy_server_connect': True,
+    }
+
+    return apply_identity(ydl_opts, identity)
+
+
+# 字幕语言代码及其匹配的 yt-dlp 字幕语言前缀
+SUBTITLE_LANGUAGE_PATTERNS = {
+    'en': ['en', 'en-zh-Hans'],
+    'cn': ['cn', 'zh-Hans-zh-Hans', 'zh-Hans']
+}
+
+# 视频信息模型需要的字段，其余字段（formats、automatic_captions 等）在提取线程内丢弃
+VIDEO_INFO_FIELDS = tuple(
+    name for name in YoutubeVideoInfo.model_fields if name not in ('cn_subtitle_url', 'en_subtitle_url')
+)
+
+
+def _get_subtitle_url(languages: Dict[str, List[Dict[str, str]]], lang_code: str, format: str = 'vtt') -> str:
+    if not languages:
+        return ''
+
+    patterns = SUBTITLE_LANGUAGE_PATTERNS.get(lang_code, [])
+
+    for pattern in patterns:
+        for lang_key in languages:
+            if lang_key.startswith(pattern):
+                for sub in languages[lang_key]:
+                    if sub['ext'] == format:
+                        return sub['url']
+
+    return ''
+
+
+def select_subtitle_urls(info: Dict[str, Any]) -> Tuple[str, str]:
+    """从 yt-dlp 的视频信息中选出英文和简体中文字幕的链接。
+
+    Returns:
+        Tuple[str, str]: (英文字幕链接, 中文字幕链接)，没有对应字幕时为空字符串
+    """
+    en_sub_url = ''
+    cn_sub_url = ''
+    languages = None
+
+    # 优先使用自动生成的字幕
+    if 'automatic_captions' in info and info['automatic_captions']:
+        languages = info['automatic_captions']
+    elif 'subtitles' in info and info['subtitles']:
+        languages = info['subtitles']
+
+    if languages:
+        for lang_key in languages:
+            if lang_key.startswith('en'):
+                en_sub_url = _get_subtitle_url(languages, 'en')
+            elif lang_key.startswith('zh-Hans') or lang_key == 'cn':
+                cn_sub_url = _get_subtitle_url(languages, 'cn')
+
+    return en_sub_url, cn_sub_url
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return value
+    if hasattr(value, '__dict__'):
+        # 处理其他对象类型
+        return str(value)
+    return value
+
+
+def project_video_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留视频信息模型需要的字段，并把字幕列表替换为选中的字幕链接。
+
+    完整的 yt-dlp 信息中 formats、automatic_captions（上百种语言）、requested_formats 等字段
+    往往有数 MB，在提取线程内投影后只有几 KB 需要跨线程传递和校验。
+    """
+    projected = {key: _plain_value(info[key]) for key in VIDEO_INFO_FIELDS if key in info}
+    projected['en_subtitle_url'], projected['cn_subtitle_url'] = select_subtitle_urls(info)
+    return projected
+
+
+def select_thumbnail(thumbnails: Optional[List[Dict[str, Any]]], width: int, default: Optional[str] = None) -> Optional[str]:
+    """选出宽度不小于 width 的最小缩略图，都比 width 小时选最大的一个；没有带宽度的缩略图时返回 default。"""
+    sized = [thumb for thumb in thumbnails or [] if thumb.get('width') and thumb.get('url')]
+    if not sized:
+        return default
+    larger = [thumb for thumb in sized if thumb['width'] >= width]
+    best = min(larger, key=lambda thumb: thumb['width']) if larger else max(sized, key=lambda thumb: thumb['width'])
+    return best['url']
+
+
+def select_video_info_fields(
+    info: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    thumbnail_width: Optional[int] = None
+) -> Dict[str, Any]:
+    """从已缓存的视频信息中选出部分字段，直接投影字典而不重建模型。
+
+    Args:
+        info: 视频信息（YoutubeVideoInfo.model_dump() 的结果）
+        fields: 需要的字段，为空时返回全部字段
+        thumbnail_width: 指定时 thumbnail 替换为最适合该宽度的缩略图
+    """
+    if fields is None and thumbnail_width is None:
+        return info
+    view = dict(info) if fields is None else {key: info.get(key) for key in fields}
+    if thumbnail_width is not None and 'thumbnail' in view:
+        view['thumbnail'] = select_thumbnail(info.get('thumbnails'), thumbnail_width, info.get('thumbnail'))
+    return view
+
+
+# 提取线程复用的 YoutubeDL 实例（每个线程每个身份一个）
+video_info_pool = YoutubeDLPool(
+    build_video_info_opts,
+    max_uses=settings.YDL_POOL_MAX_USES,
+    cookies_path_fn=identity_cookies_path
+)
+
+
+def get_video_info_utils(url: str, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
     """获取YouTube视频的详细信息。
 
     Args:
         url: YouTube视频的URL
+        exclude: 优先避开的身份名，见 run_with_identity
 
     Returns:
         Optional[Dict[str, Any]]: 包含视频信息的字典，如果获取失败则返回None
@@ -69,120 +487,78 @@ def get_video_info_utils(url: str) -> Dict[str, Any]:
     Raises:
         VideoInfoError: 当视频信息获取失败时抛出
     """
+    def extract(identity: Identity) -> Dict[str, Any]:
+        # 实例按线程和身份复用，出错时由池回收重建
+        with video_info_pool.acquire(identity) as ydl:
+            return ydl.extract_info(url, download=False)
+
     try:
-        # 获取 cookies 路径
-        cookies_path = get_cookies_path()
-        
-        # 配置yt-dlp选项
-        ydl_opts = {
-            'skip_download': True,  # 不下载视频
-            'listsubtitles': True,  # 列出可用字幕
-            'quiet': True,          # 静默模式
-            'logger': StderrLogger(),  # 使用自定义logger
-            'progress_hooks': [],      # 禁用进度回调
-            'no_warnings': True,       # 禁用警告
-            'extract_flat': False,     # 获取完整信息
-            'ignoreerrors': False,     # 不忽略错误
-            
-            # 添加更多伪装选项
-            'http_headers': {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Cache-Control': 'max-age=0',
-                'sec-ch-ua': '"Chromium";v="123", "Google Chrome";v="123", "Not:A-Brand";v="99"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'DNT': '1',
-                'Referer': 'https://www.youtube.com/'
-            },
-            
-            # 添加更多高级选项
-            'socket_timeout': 30,  # 增加超时时间
-            'retries': 10,         # 增加重试次数
-            'fragment_retries': 10,
-            'extractor_retries': 10,
-            'skip_unavailable_fragments': True,
-            'keepvideo': False,
-            'writedescription': False,
-            'writeinfojson': False,
-            'writesubtitles': False,
-            'writeautomaticsub': False,
-            'postprocessors': [],
-            'geo_bypass': True,    # 绕过地理限制
-            'geo_verification_proxy': None,
-            'geo_bypass_country': None,
-            'geo_bypass_ip_block': None,
-            
-            # 添加新的反检测选项
-            'extractor_args': {
-                'youtube': {
-                    'player_client': ['android', 'web'],
-                    'player_skip': ['webpage', 'configs'],
-                    'skip': ['dash', 'hls'],
-                    'formats': 'missing_pot',  # 允许使用缺少 PO Token 的格式
-                    'visitor_data': 'CgtQc0FfV2FfV0FfUSiImZ6qBjIGCgJHQg%3D%3D',  # 添加访客数据
-                }
-            },
-            'format_sort': ['res', 'ext:mp4:m4a'],
-            'format': 'worst',
-            'nocheckcertificate': True,
-            'legacy_server_connect': True,
-        }
-        
-        # 如果存在 cookies 文件，添加到选项中
-        if cookies_path:
-            ydl_opts['cookiefile'] = cookies_path
-        
         # 使用yt-dlp获取视频信息
-        with contextlib.redirect_stdout(io.StringIO()):
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # 添加随机延迟，模拟人类行为
-                #time.sleep(random.uniform(1, 3))
-                
-                try:
-                    info = ydl.extract_info(url, download=False)
-                except Exception as e:
-                    logger.warning(f"First attempt failed: {e}")
-                    # 如果第一次尝试失败，等待更长时间后重试
-                    time.sleep(random.uniform(5, 10))
-                    info = ydl.extract_info(url, download=False)
-                
-                # 检查是否获取到字幕信息
-                # if info and not (info.get('automatic_captions') or info.get('subtitles')):
-                #     print("No subtitle information found, retrying...", file=sys.stderr)
-                #     # 重试前添加随机延迟
-                #     time.sleep(random.uniform(2, 5))
-                #     # 重试一次
-                #     info = ydl.extract_info(url, download=False)
-                
+        info = run_with_identity(extract, exclude)
+
+        # 检查是否获取到字幕信息
+        # if info and not (info.get('automatic_captions') or info.get('subtitles')):
+        #     print("No subtitle information found, retrying...", file=sys.stderr)
+        #     # 重试前添加随机延迟
+        #     time.sleep(random.uniform(2, 5))
+        #     # 重试一次
+        #     info = ydl.extract_info(url, download=False)
+
         if not info:
             raise VideoInfoError("Failed to extract video information")
-        
-        # 将info对象转换为普通字典
-        info_dict = {}
-        for key, value in info.items():
-            # 处理特殊类型
-            if isinstance(value, (datetime.datetime, datetime.date)):
-                info_dict[key] = value.isoformat()
-            elif isinstance(value, (list, dict)):
-                info_dict[key] = value
-            elif hasattr(value, '__dict__'):
-                # 处理其他对象类型
-                info_dict[key] = str(value)
-            else:
-                info_dict[key] = value
-                
-        return info_dict
+
+        return project_video_info(info)
             
+    except IdentityUnavailableError:
+        raise
     except yt_dlp.utils.DownloadError as e:
         raise VideoInfoError(f"Download error: {str(e)}")
     except Exception as e:
-        raise VideoInfoError(f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise VideoInfoError(f"Unexpected error: {str(e)}")
+
+
+def download_audio_utils(url: str, output_dir: str, audio_format: str, exclude: Optional[List[str]] = None) -> str:
+    """下载视频的音频（供语音转写使用），与信息提取共用身份池。
+
+    Args:
+        url: 视频链接
+        output_dir: 保存目录
+        audio_format: yt-dlp 格式选择表达式
+        exclude: 优先避开的身份名，见 run_with_identity
+
+    Returns:
+        str: 下载得到的音频文件路径
+
+    Raises:
+        VideoInfoError: 下载失败或未得到文件时抛出
+    """
+    ydl_opts = {
+        'format': audio_format,
+        'outtmpl': os.path.join(output_dir, '%(id)s.%(ext)s'),
+        'quiet': True,
+        'no_warnings': True,
+        'logger': StderrLogger(),
+        'logtostderr': True,
+        'noplaylist': True,
+        'http_headers': YTDLP_HTTP_HEADERS,
+        'extractor_retries': settings.YTDLP_EXTRACTOR_RETRIES,
+    }
+
+    def download(identity: Identity) -> None:
+        with isolated_youtubedl(apply_identity(dict(ydl_opts), identity)) as ydl:
+            ydl.download([url])
+
+    try:
+        run_with_identity(download, exclude)
+    except IdentityUnavailableError:
+        raise
+    except yt_dlp.utils.DownloadError as e:
+        raise VideoInfoError(f"Download error: {str(e)}")
+    except Exception as e:
+        raise VideoInfoError(f"Unexpected error: {str(e)}")
+
+    # 之前失败的尝试可能留下未完成的分片文件
+    files = [path for path in glob.glob(os.path.join(output_dir, '*')) if not path.endswith(('.part', '.ytdl'))]
+    if not files:
+        raise VideoInfoError(f"No audio downloaded for {url}")
+    return files[0]
@@ -0,0 +1,143 @@
+"""转写 worker：消费转写队列中的任务，生成字幕后自动触发摘要。
+
+可独立运行：python -m app.workers.transcript_worker
+也可通过 TRANSCRIPT_WORKER_EMBEDDED=true 随 API 进程启动。
+"""
+import asyncio
+import logging
+import sys
+from typing import Optional, Set
+
+from app.config import settings
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.utils.task_queue import QueuedTask
+from app.workers.transcription_backends import TranscriptionBackend, load_backend
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+TranscriptStatus = YoutubeDLPService.TranscriptStatus
+
+
+class TranscriptWorker:
+    """从转写队列认领并处理任务。
+
+    任务状态流转：101 CREATED -> 102 PROCESSING -> 103 SUCCESS / 110 ERROR，
+    状态只在流转时写入 video_transcript_task，供 /summary 查询。
+    处理期间定期延长队列中的可见性超时，worker 崩溃后任务会被重新投递，
+    失败次数达到上限后进入死信并标记为 ERROR。
+    """
+
+    def __init__(
+        self,
+        service: YoutubeDLPService,
+        backend: Optional[TranscriptionBackend] = None,
+        concurrency: int = settings.TRANSCRIPT_WORKER_CONCURRENCY,
+        lease_seconds: float = settings.TRANSCRIPT_LEASE_SECONDS,
+        poll_interval: float = settings.TRANSCRIPT_POLL_INTERVAL,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.service = service
+        self.queue = service.transcript_queue
+        self.backend = backend or load_backend(settings.TRANSCRIPTION_BACKEND, service)
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        self.logger.info(f"Transcript worker started with concurrency {self.concurrency}")
+        while not self._stopping.is_set():
+            claimed = 0
+            free_slots = self.concurrency - len(self._running)
+            if free_slots > 0:
+                try:
+                    for task in await self.queue.claim(free_slots, self.lease_seconds):
+                        job = asyncio.create_task(self._process(task))
+                        self._running.add(job)
+                        job.add_done_callback(self._running.discard)
+                        claimed += 1
+                except Exception as e:
+                    self.logger.error(f"Failed to claim transcript tasks: {e}", exc_info=True)
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def stop(self) -> None:
+        """停止认领新任务并取消进行中的任务，它们会在可见性超时后被重新投递。"""
+        self._stopping.set()
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _keep_alive(self, task: QueuedTask) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await self.queue.extend(task, self.lease_seconds):
+                self.logger.warning(f"Lost lease on transcript task {task.task_id}")
+                return
+
+    async def _process(self, task: QueuedTask) -> None:
+        video_id = task.task_id
+        self.logger.info(f"Processing transcript task {video_id} (attempt {task.attempt})")
+        await self.service.update_transcript_task_state(
+            video_id, TranscriptStatus.PROCESSING, "transcript task processing"
+        )
+        keep_alive = asyncio.create_task(self._keep_alive(task))
+        try:
+            info = await self.service.get_video_info(video_id, groups=())
+            transcript = await self.backend.transcribe(video_id, info)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Transcript task {video_id} failed: {e}", exc_info=True)
+            dead = await self.queue.nack(task, str(e))
+            if dead:
+                await self.service.update_transcript_task_state(video_id, TranscriptStatus.ERROR, str(e))
+            elif dead is False:
+                await self.service.update_transcript_task_state(
+                    video_id, TranscriptStatus.CREATED, "transcript task created"
+                )
+            return
+        finally:
+            keep_alive.cancel()
+
+        if not await self.queue.ack(task):
+            self.logger.warning(f"Transcript task {video_id} was redelivered, dropping result")
+            return
+        await self.service.update_transcript_task_state(video_id, TranscriptStatus.SUCCESS, transcript)
+
+        # 转写成功后自动生成摘要
+        try:
+            await self.service.generate_summary_from_transcript(video_id, transcript)
+            self.logger.info(f"Summary generated from transcript for {video_id}")
+        except Exception as e:
+            self.logger.error(f"Summary from transcript failed for {video_id}: {e}", exc_info=True)
+
+
+async def main() -> None:
+    from app.config.redis_config import RedisClient
+
+    service = YoutubeDLPService(redis_client=RedisClient.get_instance(), logger=logger)
+    worker = TranscriptWorker(service, logger=logger)
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        service.extraction_executor.shutdown()
+        await RedisClient.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
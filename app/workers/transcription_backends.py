@@ -0,0 +1,65 @@
+"""可插拔的语音转写后端。"""
+import importlib
+import os
+import tempfile
+from typing import Any, Dict, Optional, Protocol
+
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.utils.yt_dlp_utils import canonical_video_url, download_audio_utils
+
+
+class TranscriptionError(Exception):
+    """语音转写相关的异常"""
+    pass
+
+
+class TranscriptionBackend(Protocol):
+    """转写后端接口，返回 WebVTT 格式的字幕文本。测试时可替换为桩实现。
+
+    load_backend 构造后端时传入 service 参数，需要访问 YouTube 的后端应通过它的提取执行器和限流器进行。
+    """
+
+    async def transcribe(self, video_id: str, video_info: Dict[str, Any]) -> str:
+        ...
+
+
+class WhisperTranscriptionBackend:
+    """用 yt-dlp 下载音频，再调用 OpenAI 转写接口生成 VTT 字幕。
+
+    音频下载与视频信息提取一样经过有界的提取线程池、全局限流/熔断器和身份池。
+    """
+
+    # OpenAI 转写接口限制上传文件不超过 25MB
+    AUDIO_FORMAT = 'bestaudio[filesize<25M]/bestaudio[filesize_approx<25M]/worstaudio'
+
+    def __init__(self, service: YoutubeDLPService, model: Optional[str] = None):
+        self.service = service
+        self.model = model or settings.TRANSCRIPTION_MODEL
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    async def transcribe(self, video_id: str, video_info: Dict[str, Any]) -> str:
+        url = video_info.get('webpage_url') or canonical_video_url(video_id)
+        with tempfile.TemporaryDirectory(prefix='transcript-') as output_dir:
+            audio_path = await self.service.run_extraction(
+                download_audio_utils, url, output_dir, self.AUDIO_FORMAT,
+                timeout=settings.TRANSCRIPT_AUDIO_TIMEOUT
+            )
+            with open(audio_path, 'rb') as audio_file:
+                vtt = await self.client.audio.transcriptions.create(
+                    model=self.model,
+                    file=audio_file,
+                    response_format='vtt'
+                )
+        if not vtt:
+            raise TranscriptionError(f"Empty transcript for {video_id}")
+        return vtt
+
+
+def load_backend(path: str, service: YoutubeDLPService) -> TranscriptionBackend:
+    """按 "module:Class" 形式加载并实例化转写后端。"""
+    module_name, _, class_name = path.partition(':')
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(service=service)
@@ -0,0 +1,282 @@
+"""预热 worker：定期扁平扫描配置的频道/播放列表，在低峰时段为新上传的视频预先生成视频信息和摘要。
+
+可独立运行：python -m app.workers.warmup_worker
+也可通过 WARMUP_WORKER_EMBEDDED=true 随 API 进程启动。
+"""
+import asyncio
+import datetime
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.utils.extraction_guard import ExtractionGuardError
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# 已处理过的 video_id（有序集合，分数为处理时间），只保留最近 SEEN_MAX_ENTRIES 个
+REDIS_WARMUP_SEEN_KEY = 'warmup_seen'
+# 每日预算计数，key 后缀为日期
+REDIS_WARMUP_BUDGET_PREFIX = 'warmup_budget'
+# 预热失败的 video_id（有序集合，分数为下次允许重试的时间）及连续失败次数（hash）
+REDIS_WARMUP_FAILED_KEY = 'warmup_failed'
+REDIS_WARMUP_FAILURE_COUNT_KEY = 'warmup_failure_count'
+SEEN_MAX_ENTRIES = 100000
+
+
+@dataclass
+class WarmupSource:
+    """一个需要预热的频道或播放列表。"""
+    url: str
+    languages: Optional[List[str]] = None
+    depth: int = settings.WARMUP_SCAN_DEPTH
+
+
+def load_sources(path: Optional[str]) -> List[WarmupSource]:
+    """从 JSON 文件读取预热来源，未配置时返回空列表。
+
+    文件格式（条目可以只是链接字符串）：
+        ["https://www.youtube.com/@channel",
+         {"url": "https://www.youtube.com/playlist?list=...", "languages": ["zh-Hans", "en"], "depth": 10}]
+    """
+    if not path:
+        return []
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    sources = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'url': entry}
+        unknown = [lang for lang in entry.get('languages') or [] if lang not in YoutubeDLPService.SUMMARY_LANGUAGES]
+        if unknown:
+            raise ValueError(f"Unsupported languages for {entry['url']}: {', '.join(unknown)}")
+        sources.append(WarmupSource(
+            url=entry['url'],
+            languages=entry.get('languages'),
+            depth=int(entry.get('depth') or settings.WARMUP_SCAN_DEPTH),
+        ))
+    return sources
+
+
+def parse_window(window: Optional[str]) -> Optional[Tuple[datetime.time, datetime.time]]:
+    """解析 "HH:MM-HH:MM" 格式的时间窗口（本地时间，可跨零点），为空时返回 None 表示不限时段。"""
+    if not window:
+        return None
+    start, end = window.split('-')
+    return (datetime.datetime.strptime(start.strip(), '%H:%M').time(),
+            datetime.datetime.strptime(end.strip(), '%H:%M').time())
+
+
+def seconds_until_window(window: Optional[Tuple[datetime.time, datetime.time]], now: datetime.datetime) -> float:
+    """距时间窗口开始还有多少秒，当前已在窗口内时返回 0。"""
+    if window is None:
+        return 0.0
+    start, end = window
+    current = now.time()
+    if start <= end:
+        inside = start <= current < end
+    else:
+        inside = current >= start or current < end
+    if inside:
+        return 0.0
+    next_start = datetime.datetime.combine(now.date(), start)
+    if next_start <= now:
+        next_start += datetime.timedelta(days=1)
+    return (next_start - now).total_seconds()
+
+
+class WarmupWorker:
+    """为预热来源中新上传的视频预先生成视频信息和摘要。
+
+    - 每 poll_interval 秒扫描一次各来源最新的 depth 个条目（扁平提取，不解析单个视频），
+      跳过已有摘要或已处理过的视频；没有字幕的视频只记录为已处理，不创建转写任务。
+    - 只在 WARMUP_WINDOW 时段内工作，窗口结束时停止处理剩余视频。
+    - 每天最多处理 daily_budget 个视频（所有 worker 共享计数），用于限制 LLM 花费。
+    - 处理失败的视频按指数退避跳过（failure_backoff 起步，最长 failure_backoff_max），
+      避免永久失败的视频每轮都消耗预算。
+    - 提取被全局限流或熔断拒绝时结束本轮，不与用户请求争抢配额。
+    """
+
+    def __init__(
+        self,
+        service: YoutubeDLPService,
+        sources: Optional[List[WarmupSource]] = None,
+        poll_interval: float = settings.WARMUP_POLL_INTERVAL,
+        window: Optional[str] = settings.WARMUP_WINDOW,
+        daily_budget: int = settings.WARMUP_DAILY_BUDGET,
+        failure_backoff: float = settings.WARMUP_FAILURE_BACKOFF,
+        failure_backoff_max: float = settings.WARMUP_FAILURE_BACKOFF_MAX,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.service = service
+        self.redis_client: redis.Redis = service.redis_client
+        self.sources = load_sources(settings.WARMUP_SOURCES_FILE) if sources is None else sources
+        self.poll_interval = poll_interval
+        self.window = parse_window(window)
+        self.daily_budget = daily_budget
+        self.failure_backoff = failure_backoff
+        self.failure_backoff_max = failure_backoff_max
+        self.logger = logger or logging.getLogger(__name__)
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        if not self.sources:
+            self.logger.info("Warm-up worker has no sources configured, exiting")
+            return
+        self.logger.info(f"Warm-up worker started with {len(self.sources)} sources, daily budget {self.daily_budget}")
+        while not self._stopping.is_set():
+            delay = seconds_until_window(self.window, datetime.datetime.now())
+            if delay == 0:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    self.logger.error(f"Warm-up cycle failed: {e}", exc_info=True)
+                delay = self.poll_interval
+            else:
+                delay = min(delay, self.poll_interval)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+    async def run_once(self) -> Dict[str, int]:
+        """扫描所有来源并处理新视频，返回本轮统计。"""
+        counts = {'scanned': 0, 'warmed': 0, 'skipped': 0, 'failed': 0}
+        for source in self.sources:
+            try:
+                video_ids = await self._new_videos(source)
+            except ExtractionGuardError as e:
+                self.logger.warning(f"Warm-up paused, extraction rejected: {e}")
+                break
+            except Exception as e:
+                self.logger.warning(f"Failed to scan {source.url}: {e}")
+                continue
+            counts['scanned'] += len(video_ids)
+            for video_id in video_ids:
+                if self._stopping.is_set() or seconds_until_window(self.window, datetime.datetime.now()) > 0:
+                    return counts
+                if not await self._take_budget():
+                    self.logger.info("Warm-up daily budget exhausted")
+                    return counts
+                try:
+                    counts[await self._warm(video_id, source.languages)] += 1
+                except ExtractionGuardError as e:
+                    self.logger.warning(f"Warm-up paused, extraction rejected: {e}")
+                    return counts
+                except Exception as e:
+                    counts['failed'] += 1
+                    retry_in = await self._record_failure(video_id)
+                    self.logger.warning(f"Warm-up failed for {video_id}, retry in {retry_in:.0f}s: {e}")
+        self.logger.info(f"Warm-up cycle finished: {counts}")
+        return counts
+
+    async def _new_videos(self, source: WarmupSource) -> List[str]:
+        """来源最新的条目中，尚无摘要、未处理过且不在失败退避期内的 video_id（按列表顺序，通常最新的在前）。"""
+        playlist = await self.service.get_playlist_entries(source.url, page=1, page_size=source.depth, schedule=False)
+        video_ids = list(dict.fromkeys(entry['id'] for entry in playlist['entries']))
+        if not video_ids:
+            return []
+        pipe = self.redis_client.pipeline()
+        for video_id in video_ids:
+            pipe.zscore(REDIS_WARMUP_SEEN_KEY, video_id)
+            pipe.zscore(REDIS_WARMUP_FAILED_KEY, video_id)
+        scores = await pipe.execute()
+        now = time.time()
+        candidates = [
+            video_id for video_id, seen_at, retry_at in zip(video_ids, scores[::2], scores[1::2])
+            if seen_at is None and (retry_at is None or retry_at <= now)
+        ]
+        summarized = await self.service.get_summarized_ids(candidates)
+        return [video_id for video_id in candidates if video_id not in summarized]
+
+    async def _take_budget(self) -> bool:
+        key = f"{REDIS_WARMUP_BUDGET_PREFIX}:{datetime.date.today().isoformat()}"
+        pipe = self.redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, 2 * 24 * 3600)
+        used, _ = await pipe.execute()
+        if used > self.daily_budget:
+            await self.redis_client.decr(key)
+            return False
+        return True
+
+    async def _warm(self, video_id: str, languages: Optional[List[str]]) -> str:
+        info = await self.service.get_video_info(video_id, groups=('subtitles',))
+        if info.get('cn_subtitle_url') or info.get('en_subtitle_url'):
+            await self.service.get_video_summary(video_id, languages=languages)
+            outcome = 'warmed'
+        else:
+            # 没有字幕的视频需要转写，成本较高，留给用户请求触发
+            outcome = 'skipped'
+        pipe = self.redis_client.pipeline()
+        pipe.zadd(REDIS_WARMUP_SEEN_KEY, {video_id: time.time()})
+        pipe.zremrangebyrank(REDIS_WARMUP_SEEN_KEY, 0, -SEEN_MAX_ENTRIES - 1)
+        pipe.zrem(REDIS_WARMUP_FAILED_KEY, video_id)
+        pipe.hdel(REDIS_WARMUP_FAILURE_COUNT_KEY, video_id)
+        await pipe.execute()
+        self.logger.info(f"Warm-up {outcome} {video_id}")
+        return outcome
+
+    async def _record_failure(self, video_id: str) -> float:
+        """记录一次失败并返回退避秒数；同时清理已过期很久的失败记录。"""
+        failures = await self.redis_client.hincrby(REDIS_WARMUP_FAILURE_COUNT_KEY, video_id, 1)
+        backoff = min(self.failure_backoff * 2 ** (failures - 1), self.failure_backoff_max)
+        now = time.time()
+        stale = await self.redis_client.zrangebyscore(REDIS_WARMUP_FAILED_KEY, '-inf', now - self.failure_backoff_max)
+        pipe = self.redis_client.pipeline()
+        pipe.zadd(REDIS_WARMUP_FAILED_KEY, {video_id: now + backoff})
+        if stale:
+            pipe.zrem(REDIS_WARMUP_FAILED_KEY, *stale)
+            pipe.hdel(REDIS_WARMUP_FAILURE_COUNT_KEY, *stale)
+        await pipe.execute()
+        return backoff
+
+
+async def warmup_stats(redis_client: redis.Redis) -> Dict[str, Any]:
+    """今日已用预算和已处理的视频数。"""
+    pipe = redis_client.pipeline()
+    pipe.get(f"{REDIS_WARMUP_BUDGET_PREFIX}:{datetime.date.today().isoformat()}")
+    pipe.zcard(REDIS_WARMUP_SEEN_KEY)
+    pipe.zcount(REDIS_WARMUP_FAILED_KEY, time.time(), '+inf')
+    used, seen, backing_off = await pipe.execute()
+    return {
+        'window': settings.WARMUP_WINDOW,
+        'daily_budget': settings.WARMUP_DAILY_BUDGET,
+        'budget_used_today': int(used or 0),
+        'seen': seen,
+        'failed_backing_off': backing_off,
+    }
+
+
+async def main() -> None:
+    from app.config.redis_config import RedisClient
+
+    service = YoutubeDLPService(redis_client=RedisClient.get_instance(), logger=logger)
+    worker = WarmupWorker(service, logger=logger)
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        service.extraction_executor.shutdown()
+        await RedisClient.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,109 @@
+"""字幕解析性能对比：旧版 parse_vtt 与单遍解析器。
+
+用法：
+    python -m benchmarks.bench_caption_parser                 # 生成 3 小时的自动字幕样本
+    python -m benchmarks.bench_caption_parser --hours 6
+    python -m benchmarks.bench_caption_parser --file subs.vtt # 使用真实字幕文件
+"""
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from app.utils.caption_parser import iter_cues
+
+WORDS = ("so today we are going to talk about how neural networks learn from data and why "
+         "gradient descent works the way it does in practice with large models").split()
+
+
+def _ts(seconds: float) -> str:
+    ms = int(seconds * 1000)
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def generate_auto_caption_vtt(hours: float, seed: int = 0) -> str:
+    """生成 YouTube 自动字幕风格的 VTT：每个 cue 重复上一行并带内联时间戳，中间夹 10ms 的过渡 cue。"""
+    rng = random.Random(seed)
+    blocks = ["WEBVTT\nKind: captions\nLanguage: en\n"]
+    t, prev_line = 0.0, ""
+    while t < hours * 3600:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(5, 9))]
+        timed = words[0] + "".join(
+            f"<{_ts(t + 0.3 * (i + 1))}><c> {w}</c>" for i, w in enumerate(words[1:])
+        )
+        end = t + 3
+        blocks.append(f"{_ts(t)} --> {_ts(end)} align:start position:0%\n{prev_line or ' '}\n{timed}\n")
+        line = " ".join(words)
+        blocks.append(f"{_ts(end)} --> {_ts(end + 0.01)} align:start position:0%\n{line}\n \n")
+        prev_line, t = line, end + 0.01
+    return "\n".join(blocks)
+
+
+def legacy_clean_vtt_text(text: str) -> str:
+    text = re.sub(r'<\d{2}:\d{2}:\d{2}\.\d{3}>', '', text)
+    text = re.sub(r'</?[^>]+?>', '', text)
+    text = text.replace('&nbsp;', ' ').replace('&gt;', '>').replace('&lt;', '<').replace('&amp;', '&')
+    text = re.sub(r'align:start position:\d+%', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = re.sub(r'([.,!?;:])\1+', r'\1', text)
+    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    text = re.sub(r'\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}', '', text)
+    return text.strip()
+
+
+def legacy_parse_vtt(vtt_content: str) -> List[Dict[str, str]]:
+    """基线版本的 parse_vtt，仅用于对比。"""
+    if vtt_content.startswith("WEBVTT"):
+        vtt_content = vtt_content.split("\n\n", 1)[1]
+    parsed_captions = []
+    for block in vtt_content.strip().split("\n\n"):
+        lines = block.strip().split("\n")
+        if len(lines) < 2:
+            continue
+        timestamp_line = lines[0]
+        if "-->" not in timestamp_line:
+            timestamp_line = lines[1]
+        start_time = timestamp_line.split("-->")[0].strip().split(".")[0]
+        text_lines = lines[1:] if "-->" in lines[0] else lines[2:]
+        text = legacy_clean_vtt_text(" ".join(text_lines))
+        if parsed_captions and parsed_captions[-1]["txt"] == text:
+            continue
+        parsed_captions.append({"stime": start_time, "txt": text})
+    return parsed_captions
+
+
+def _bench(name: str, func, content: str, repeat: int) -> List[Dict[str, str]]:
+    best = float('inf')
+    result: List[Dict[str, str]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+    chars = sum(len(c['txt']) for c in result)
+    print(f"{name:<10} {best * 1000:9.1f} ms  {len(result):7d} cues  {chars:9d} chars")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=3)
+    parser.add_argument('--file')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            content = f.read()
+    else:
+        content = generate_auto_caption_vtt(args.hours)
+    print(f"input: {len(content) / 1024:.0f} KiB")
+
+    _bench("legacy", legacy_parse_vtt, content, args.repeat)
+    _bench("streaming", lambda c: list(iter_cues(c)), content, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
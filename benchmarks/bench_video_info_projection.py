@@ -0,0 +1,175 @@
+"""视频信息投影的性能对比：复制完整的 yt-dlp 信息（旧）与在提取线程内只保留模型所需字段（新）。
+
+使用按真实 YouTube 响应结构生成的信息字典（上百个字幕语言、数十个格式），不访问网络。
+每种方式都包含提取线程内的处理、跨进程传递时的序列化（pickle）以及服务层的模型校验和 model_dump。
+
+用法：
+    python -m benchmarks.bench_video_info_projection
+    python -m benchmarks.bench_video_info_projection --iterations 500
+"""
+import argparse
+import datetime
+import pickle
+import random
+import statistics
+import string
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.models.youtube import YoutubeVideoInfo
+from app.utils.yt_dlp_utils import project_video_info, select_subtitle_urls
+
+CAPTION_EXTS = ('json3', 'srv1', 'srv2', 'srv3', 'ttml', 'vtt', 'srt')
+
+
+def _token(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+
+def _signed_url(rng: random.Random, host: str, length: int = 900) -> str:
+    return f"https://{host}/videoplayback?{_token(rng, length)}"
+
+
+def build_info(seed: int = 0, caption_languages: int = 157, formats: int = 60) -> Dict[str, Any]:
+    """生成一个结构接近真实 YouTube 提取结果的信息字典。"""
+    rng = random.Random(seed)
+    video_id = _token(rng, 11)
+    caption_langs = ['en', 'zh-Hans', 'zh-Hant', 'ja', 'ko'] + [f"l{i}" for i in range(caption_languages - 5)]
+    automatic_captions = {
+        f"{lang}-en" if i else lang: [
+            {'ext': ext, 'url': f"https://www.youtube.com/api/timedtext?v={video_id}&lang={lang}&fmt={ext}&{_token(rng, 400)}",
+             'name': f"{lang} from English"}
+            for ext in CAPTION_EXTS
+        ]
+        for i, lang in enumerate(caption_langs)
+    }
+    automatic_captions['en'] = automatic_captions.pop('en')
+    automatic_captions['zh-Hans'] = automatic_captions.pop('zh-Hans-en')
+    format_list = [
+        {
+            'format_id': str(100 + i), 'ext': rng.choice(['mp4', 'webm', 'm4a']),
+            'url': _signed_url(rng, 'rr3---sn-example.googlevideo.com'),
+            'width': rng.choice([None, 256, 640, 1280, 1920]), 'height': rng.choice([None, 144, 360, 720, 1080]),
+            'fps': rng.choice([None, 30, 60]), 'tbr': rng.uniform(50, 5000), 'filesize': rng.randint(10 ** 5, 10 ** 9),
+            'vcodec': 'avc1.64001F', 'acodec': 'mp4a.40.2', 'protocol': 'https',
+            'http_headers': {'User-Agent': 'Mozilla/5.0 ' + _token(rng, 80), 'Accept': '*/*', 'Accept-Language': 'en-us'},
+            'downloader_options': {'http_chunk_size': 10485760},
+            'fragments': [{'url': _signed_url(rng, 'rr3---sn-example.googlevideo.com', 200), 'duration': 5.0}
+                          for _ in range(rng.randint(0, 20))],
+        }
+        for i in range(formats)
+    ]
+    return {
+        'id': video_id,
+        'title': 'Benchmark video ' + _token(rng, 40),
+        'fulltitle': 'Benchmark video ' + _token(rng, 40),
+        'thumbnail': f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
+        'thumbnails': [
+            {'url': f"https://i.ytimg.com/vi/{video_id}/{i}.jpg", 'preference': i - 40, 'id': str(i),
+             'width': 120 * (i % 8 + 1), 'height': 90 * (i % 8 + 1), 'resolution': f"{120 * (i % 8 + 1)}x{90 * (i % 8 + 1)}"}
+            for i in range(42)
+        ],
+        'description': ' '.join(_token(rng, rng.randint(3, 10)) for _ in range(400)),
+        'duration': 1234,
+        'duration_string': '20:34',
+        'view_count': 123456,
+        'average_rating': None,
+        'age_limit': 0,
+        'webpage_url': f"https://www.youtube.com/watch?v={video_id}",
+        'categories': ['Science & Technology'],
+        'tags': [_token(rng, 8) for _ in range(30)],
+        'comment_count': 789,
+        'chapters': [{'start_time': i * 60.0, 'end_time': (i + 1) * 60.0, 'title': _token(rng, 20)} for i in range(15)],
+        'heatmap': [{'start_time': i * 12.34, 'end_time': (i + 1) * 12.34, 'value': rng.random()} for i in range(100)],
+        'like_count': 4567,
+        'channel_id': 'UC' + _token(rng, 22),
+        'channel_url': 'https://www.youtube.com/channel/UC' + _token(rng, 22),
+        'channel': 'Benchmark channel',
+        'channel_follower_count': 98765,
+        'uploader': 'Benchmark channel',
+        'uploader_id': '@benchmark',
+        'uploader_url': 'https://www.youtube.com/@benchmark',
+        'upload_date': '20250101',
+        'timestamp': 1735689600,
+        'original_url': f"https://www.youtube.com/watch?v={video_id}",
+        'webpage_url_basename': 'watch',
+        'webpage_url_domain': 'youtube.com',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'formats': format_list,
+        'requested_formats': format_list[-2:],
+        'automatic_captions': automatic_captions,
+        'subtitles': {},
+        'release_timestamp': None,
+        'epoch': 1735689600,
+        'availability': 'public',
+        'live_status': 'not_live',
+        '_has_drm': None,
+        '_download_time': datetime.datetime(2025, 1, 1),
+    }
+
+
+def full_copy(info: Dict[str, Any]) -> Dict[str, Any]:
+    """基线：提取线程内复制全部字段，服务层再选择字幕链接。"""
+    info_dict = {}
+    for key, value in info.items():
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            info_dict[key] = value.isoformat()
+        elif isinstance(value, (list, dict)):
+            info_dict[key] = value
+        elif hasattr(value, '__dict__'):
+            info_dict[key] = str(value)
+        else:
+            info_dict[key] = value
+    return info_dict
+
+
+def old_pipeline(info: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    blob = pickle.dumps(full_copy(info))
+    copied = pickle.loads(blob)
+    copied['en_subtitle_url'], copied['cn_subtitle_url'] = select_subtitle_urls(copied)
+    return len(blob), YoutubeVideoInfo.model_validate(copied).model_dump()
+
+
+def new_pipeline(info: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    blob = pickle.dumps(project_video_info(info))
+    return len(blob), YoutubeVideoInfo.model_validate(pickle.loads(blob)).model_dump()
+
+
+def run(name: str, fn: Callable[[Dict[str, Any]], Tuple[int, Dict[str, Any]]], info: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size, result = fn(info)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    tracemalloc.start()
+    fn(info)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<5} mean {statistics.mean(latencies):7.3f} ms  "
+          f"p50 {latencies[len(latencies) // 2]:7.3f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.3f} ms  "
+          f"transfer {size / 1024:9.1f} KiB  peak alloc {peak / 1024:9.1f} KiB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="每种方式的执行次数")
+    args = parser.parse_args()
+
+    info = build_info()
+    print(f"info dict: {len(info)} keys, {len(pickle.dumps(info)) / 1024:.1f} KiB pickled, "
+          f"{len(info['automatic_captions'])} caption languages, {len(info['formats'])} formats")
+    old = run("full", old_pipeline, info, args.iterations)
+    new = run("trim", new_pipeline, info, args.iterations)
+    assert old == new, "projection changed the model output"
+    print("model output identical")
+
+
+if __name__ == "__main__":
+    main()
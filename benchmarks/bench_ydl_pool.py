@@ -0,0 +1,94 @@
+"""YoutubeDL 实例复用的性能对比：每次新建实例（冷）与线程复用实例（热）。
+
+使用本地 HTTP 服务代替 YouTube，提取一个内嵌 <video> 的网页，统计单次提取延迟和服务端收到的 TCP 连接数。
+
+用法：
+    python -m benchmarks.bench_ydl_pool
+    python -m benchmarks.bench_ydl_pool --requests 200
+"""
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import yt_dlp
+
+from app.utils.yt_dlp_utils import build_video_info_opts, get_video_info_utils, video_info_pool, identity_pool
+
+PAGE = (b'<html><head><title>stand-in</title></head><body>'
+        b'<video controls><source src="/video.mp4" type="video/mp4"></video></body></html>')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandInHandler.lock:
+            StandInHandler.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def cold_extract(url: str) -> None:
+    """基线：每次构建参数并新建 YoutubeDL 实例。"""
+    with yt_dlp.YoutubeDL(build_video_info_opts()) as ydl:
+        ydl.extract_info(url, download=False)
+
+
+def warm_extract(url: str) -> None:
+    get_video_info_utils(url)
+
+
+def run(name: str, fn: Callable[[str], None], url: str, requests: int) -> None:
+    StandInHandler.connections = 0
+    latencies: List[float] = []
+    for i in range(requests):
+        start = time.perf_counter()
+        fn(f"{url}?n={i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"{name:<6} mean {statistics.mean(latencies):7.2f} ms  "
+          f"p50 {latencies[len(latencies) // 2]:7.2f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+          f"connections {StandInHandler.connections}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="每种方式的提取次数")
+    args = parser.parse_args()
+
+    # 只比较实例复用的效果，不受身份限速影响
+    identity_pool.rate = 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/watch"
+
+    try:
+        # 预热：导入提取器等一次性开销不计入对比
+        cold_extract(url)
+        print(f"{args.requests} extractions against {url}, pool max_uses={video_info_pool.max_uses}")
+        run("cold", cold_extract, url, args.requests)
+        run("warm", warm_extract, url, args.requests)
+        print(f"pool: {video_info_pool.stats()}")
+    finally:
+        video_info_pool.close_all()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# app.config.redis_config 在导入时创建客户端（不会立即连接），测试中的 Redis 一律使用 fakeredis
+os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+os.environ.setdefault('OPENAI_API_KEY', 'test')
@@ -0,0 +1,64 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.config import settings
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.utils import yt_dlp_utils
+from app.utils.yt_dlp_utils import VideoInfoError, identity_pool, run_with_identity
+
+
+def _run(errors, monkeypatch, max_attempts=2):
+    """用 errors 依次作为各次尝试的异常执行 run_extraction，返回每次尝试时的 exclude 和限流器统计。"""
+    monkeypatch.setattr(settings, 'IDENTITY_MAX_ATTEMPTS', max_attempts)
+    attempts = []
+
+    def extract(url, exclude=None):
+        attempts.append(list(exclude))
+        if len(attempts) <= len(errors):
+            exclude.append(f"identity-{len(attempts)}")
+            raise errors[len(attempts) - 1]
+        return {'url': url}
+
+    async def main():
+        service = YoutubeDLPService(redis_client=fakeredis.FakeAsyncRedis())
+        try:
+            return await service.run_extraction(extract, 'https://example.com'), attempts, \
+                await service.extraction_guard.stats()
+        finally:
+            service.extraction_executor.shutdown()
+
+    return asyncio.run(main())
+
+
+def test_retry_takes_a_new_guard_token_and_avoids_failed_identity(monkeypatch):
+    result, attempts, stats = _run([VideoInfoError("Download error: HTTP Error 403")], monkeypatch)
+    assert result == {'url': 'https://example.com'}
+    assert attempts == [[], ['identity-1']]
+    assert (stats['window_fail'], stats['window_ok']) == (1, 1)
+
+
+def test_unavailable_video_is_not_retried(monkeypatch):
+    with pytest.raises(VideoInfoError):
+        _run([VideoInfoError("Download error: Private video")], monkeypatch)
+
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    with pytest.raises(VideoInfoError):
+        _run([VideoInfoError("first"), VideoInfoError("second")], monkeypatch)
+
+
+def test_run_with_identity_makes_one_attempt_and_reports_failed_identity(monkeypatch):
+    monkeypatch.setattr(yt_dlp_utils.time, 'sleep', lambda seconds: pytest.fail("slept in extraction thread"))
+    attempts = []
+
+    def extract(identity):
+        attempts.append(identity.name)
+        raise RuntimeError("boom")
+
+    tried = []
+    with pytest.raises(RuntimeError):
+        run_with_identity(extract, tried)
+    assert attempts == tried
+    assert len(attempts) == 1 and attempts[0] in [identity.name for identity in identity_pool.identities]
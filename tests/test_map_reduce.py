@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from app.agents import openai_summarizer
+from app.agents.openai_summarizer import SummaryGenerationError, build_map_reduce_message
+
+CHUNKS = [
+    [{'stime': f'00:0{i}:00', 'etime': f'00:0{i}:30', 'txt': f'part {i}'}]
+    for i in range(1, 4)
+]
+
+
+class FakeEngine:
+    """按分段内容决定前几次调用失败的桩引擎。"""
+
+    def __init__(self, failures):
+        self.failures = dict(failures)
+        self.calls = []
+
+    async def complete(self, messages):
+        part = next(f'part {i}' for i in range(1, 4) if f'part {i}' in messages[-1]['content'])
+        self.calls.append(part)
+        if self.failures.get(part, 0) > 0:
+            self.failures[part] -= 1
+            raise RuntimeError("upstream error")
+        return json.dumps({'outline': [], 'summary': f'summary of {part}', 'keywords': []})
+
+    async def store_reply(self, messages, content):
+        pass
+
+    async def forget_reply(self, messages):
+        pass
+
+
+def _run(monkeypatch, failures):
+    engine = FakeEngine(failures)
+    monkeypatch.setattr(openai_summarizer, 'get_summary_engine', lambda: engine)
+    monkeypatch.setattr(openai_summarizer, 'split_caption_chunks', lambda captions, tokens: CHUNKS)
+    monkeypatch.setattr(openai_summarizer.settings, 'SUMMARY_CHUNK_MAX_ATTEMPTS', 2)
+    message = asyncio.run(build_map_reduce_message('title', 'description', [], 'English'))
+    return message, engine.calls
+
+
+def test_failed_chunk_is_retried(monkeypatch):
+    message, calls = _run(monkeypatch, {'part 2': 1})
+    assert calls.count('part 2') == 2
+    assert all(f'summary of part {i}' in message for i in range(1, 4))
+
+
+def test_chunk_failing_every_attempt_is_marked_as_gap(monkeypatch):
+    message, calls = _run(monkeypatch, {'part 2': 5})
+    assert calls.count('part 2') == 2
+    assert 'summary of part 1' in message and 'summary of part 3' in message
+    assert 'PART 2 (00:02:00 - 00:02:00)\n[This part could not be summarized' in message
+
+
+def test_all_chunks_failing_raises(monkeypatch):
+    with pytest.raises(SummaryGenerationError):
+        _run(monkeypatch, {'part 1': 5, 'part 2': 5, 'part 3': 5})
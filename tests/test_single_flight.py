@@ -0,0 +1,107 @@
+import asyncio
+
+import fakeredis
+
+from app.utils.single_flight import SingleFlight
+
+
+def make_flight() -> SingleFlight:
+    return SingleFlight(fakeredis.FakeAsyncRedis(), lock_prefix='lock', lease_seconds=5, poll_interval=0.01)
+
+
+def test_concurrent_callers_share_one_execution():
+    async def scenario():
+        flight = make_flight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def fetch():
+            return None
+
+        results = await asyncio.gather(*(flight.do('v', fn, fetch) for _ in range(5)))
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ['done'] * 5
+
+
+def test_leader_cancellation_does_not_cancel_followers():
+    async def scenario():
+        flight = make_flight()
+        started = asyncio.Event()
+
+        async def fn():
+            started.set()
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def fetch():
+            return None
+
+        leader = asyncio.create_task(flight.do('v', fn, fetch))
+        await started.wait()
+        follower = asyncio.create_task(flight.do('v', fn, fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return leader, await follower
+
+    leader, result = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result == 'done'
+
+
+def test_errors_are_shared_and_key_is_released():
+    async def scenario():
+        flight = make_flight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError('boom')
+
+        async def ok():
+            return 'ok'
+
+        async def fetch():
+            return None
+
+        results = await asyncio.gather(flight.do('v', fail, fetch), flight.do('v', fail, fetch),
+                                       return_exceptions=True)
+        return results, await flight.do('v', ok, fetch)
+
+    results, retry = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert retry == 'ok'
+
+
+def test_cross_process_waiter_receives_uncached_leader_result():
+    async def scenario():
+        redis_client = fakeredis.FakeAsyncRedis()
+        leader = SingleFlight(redis_client, lock_prefix='lock', lease_seconds=5, poll_interval=0.01, result_ttl=5)
+        waiter = SingleFlight(redis_client, lock_prefix='lock', lease_seconds=5, poll_interval=0.01, result_ttl=5)
+        started = asyncio.Event()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return {'code': '101', 'msg': 'transcript task created'}
+
+        async def fetch():
+            # 转写任务状态不写入摘要缓存
+            return None
+
+        leading = asyncio.create_task(leader.do('v', fn, fetch))
+        await started.wait()
+        waited = await waiter.do('v', fn, fetch)
+        return calls, await leading, waited
+
+    calls, leading, waited = asyncio.run(scenario())
+    assert calls == [1]
+    assert leading == waited == {'code': '101', 'msg': 'transcript task created'}
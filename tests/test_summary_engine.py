@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import fakeredis
+
+from app.agents import summary_engine
+from app.agents.llm_cache import LLMResponseCache
+from app.agents.summary_engine import SummaryEngine
+from app.agents.summary_validator import SummaryIssue
+from app.utils.compressed_store import CompressedRedisStore
+
+
+def _engine(replies):
+    cache = LLMResponseCache(CompressedRedisStore(
+        fakeredis.FakeAsyncRedis(), prefix='llm_response', ttl=3600,
+        max_entry_bytes=1 << 20, max_total_bytes=1 << 24
+    ))
+    engine = SummaryEngine(api_key='test', max_attempts=2, cache=cache)
+    requests = []
+
+    async def request(messages, temperature, on_delta):
+        requests.append(messages)
+        return replies.pop(0)
+
+    engine._request = request
+    return engine, requests
+
+
+def _accept_when(monkeypatch, is_valid):
+    def validate_summary(data, language):
+        return data, [] if is_valid(data) else [SummaryIssue('summary', 'bad summary')]
+
+    monkeypatch.setattr(summary_engine, 'validate_summary', validate_summary)
+    monkeypatch.setattr(summary_engine.settings, 'SUMMARY_LLM_VALIDATION_RATE', 0)
+
+
+def test_only_accepted_reply_is_cached(monkeypatch):
+    _accept_when(monkeypatch, lambda data: data['summary'] == 'good')
+    bad, good = json.dumps({'summary': 'bad'}), json.dumps({'summary': 'good'})
+
+    async def main():
+        engine, requests = _engine([bad, good])
+        assert await engine.summarize('video', 'en') == {'summary': 'good'}
+        first, retry = requests
+
+        assert await engine.cache.get(engine._cache_key(first, None)) is None
+        assert await engine.cache.get(engine._cache_key(retry, None)) == good
+
+    asyncio.run(main())
+
+
+def test_rejected_cached_reply_is_not_replayed(monkeypatch):
+    _accept_when(monkeypatch, lambda data: data['summary'] == 'good')
+    bad, good = json.dumps({'summary': 'bad'}), json.dumps({'summary': 'good'})
+
+    async def main():
+        engine, requests = _engine([good, good])
+        first = [{"role": "system", "content": summary_engine.SUMMARIZER_SYSTEM_MESSAGE},
+                 {"role": "user", "content": 'video'}]
+        await engine.cache.put(engine._cache_key(first, None), bad)
+
+        assert await engine.summarize('video', 'en') == {'summary': 'good'}
+        assert await engine.cache.get(engine._cache_key(first, None)) is None
+
+        assert await engine.summarize('video', 'en') == {'summary': 'good'}
+        assert len(requests) == 2
+        assert await engine.cache.get(engine._cache_key(first, None)) == good
+
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import fakeredis
+
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.utils.task_queue import RedisTaskQueue
+
+
+def _queue(**kwargs) -> RedisTaskQueue:
+    return RedisTaskQueue(fakeredis.FakeAsyncRedis(), 'test_queue', **kwargs)
+
+
+def test_claim_orders_by_priority_and_skips_duplicates():
+    async def main():
+        queue = _queue()
+        assert await queue.enqueue('low', {'n': 1}, priority=1)
+        assert await queue.enqueue('high', {'n': 2}, priority=5)
+        assert not await queue.enqueue('low', {'n': 3}, priority=9)
+
+        tasks = await queue.claim(10, 60)
+        assert [(t.task_id, t.payload, t.attempt) for t in tasks] == [('high', {'n': 2}, 1), ('low', {'n': 1}, 1)]
+        assert await queue.claim(10, 60) == []
+
+    asyncio.run(main())
+
+
+def test_ack_removes_task_and_rejects_stale_token():
+    async def main():
+        queue = _queue()
+        await queue.enqueue('a', {})
+        task, = await queue.claim(1, 60)
+        assert await queue.ack(task)
+        assert not await queue.ack(task)
+
+        stats = await queue.stats()
+        assert (stats['pending'], stats['inflight'], stats['dead'], stats['completed_last_hour']) == (0, 0, 0, 1)
+
+    asyncio.run(main())
+
+
+def test_nack_requeues_until_max_attempts_then_dead_letters():
+    async def main():
+        queue = _queue(max_attempts=2)
+        await queue.enqueue('a', {'x': 1})
+        task, = await queue.claim(1, 60)
+        assert await queue.nack(task, 'boom') is False
+
+        task, = await queue.claim(1, 60)
+        assert task.attempt == 2
+        assert await queue.nack(task, 'boom again') is True
+        assert await queue.nack(task, 'late') is None
+
+        dead, = await queue.dead_letters()
+        assert (dead['task_id'], dead['error'], dead['attempts']) == ('a', 'boom again', 2)
+        assert await queue.claim(1, 60) == []
+
+    asyncio.run(main())
+
+
+def test_visibility_timeout_redelivers_and_fences_previous_holder():
+    async def main():
+        queue = _queue()
+        await queue.enqueue('a', {})
+        first, = await queue.claim(1, -1)
+        second, = await queue.claim(1, 60)
+        assert (second.task_id, second.attempt) == ('a', 2)
+        assert not await queue.extend(first, 60)
+        assert not await queue.ack(first)
+        assert await queue.extend(second, 60)
+        assert await queue.ack(second)
+
+    asyncio.run(main())
+
+
+def test_visibility_timeout_at_max_attempts_dead_letters_and_notifies():
+    async def main():
+        dead_ids = []
+
+        async def on_dead(task_id, error):
+            dead_ids.append((task_id, error))
+
+        queue = _queue(max_attempts=1, on_dead=on_dead)
+        await queue.enqueue('a', {})
+        await queue.enqueue('b', {})
+        task, = await queue.claim(1, -1)
+        assert task.task_id == 'a'
+
+        tasks = await queue.claim(5, 60)
+        assert [t.task_id for t in tasks] == ['b']
+        assert dead_ids == [('a', RedisTaskQueue.DEAD_ON_TIMEOUT_ERROR)]
+        dead, = await queue.dead_letters()
+        assert (dead['task_id'], dead['attempts']) == ('a', 1)
+
+    asyncio.run(main())
+
+
+def test_transcript_task_marked_error_when_lease_expires_at_max_attempts():
+    async def main():
+        service = YoutubeDLPService(redis_client=fakeredis.FakeAsyncRedis())
+        queue = service.transcript_queue
+        queue.max_attempts = 1
+        try:
+            await service.update_transcript_task_state('a', service.TranscriptStatus.PROCESSING, 'processing')
+            await queue.enqueue('a', {'video_id': 'a'})
+            await queue.claim(1, -1)
+            assert await queue.claim(1, 60) == []
+
+            task = json.loads(await service.redis_client.hget(service.REDIS_TRANSCRIPT_TASK_KEY, 'a'))
+            assert task['status'] == service.TranscriptStatus.ERROR
+        finally:
+            service.extraction_executor.shutdown()
+
+    asyncio.run(main())
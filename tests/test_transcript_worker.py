@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import fakeredis
+
+from app.services.yt_dlp_service import YoutubeDLPService
+from app.workers import transcription_backends
+from app.workers.transcript_worker import TranscriptWorker
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+TranscriptStatus = YoutubeDLPService.TranscriptStatus
+
+
+class FakeBackend:
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.calls = []
+
+    async def transcribe(self, video_id, video_info):
+        self.calls.append(video_id)
+        if len(self.calls) <= self.fail_times:
+            raise RuntimeError("transcription failed")
+        return f"WEBVTT\n\n{video_id}"
+
+
+async def _new_service() -> YoutubeDLPService:
+    service = YoutubeDLPService(redis_client=fakeredis.FakeAsyncRedis())
+    pipe = service.redis_client.pipeline()
+    pipe.hset(service.REDIS_VIDEO_INFO_KEY, VIDEO_ID, json.dumps({'id': VIDEO_ID}))
+    pipe.hset(service.REDIS_VIDEO_INFO_FETCHED_AT_KEY, VIDEO_ID, time.time())
+    await pipe.execute()
+    return service
+
+
+async def _task_status(service: YoutubeDLPService) -> str:
+    raw = await service.redis_client.hget(service.REDIS_TRANSCRIPT_TASK_KEY, VIDEO_ID)
+    return json.loads(raw)['status'] if raw else None
+
+
+async def _run_worker_until(worker: TranscriptWorker, service: YoutubeDLPService, status: str) -> None:
+    runner = asyncio.create_task(worker.run())
+    try:
+        for _ in range(200):
+            if await _task_status(service) == status:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError(f"task status never reached {status}: {await _task_status(service)}")
+    finally:
+        await worker.stop()
+        await runner
+        service.extraction_executor.shutdown()
+
+
+def test_worker_transcribes_queued_task_and_generates_summary():
+    async def main():
+        service = await _new_service()
+        summarized = []
+
+        async def generate_summary_from_transcript(video_id, transcript):
+            summarized.append((video_id, transcript))
+
+        service.generate_summary_from_transcript = generate_summary_from_transcript
+        backend = FakeBackend()
+        worker = TranscriptWorker(service, backend=backend, concurrency=1, poll_interval=0.01)
+
+        await service.transcript_queue.enqueue(VIDEO_ID, {'video_id': VIDEO_ID})
+        await _run_worker_until(worker, service, TranscriptStatus.SUCCESS)
+
+        assert backend.calls == [VIDEO_ID]
+        assert summarized == [(VIDEO_ID, f"WEBVTT\n\n{VIDEO_ID}")]
+        assert await service.transcript_queue.claim(1, 60) == []
+
+    asyncio.run(main())
+
+
+def test_worker_retries_failed_task():
+    async def main():
+        service = await _new_service()
+
+        async def generate_summary_from_transcript(video_id, transcript):
+            pass
+
+        service.generate_summary_from_transcript = generate_summary_from_transcript
+        backend = FakeBackend(fail_times=1)
+        worker = TranscriptWorker(service, backend=backend, concurrency=1, poll_interval=0.01)
+
+        await service.transcript_queue.enqueue(VIDEO_ID, {'video_id': VIDEO_ID})
+        await _run_worker_until(worker, service, TranscriptStatus.SUCCESS)
+
+        assert backend.calls == [VIDEO_ID, VIDEO_ID]
+
+    asyncio.run(main())
+
+
+def test_whisper_backend_downloads_through_extraction_executor_and_guard(monkeypatch):
+    threads = []
+
+    def download_audio_utils(url, output_dir, audio_format, exclude=None):
+        threads.append(threading.current_thread())
+        path = os.path.join(output_dir, f"{VIDEO_ID}.m4a")
+        with open(path, 'wb') as f:
+            f.write(b'audio')
+        return path
+
+    async def create(model, file, response_format):
+        assert file.read() == b'audio'
+        return "WEBVTT\n"
+
+    monkeypatch.setattr(transcription_backends, 'download_audio_utils', download_audio_utils)
+
+    async def main():
+        service = await _new_service()
+        backend = transcription_backends.WhisperTranscriptionBackend(service=service)
+        backend.client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=create)))
+        try:
+            assert await backend.transcribe(VIDEO_ID, {}) == "WEBVTT\n"
+            stats = await service.extraction_guard.stats()
+        finally:
+            service.extraction_executor.shutdown()
+        assert stats['window_ok'] == 1
+
+    asyncio.run(main())
+    assert threads and threads[0] is not threading.main_thread()
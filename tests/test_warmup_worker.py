@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import fakeredis
+
+from app.workers.warmup_worker import REDIS_WARMUP_FAILED_KEY, WarmupSource, WarmupWorker, warmup_stats
+
+
+class FakeService:
+    def __init__(self, failing):
+        self.redis_client = fakeredis.FakeAsyncRedis()
+        self.failing = set(failing)
+        self.info_calls = []
+        self.summarized = []
+
+    async def get_playlist_entries(self, url, page, page_size, schedule):
+        return {'entries': [{'id': 'good'}, {'id': 'bad'}]}
+
+    async def get_summarized_ids(self, video_ids):
+        return set()
+
+    async def get_video_info(self, video_id, groups):
+        self.info_calls.append(video_id)
+        if video_id in self.failing:
+            raise RuntimeError("video is private")
+        return {'id': video_id, 'en_subtitle_url': 'https://example.com/en.vtt'}
+
+    async def get_video_summary(self, video_id, languages=None):
+        self.summarized.append(video_id)
+
+
+def _worker(service, **kwargs):
+    return WarmupWorker(service, sources=[WarmupSource(url='https://www.youtube.com/@channel')],
+                        window='', daily_budget=10, **kwargs)
+
+
+def test_failed_video_is_skipped_until_backoff_expires():
+    async def main():
+        service = FakeService(failing=['bad'])
+        worker = _worker(service, failure_backoff=3600, failure_backoff_max=4 * 3600)
+
+        assert await worker.run_once() == {'scanned': 2, 'warmed': 1, 'skipped': 0, 'failed': 1}
+        assert await worker.run_once() == {'scanned': 0, 'warmed': 0, 'skipped': 0, 'failed': 0}
+        assert service.info_calls == ['good', 'bad']
+        assert (await warmup_stats(service.redis_client))['budget_used_today'] == 2
+
+        # 退避到期后重试，再次失败时等待时间翻倍
+        await service.redis_client.zadd(REDIS_WARMUP_FAILED_KEY, {'bad': time.time() - 1})
+        assert (await worker.run_once())['failed'] == 1
+        retry_at = await service.redis_client.zscore(REDIS_WARMUP_FAILED_KEY, 'bad')
+        assert 2 * 3600 - 60 < retry_at - time.time() <= 2 * 3600
+
+    asyncio.run(main())
+
+
+def test_success_after_failure_clears_backoff():
+    async def main():
+        service = FakeService(failing=['bad'])
+        worker = _worker(service)
+        await worker.run_once()
+
+        service.failing.clear()
+        await service.redis_client.zadd(REDIS_WARMUP_FAILED_KEY, {'bad': time.time() - 1})
+        assert (await worker.run_once())['warmed'] == 1
+        assert service.summarized == ['good', 'bad']
+        assert await service.redis_client.zscore(REDIS_WARMUP_FAILED_KEY, 'bad') is None
+
+    asyncio.run(main())
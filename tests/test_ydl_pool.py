@@ -0,0 +1,109 @@
+import glob
+import os
+import tempfile
+import threading
+
+import yt_dlp
+
+from app.utils import yt_dlp_utils
+from app.utils.ydl_pool import YoutubeDLPool
+from app.utils.yt_dlp_utils import (
+    build_video_info_opts, identity_cookies_path, identity_pool, list_playlist_entries_utils
+)
+
+COOKIES = (
+    "# Netscape HTTP Cookie File\n"
+    ".youtube.com\tTRUE\t/\tTRUE\t2145916800\tPREF\tf6=40000000\n"
+)
+
+
+def _pool(tmp_path, max_uses):
+    cookies_path = tmp_path / 'cookies.txt'
+    cookies_path.write_text(COOKIES)
+    pool = YoutubeDLPool(
+        lambda identity: {'quiet': True, 'no_warnings': True, 'cookiefile': str(cookies_path)},
+        max_uses=max_uses,
+        cookies_path_fn=lambda identity: str(cookies_path)
+    )
+    return pool, cookies_path
+
+
+def _cookie_copies():
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), 'ydl-cookies-*')))
+
+
+def test_threads_reuse_instances_without_rewriting_cookie_file(tmp_path):
+    before = _cookie_copies()
+    pool, cookies_path = _pool(tmp_path, max_uses=3)
+    mtime = os.stat(cookies_path).st_mtime_ns
+    threads, uses, errors = 4, 10, []
+
+    def work():
+        try:
+            for _ in range(uses):
+                with pool.acquire() as ydl:
+                    # 加载 cookies，关闭实例时会写回 cookiefile
+                    assert any(cookie.name == 'PREF' for cookie in ydl.cookiejar)
+                    assert ydl.params['cookiefile'] != str(cookies_path)
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    stats = pool.stats()
+    # 每个线程每 3 次使用重建一次，cookies 不变时不会额外回收
+    assert stats['created'] == threads * 4
+    assert stats['reused'] == threads * (uses - 4)
+    assert cookies_path.read_text() == COOKIES
+    assert os.stat(cookies_path).st_mtime_ns == mtime
+
+    pool.close_all()
+    assert _cookie_copies() == before
+
+
+def test_recycles_only_when_cookie_content_changes(tmp_path):
+    pool, cookies_path = _pool(tmp_path, max_uses=100)
+    with pool.acquire() as first:
+        pass
+
+    os.utime(cookies_path, ns=(0, 0))
+    with pool.acquire() as ydl:
+        assert ydl is first
+
+    cookies_path.write_text(COOKIES.replace('f6=40000000', 'f6=80000000'))
+    with pool.acquire() as ydl:
+        assert ydl is not first
+        assert any(cookie.value == 'f6=80000000' for cookie in ydl.cookiejar)
+    assert pool.stats()['recycled'] == 1
+    pool.close_all()
+
+
+def test_playlist_listing_does_not_recycle_pooled_instances(tmp_path, monkeypatch):
+    cookies_path = tmp_path / 'cookies.txt'
+    cookies_path.write_text(COOKIES)
+    monkeypatch.setattr(yt_dlp_utils, 'get_cookies_path', lambda: str(cookies_path))
+
+    def extract_info(self, url, download=True, **kwargs):
+        # 加载 cookies，退出 with 时会写回 cookiefile
+        assert any(cookie.name == 'PREF' for cookie in self.cookiejar)
+        return {'id': 'PL', 'entries': [{'id': 'dQw4w9WgXcQ', 'title': 'video'}]}
+
+    monkeypatch.setattr(yt_dlp.YoutubeDL, 'extract_info', extract_info)
+    pool = YoutubeDLPool(build_video_info_opts, max_uses=100, cookies_path_fn=identity_cookies_path)
+    identity = identity_pool.identities[0]
+
+    with pool.acquire(identity) as first:
+        first.extract_info('https://www.youtube.com/watch?v=dQw4w9WgXcQ', download=False)
+    page = list_playlist_entries_utils('https://www.youtube.com/playlist?list=PL', 1, 10)
+    assert [entry['id'] for entry in page['entries']] == ['dQw4w9WgXcQ']
+    with pool.acquire(identity) as ydl:
+        assert ydl is first
+
+    assert pool.stats()['recycled'] == 0
+    assert cookies_path.read_text() == COOKIES
+    pool.close_all()
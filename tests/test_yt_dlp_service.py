@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+
+import fakeredis
+
+from app.config import settings
+from app.services.yt_dlp_service import YoutubeDLPService
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+def _service() -> YoutubeDLPService:
+    return YoutubeDLPService(redis_client=fakeredis.FakeAsyncRedis())
+
+
+def test_freshness_groups_follow_selected_fields():
+    service = _service()
+    try:
+        assert service.freshness_groups(None) == ('stats', 'subtitles')
+        assert service.freshness_groups(['id', 'title']) == ()
+        assert service.freshness_groups(['title', 'view_count']) == ('stats',)
+        assert service.freshness_groups(['en_subtitle_url']) == ('subtitles',)
+        assert service.freshness_groups(['cn_subtitle_url', 'like_count']) == ('stats', 'subtitles')
+    finally:
+        service.extraction_executor.shutdown()
+
+
+def test_expired_subtitle_urls_are_not_served_from_cache():
+    async def main():
+        service = _service()
+        fetched_at = time.time() - settings.VIDEO_INFO_SUBTITLE_TTL - 1
+        info = {'id': VIDEO_ID, 'en_subtitle_url': 'https://www.youtube.com/api/timedtext?expire=0'}
+        pipe = service.redis_client.pipeline()
+        pipe.hset(service.REDIS_VIDEO_INFO_KEY, VIDEO_ID, json.dumps(info))
+        pipe.hset(service.REDIS_VIDEO_INFO_FETCHED_AT_KEY, VIDEO_ID, fetched_at)
+        await pipe.execute()
+        try:
+            assert await service._get_cached_video_info(VIDEO_ID, service.freshness_groups(['title'])) == info
+            assert await service._get_cached_video_info(VIDEO_ID, service.freshness_groups(['en_subtitle_url'])) is None
+            assert await service._get_cached_video_info(VIDEO_ID, service.freshness_groups(None)) is None
+        finally:
+            service.extraction_executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_batch_extracts_each_video_once_for_different_url_forms():
+    urls = [
+        f"https://youtu.be/{VIDEO_ID}",
+        f"https://www.youtube.com/watch?v={VIDEO_ID}&t=10",
+        f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        'not a video url',
+    ]
+
+    async def main():
+        service = _service()
+        calls = []
+
+        async def get_video_info(url, force_refresh=False, groups=('stats',)):
+            calls.append(url)
+            if url == 'not a video url':
+                raise ValueError(url)
+            return {'id': VIDEO_ID}
+
+        service.get_video_info = get_video_info
+        try:
+            return await service.get_video_info_batch(urls), calls
+        finally:
+            service.extraction_executor.shutdown()
+
+    results, calls = asyncio.run(main())
+    assert len(calls) == 2
+    assert all(results[url] == {'id': VIDEO_ID} for url in urls[:3])
+    assert isinstance(results['not a video url'], ValueError)
+
+
+def test_cancel_background_tasks_cancels_spawned_tasks():
+    async def main():
+        service = _service()
+        try:
+            task = service.spawn_background(asyncio.sleep(60))
+            await service.cancel_background_tasks()
+            return task
+        finally:
+            service.extraction_executor.shutdown()
+
+    task = asyncio.run(main())
+    assert task.cancelled()